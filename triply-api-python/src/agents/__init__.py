@@ -1,9 +1,12 @@
-from .trip_agent import create_trip_agent, generate_trip, stream_trip_generation
+from .trip_agent import create_trip_agent, get_trip_agent, generate_trip, stream_trip_generation
 from .state import AgentState
+from .warmup import warm_up_agents
 
 __all__ = [
     "create_trip_agent",
+    "get_trip_agent",
     "generate_trip",
     "stream_trip_generation",
     "AgentState",
+    "warm_up_agents",
 ]
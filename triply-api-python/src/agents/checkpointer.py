@@ -0,0 +1,232 @@
+"""
+Conversation Checkpointer
+
+Checkpointer for the ReAct agent's conversation threads (/generate).
+
+LangGraph's MemorySaver keeps every checkpoint of every thread forever.
+BoundedMemorySaver keeps memory flat:
+- Threads are evicted LRU past `max_threads` and after `ttl_seconds` idle
+- Only the last `max_checkpoints` checkpoints per thread are kept
+- Stored message history is trimmed to `max_messages`, cut at a user
+  message so tool calls are never separated from their results
+
+With `checkpointer_path` set and langgraph-checkpoint-sqlite installed,
+threads are stored on disk instead (AsyncSqliteSaver).
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from ..config import settings
+from ..logging import get_logger
+
+logger = get_logger("checkpointer")
+
+
+def trim_messages(messages: list[BaseMessage], max_messages: int) -> list[BaseMessage]:
+    """
+    Keep the most recent messages, starting at a user message.
+
+    Args:
+        messages: Conversation history
+        max_messages: Maximum number of messages to keep
+
+    Returns:
+        The longest suffix of at most max_messages that starts with a
+        HumanMessage; if the last turn alone is longer, that whole turn
+    """
+    if len(messages) <= max_messages:
+        return messages
+
+    turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    for start in turn_starts:
+        if len(messages) - start <= max_messages:
+            return messages[start:]
+
+    return messages[turn_starts[-1]:] if turn_starts else messages[-max_messages:]
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer bounded by threads, idle time, checkpoints and messages.
+
+    Args:
+        max_threads: Least recently used threads are evicted past this many
+        ttl_seconds: Threads idle longer than this are evicted (0 = never)
+        max_checkpoints: Checkpoints kept per thread and namespace
+        max_messages: Messages kept in a thread's stored history
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1000,
+        ttl_seconds: float = 3600,
+        max_checkpoints: int = 3,
+        max_messages: int = 40,
+    ):
+        super().__init__()
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.max_checkpoints = max_checkpoints
+        self.max_messages = max_messages
+
+        # thread_id -> last access time, least recently used first
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        # thread_id -> its blob keys, so pruning never scans all threads
+        self._blob_keys: dict[str, set[tuple]] = {}
+
+        self.evicted_threads = 0
+        self.trimmed_messages = 0
+
+    def _touch(self, thread_id: str):
+        """Mark a thread as used and evict expired / least recently used threads"""
+        now = time.monotonic()
+        self._last_access[thread_id] = now
+        self._last_access.move_to_end(thread_id)
+
+        while self._last_access:
+            oldest, last_access = next(iter(self._last_access.items()))
+            expired = self.ttl_seconds > 0 and now - last_access > self.ttl_seconds
+            if oldest == thread_id or not (expired or len(self._last_access) > self.max_threads):
+                break
+            self.delete_thread(oldest)
+            self.evicted_threads += 1
+
+    def _prune_checkpoints(self, thread_id: str, checkpoint_ns: str):
+        """Drop all but the newest checkpoints of a thread, with their writes and blobs"""
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.max_checkpoints:
+            return
+
+        # Checkpoint ids are time-ordered (uuid6)
+        ordered = sorted(checkpoints)
+        for checkpoint_id in ordered[:-self.max_checkpoints]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        # Blobs still referenced by the kept checkpoints
+        referenced = set()
+        for saved, _, _ in checkpoints.values():
+            versions = self.serde.loads_typed(saved)["channel_versions"]
+            referenced.update((thread_id, checkpoint_ns, ch, v) for ch, v in versions.items())
+
+        keys = self._blob_keys.get(thread_id, set())
+        for key in [k for k in keys if k[1] == checkpoint_ns and k not in referenced]:
+            self.blobs.pop(key, None)
+            keys.discard(key)
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        result = super().get_tuple(config)
+
+        if thread_id in self._last_access:
+            self._touch(thread_id)
+        elif result is None:
+            # The lookup created an empty entry for an unknown thread
+            self.storage.pop(thread_id, None)
+
+        return result
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+
+        values: dict[str, Any] = checkpoint["channel_values"]
+        messages = values.get("messages")
+        if "messages" in new_versions and isinstance(messages, list):
+            trimmed = trim_messages(messages, self.max_messages)
+            if len(trimmed) < len(messages):
+                self.trimmed_messages += len(messages) - len(trimmed)
+                checkpoint = {**checkpoint, "channel_values": {**values, "messages": trimmed}}
+
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        self._blob_keys.setdefault(thread_id, set()).update(
+            (thread_id, checkpoint_ns, channel, version)
+            for channel, version in new_versions.items()
+        )
+        self._prune_checkpoints(thread_id, checkpoint_ns)
+        self._touch(thread_id)
+        return result
+
+    def delete_thread(self, thread_id: str) -> None:
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        self._last_access.pop(thread_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "threads": len(self._last_access),
+            "max_threads": self.max_threads,
+            "checkpoints": sum(len(c) for ns in self.storage.values() for c in ns.values()),
+            "blobs": len(self.blobs),
+            "evicted_threads": self.evicted_threads,
+            "trimmed_messages": self.trimmed_messages,
+        }
+
+
+def create_memory_checkpointer() -> BoundedMemorySaver:
+    """Bounded in-memory checkpointer configured from settings"""
+    return BoundedMemorySaver(
+        max_threads=settings.checkpointer_max_threads,
+        ttl_seconds=settings.checkpointer_thread_ttl_seconds,
+        max_checkpoints=settings.checkpointer_max_checkpoints,
+        max_messages=settings.checkpointer_max_messages,
+    )
+
+
+@asynccontextmanager
+async def open_checkpointer() -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    Open the app's conversation checkpointer for the app lifetime.
+
+    Yields:
+        AsyncSqliteSaver when `checkpointer_path` is set and
+        langgraph-checkpoint-sqlite is installed, else a BoundedMemorySaver
+    """
+    if settings.checkpointer_path:
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            logger.warning(
+                "langgraph-checkpoint-sqlite not installed, using in-memory checkpointer",
+                path=settings.checkpointer_path,
+            )
+        else:
+            async with AsyncSqliteSaver.from_conn_string(settings.checkpointer_path) as saver:
+                logger.info("Using SQLite checkpointer", path=settings.checkpointer_path)
+                yield saver
+            return
+
+    yield create_memory_checkpointer()
+
+
+def checkpointer_stats(checkpointer: BaseCheckpointSaver | None) -> dict:
+    """Stats for the app's checkpointer"""
+    if isinstance(checkpointer, BoundedMemorySaver):
+        return checkpointer.stats()
+    return {"backend": type(checkpointer).__name__ if checkpointer else None}
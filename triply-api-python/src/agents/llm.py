@@ -0,0 +1,166 @@
+"""
+LLM Calls
+
+Single entry point for Gemini calls made by the agents, so every call
+goes through the shared upstream limiter. Models driven by LangGraph
+(the ReAct agent) are wrapped in LimitedChatModel for the same reason.
+
+Model clients are created once per configuration and shared by all
+requests (ChatGoogleGenerativeAI is safe for concurrent use).
+
+Calls time out after gemini_timeout_seconds, capped to the request deadline.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from functools import cache
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from ..config import settings
+from ..logging.metrics import track_upstream
+from ..tools.deadline import call_timeout
+from ..tools.rate_limit import get_limiter
+
+GEMINI_MODEL = "gemini-2.0-flash-exp"
+
+
+@cache
+def get_chat_model(
+    temperature: float,
+    max_output_tokens: int | None = None,
+) -> ChatGoogleGenerativeAI:
+    """
+    Get the shared Gemini client for a configuration.
+
+    Args:
+        temperature: Sampling temperature
+        max_output_tokens: Optional output token cap
+
+    Returns:
+        Process-wide ChatGoogleGenerativeAI instance
+    """
+    kwargs = {"max_output_tokens": max_output_tokens} if max_output_tokens else {}
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
+        google_api_key=settings.google_api_key,
+        temperature=temperature,
+        **kwargs,
+    )
+
+
+async def invoke_llm(model: BaseChatModel, messages: Sequence[BaseMessage]) -> BaseMessage:
+    """
+    Invoke a chat model under the Gemini rate limiter.
+
+    Args:
+        model: Chat model to call
+        messages: Prompt messages
+
+    Returns:
+        The model's response message
+    """
+    timeout = call_timeout(settings.gemini_timeout_seconds)
+    async with get_limiter("gemini").slot(), track_upstream("gemini", "invoke"):
+        return await asyncio.wait_for(model.ainvoke(list(messages)), timeout)
+
+
+async def stream_llm(model: BaseChatModel, messages: Sequence[BaseMessage]) -> AsyncIterator[str]:
+    """
+    Stream a chat model's text output under the Gemini rate limiter.
+
+    Args:
+        model: Chat model to call
+        messages: Prompt messages
+
+    Yields:
+        Text chunks as the model produces them
+    """
+    async with get_limiter("gemini").slot(), track_upstream("gemini", "stream"):
+        chunks = model.astream(list(messages))
+        try:
+            while True:
+                # Each chunk must arrive within the (deadline-capped) timeout
+                timeout = call_timeout(settings.gemini_timeout_seconds)
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout)
+                except StopAsyncIteration:
+                    break
+                if isinstance(chunk.content, str) and chunk.content:
+                    yield chunk.content
+        finally:
+            await chunks.aclose()
+
+
+class LimitedChatModel(BaseChatModel):
+    """
+    Chat model that calls another under the Gemini limiter.
+
+    For models driven by LangGraph (create_react_agent), which call the
+    model themselves instead of going through invoke_llm(). Each call takes
+    a limiter slot, is timed as an upstream call and times out like
+    invoke_llm() / stream_llm(). Streaming is preserved, so astream_events
+    still reports tokens.
+
+    The limiter is asyncio-based, so sync calls (invoke/stream, unused by
+    the app) go straight to the inner model.
+    """
+
+    inner: BaseChatModel
+
+    @property
+    def _llm_type(self) -> str:
+        return f"limited-{self.inner._llm_type}"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        # Let the inner model format the tools, then bind them to this wrapper
+        return self.bind(**self.inner.bind_tools(tools, **kwargs).kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        timeout = call_timeout(settings.gemini_timeout_seconds)
+        async with get_limiter("gemini").slot(), track_upstream("gemini", "invoke"):
+            return await asyncio.wait_for(
+                self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+                timeout,
+            )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async with get_limiter("gemini").slot(), track_upstream("gemini", "stream"):
+            chunks = self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            try:
+                while True:
+                    # Each chunk must arrive within the (deadline-capped) timeout
+                    timeout = call_timeout(settings.gemini_timeout_seconds)
+                    try:
+                        chunk = await asyncio.wait_for(anext(chunks), timeout)
+                    except StopAsyncIteration:
+                        break
+                    yield chunk
+            finally:
+                await chunks.aclose()
@@ -9,11 +9,18 @@ A production-ready multi-agent architecture for trip planning:
 - Validator: Quality checks the final output
 """
 
-from .orchestrator import TripOrchestrator, generate_trip_multi_agent
+from .orchestrator import (
+    TripOrchestrator,
+    generate_trip_multi_agent,
+    get_orchestrator,
+    stream_trip_multi_agent,
+)
 from .state import MultiAgentState
 
 __all__ = [
     "TripOrchestrator",
     "generate_trip_multi_agent",
+    "get_orchestrator",
+    "stream_trip_multi_agent",
     "MultiAgentState",
 ]
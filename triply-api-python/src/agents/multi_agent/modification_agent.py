@@ -14,11 +14,10 @@ import json
 import re
 from enum import Enum
 from pydantic import BaseModel
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 
-from ...config import settings
 from ...logging import get_logger
+from ..llm import get_chat_model, invoke_llm
 from .state import ThemeAnalysis, PlaceData, RestaurantData
 from .places_agent import search_places_for_theme
 from .restaurant_agent import search_restaurants_parallel
@@ -122,11 +121,7 @@ class ModificationAgent:
     """
 
     def __init__(self):
-        self.model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",
-            google_api_key=settings.google_api_key,
-            temperature=0.1,
-        )
+        self.model = get_chat_model(temperature=0.1)
 
     async def analyze_request(
         self,
@@ -350,7 +345,7 @@ For SEMANTIC type, include in params:
 Return ONLY valid JSON."""
 
         try:
-            response = await self.model.ainvoke([HumanMessage(content=prompt)])
+            response = await invoke_llm(self.model, [HumanMessage(content=prompt)])
             content = response.content
 
             # Parse JSON
@@ -785,33 +780,17 @@ Return ONLY valid JSON."""
             end_idx = start_idx + 5
             day_places_for_restaurants.append(new_places[start_idx:end_idx])
 
+        # One restaurant per new day and meal, none already in the trip
+        # (by ID or name); results are tagged with their new day (1-based)
         new_restaurants = await search_restaurants_parallel(
             theme_analysis,
-            day_places_for_restaurants
+            day_places_for_restaurants,
+            exclude_ids=existing_ids,
+            exclude_names=existing_names,
         )
 
-        total_restaurants_found = len(new_restaurants)
-
-        # Filter out restaurants that already exist in the trip (by ID and name)
-        new_restaurants = [
-            r for r in new_restaurants
-            if r.place_id not in existing_ids and r.name.lower().strip() not in existing_names
-        ]
-
-        logger.info(
-            "Filtered restaurants for new day",
-            total_found=total_restaurants_found,
-            after_filter=len(new_restaurants),
-            filtered_out=total_restaurants_found - len(new_restaurants),
-        )
-
-        # Track used restaurants to avoid duplicates within new days
-        used_restaurant_ids = set()
-        used_restaurant_names = set()
-
         # Create new days
         current_day_count = len(trip.get("days", []))
-        restaurants_per_day = 3  # Always try to get 3 restaurants per day (breakfast, lunch, dinner)
 
         for i in range(days_to_add):
             new_day_num = current_day_count + i + 1
@@ -819,24 +798,14 @@ Return ONLY valid JSON."""
             end_idx = start_idx + 5
             day_places = new_places[start_idx:end_idx]
 
-            # Get unique restaurants for this day (not used in previous new days)
-            day_restaurants = []
-            for r in new_restaurants:
-                # Skip if already used in a previous new day
-                if r.place_id in used_restaurant_ids or r.name.lower().strip() in used_restaurant_names:
-                    continue
-                day_restaurants.append(r)
-                used_restaurant_ids.add(r.place_id)
-                used_restaurant_names.add(r.name.lower().strip())
-                # Stop when we have enough restaurants for this day
-                if len(day_restaurants) >= restaurants_per_day:
-                    break
+            # Breakfast, lunch, dinner found near this new day's places
+            day_restaurants = [r for r in new_restaurants if r.day_number == i + 1]
 
             logger.info(
                 "Assigned restaurants for new day",
                 day_num=new_day_num,
                 restaurants_count=len(day_restaurants),
-                used_total=len(used_restaurant_ids),
+                meals=[r.category for r in day_restaurants],
             )
 
             new_day = {
@@ -1042,7 +1011,8 @@ Return ONLY valid JSON."""
 
             new_restaurants = await search_restaurants_parallel(
                 theme_analysis,
-                [day_places]
+                [day_places],
+                exclude_ids={r.get("place_id") for r in restaurants},
             )
 
             # Find restaurant with same category
@@ -1110,7 +1080,7 @@ Be conservative - only change what's necessary for the semantic modification.
 Return ONLY valid JSON."""
 
         try:
-            response = await self.model.ainvoke([HumanMessage(content=prompt)])
+            response = await invoke_llm(self.model, [HumanMessage(content=prompt)])
             content = response.content
 
             if isinstance(content, str):
@@ -3,23 +3,33 @@ Trip Orchestrator
 
 Main coordinator that runs the multi-agent pipeline:
 1. Query Analyzer → Extract theme and generate search queries
-2. Places Agent → Find themed attractions (parallel)
-3. Restaurant Agent → Find themed restaurants (parallel with places)
-4. Assembler → Build day-by-day itinerary
+2. Places Agent → Find themed attractions
+   Restaurant Agent → Discover restaurants city-wide (in parallel with 2)
+3. Restaurant Agent → Refine restaurants per day once places land
+4. Assembler → Build day-by-day itinerary (geographic day clusters,
+   short visiting order; see plan_days())
 5. Validator → Quality check
+6. Top-up → On failure, fill only the gaps validation found (places for
+   day N, a missing meal) and merge them into the plan, then re-validate
 
 Uses LangGraph for workflow orchestration.
 """
 
+import time
 import uuid
 import asyncio
+from collections.abc import AsyncIterator
 from typing import Literal
 
 from langgraph.graph import StateGraph, END
 
 from ...logging import get_logger
 from ...logging.logger import AgentLogger
-from ...tools.google_places import clear_place_cache, get_cached_places
+from ...logging.metrics import VALIDATION_RETRIES, timed_node
+from ...config import settings
+from ...tools.deadline import deadline_scope, has_budget, remaining
+from ...tools.geo import balanced_clusters, haversine_matrix, visit_order
+from ...tools.google_places import new_search_scope
 
 from .state import (
     MultiAgentState,
@@ -31,18 +41,32 @@ from .state import (
     ValidationResult,
 )
 from .query_analyzer import analyze_query
-from .places_agent import search_places_for_theme, get_place_prices
-from .restaurant_agent import search_restaurants_parallel
+from .places_agent import (
+    search_places_for_theme,
+    prefetch_theme_query,
+    get_place_prices,
+    top_up_places,
+)
+from .restaurant_agent import discover_restaurants, search_restaurants_parallel, top_up_restaurant
 from .validator_agent import validate_trip_plan, quick_validate
 
 logger = get_logger("orchestrator")
 
+# Meal slots in day order
+MEALS = ("breakfast", "lunch", "dinner")
+
+# Places per day (min 3, max 5)
+MIN_PLACES_PER_DAY = 3
+MAX_PLACES_PER_DAY = 5
+
 
 class TripOrchestrator:
     """
     Multi-agent orchestrator for trip planning.
 
     Coordinates multiple specialized agents to create high-quality trips.
+    Holds no per-request state, so one compiled instance serves all requests
+    (see get_orchestrator()).
     """
 
     def __init__(self):
@@ -54,34 +78,44 @@ class TripOrchestrator:
         # Define the graph with our state
         workflow = StateGraph(MultiAgentState)
 
-        # Add nodes for each phase
-        workflow.add_node("analyze_query", self._analyze_query_node)
-        workflow.add_node("search_places", self._search_places_node)
-        workflow.add_node("search_restaurants", self._search_restaurants_node)
-        workflow.add_node("assemble_trip", self._assemble_trip_node)
-        workflow.add_node("validate", self._validate_node)
-        workflow.add_node("finalize", self._finalize_node)
+        # Add nodes for each phase (timed, and labelling their upstream calls)
+        nodes = {
+            "analyze_query": self._analyze_query_node,
+            "search_places": self._search_places_node,
+            "discover_restaurants": self._discover_restaurants_node,
+            "search_restaurants": self._search_restaurants_node,
+            "assemble_trip": self._assemble_trip_node,
+            "validate": self._validate_node,
+            "top_up": self._top_up_node,
+            "finalize": self._finalize_node,
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, timed_node(name, node))
 
         # Define edges
         workflow.set_entry_point("analyze_query")
 
-        # After analysis, search places and restaurants in parallel
-        # LangGraph doesn't support true parallel, so we chain them
-        # but the internal searches are parallel
+        # After analysis, place search and city-wide restaurant discovery run
+        # in the same superstep (in parallel). search_restaurants runs once
+        # both are done.
         workflow.add_edge("analyze_query", "search_places")
+        workflow.add_edge("analyze_query", "discover_restaurants")
         workflow.add_edge("search_places", "search_restaurants")
+        workflow.add_edge("discover_restaurants", "search_restaurants")
         workflow.add_edge("search_restaurants", "assemble_trip")
         workflow.add_edge("assemble_trip", "validate")
 
-        # Conditional edge based on validation
+        # Conditional edge based on validation: a failed plan gets its gaps
+        # topped up and is validated again (no full re-search)
         workflow.add_conditional_edges(
             "validate",
             self._should_retry,
             {
-                "retry": "search_places",  # Retry if validation fails
+                "retry": "top_up",
                 "finalize": "finalize",
             }
         )
+        workflow.add_edge("top_up", "validate")
 
         workflow.add_edge("finalize", END)
 
@@ -97,14 +131,19 @@ class TripOrchestrator:
             return "finalize"
 
         if validation and not validation.is_valid:
-            # Check how many times places have been searched (as retry indicator)
-            # Count "search" actions from places_agent
-            search_count = len([
+            # Count top-ups so far (as retry indicator)
+            top_up_count = len([
                 log for log in state.get("agent_logs", [])
-                if log.get("agent") == "places_agent" and log.get("action") == "search"
+                if log.get("action") == "top_up"
             ])
-            if search_count < 2:  # Only retry once (first search + 1 retry = 2 max)
-                logger.info("Validation failed, retrying search", attempt=search_count)
+            if not validation.gaps:
+                # Theme/quality issues only: searching again would find the same places
+                logger.warning("Validation failed without fillable gaps, finalizing anyway")
+            elif not has_budget(settings.deadline_retry_reserve_seconds):
+                logger.warning("Validation failed but deadline is near, finalizing anyway")
+            elif top_up_count < 1:  # Only retry once
+                logger.info("Validation failed, topping up gaps", gaps=len(validation.gaps))
+                VALIDATION_RETRIES.inc()
                 return "retry"
             else:
                 logger.warning("Validation failed but max retries reached, finalizing anyway")
@@ -116,13 +155,18 @@ class TripOrchestrator:
         logger.info("Node: analyze_query", query=state["query"])
 
         try:
-            theme_analysis = await analyze_query(state["query"])
+            # Stream the analysis and start each place search as soon as its
+            # query is complete; search_places picks up the in-flight results
+            theme_analysis = await analyze_query(
+                state["query"],
+                on_search_query=prefetch_theme_query if settings.analyzer_streaming else None,
+            )
 
             return {
                 "theme_analysis": theme_analysis,
                 "current_phase": "analysis_complete",
                 "progress": 0.15,
-                "agent_logs": state.get("agent_logs", []) + [{
+                "agent_logs": [{
                     "agent": "query_analyzer",
                     "action": "analyze",
                     "result": f"Theme: {theme_analysis.theme}, City: {theme_analysis.city}",
@@ -132,7 +176,7 @@ class TripOrchestrator:
         except Exception as e:
             logger.error("Query analysis failed", error=str(e))
             return {
-                "errors": state.get("errors", []) + [f"Query analysis failed: {e}"],
+                "errors": [f"Query analysis failed: {e}"],
                 "current_phase": "error",
             }
 
@@ -142,7 +186,7 @@ class TripOrchestrator:
 
         theme_analysis = state.get("theme_analysis")
         if not theme_analysis:
-            return {"errors": state.get("errors", []) + ["No theme analysis available"]}
+            return {"errors": ["No theme analysis available"]}
 
         try:
             # Search for places
@@ -157,7 +201,7 @@ class TripOrchestrator:
                 "found_places": places,
                 "current_phase": "places_found",
                 "progress": 0.45,
-                "agent_logs": state.get("agent_logs", []) + [{
+                "agent_logs": [{
                     "agent": "places_agent",
                     "action": "search",
                     "result": f"Found {len(places)} places",
@@ -167,39 +211,66 @@ class TripOrchestrator:
         except Exception as e:
             logger.error("Place search failed", error=str(e))
             return {
-                "errors": state.get("errors", []) + [f"Place search failed: {e}"],
+                "errors": [f"Place search failed: {e}"],
                 "found_places": [],
             }
 
+    async def _discover_restaurants_node(self, state: MultiAgentState) -> dict:
+        """Node: Discover restaurant candidates city-wide (parallel with search_places)."""
+        logger.info("Node: discover_restaurants")
+
+        theme_analysis = state.get("theme_analysis")
+        if not theme_analysis:
+            # search_places reports the missing analysis
+            return {}
+
+        try:
+            candidates = await discover_restaurants(theme_analysis)
+
+            return {
+                "restaurant_candidates": candidates,
+                "agent_logs": [{
+                    "agent": "restaurant_agent",
+                    "action": "discover",
+                    "result": f"Found {len(candidates)} candidates",
+                }],
+            }
+
+        except Exception as e:
+            # Not fatal: per-day search still finds restaurants without candidates
+            logger.error("Restaurant discovery failed", error=str(e))
+            return {
+                "errors": [f"Restaurant discovery failed: {e}"],
+                "restaurant_candidates": [],
+            }
+
     async def _search_restaurants_node(self, state: MultiAgentState) -> dict:
-        """Node: Search for themed restaurants."""
+        """Node: Refine restaurants per day, near each day's places."""
         logger.info("Node: search_restaurants")
 
         theme_analysis = state.get("theme_analysis")
         found_places = state.get("found_places", [])
 
         if not theme_analysis:
-            return {"errors": state.get("errors", []) + ["No theme analysis available"]}
+            return {"errors": ["No theme analysis available"]}
 
         try:
-            # Group places by day for location-aware search
-            places_per_day = theme_analysis.duration_days
-            min_places_per_day = 3
-
-            day_places = []
-            for i in range(places_per_day):
-                start_idx = i * min_places_per_day
-                end_idx = start_idx + min_places_per_day
-                day_places.append(found_places[start_idx:end_idx])
+            # Same day plan the assembler will build, so meals are searched
+            # near the first, middle and last stop of each day
+            day_places = plan_days(found_places, theme_analysis.duration_days)
 
             # Search restaurants
-            restaurants = await search_restaurants_parallel(theme_analysis, day_places)
+            restaurants = await search_restaurants_parallel(
+                theme_analysis,
+                day_places,
+                state.get("restaurant_candidates", []),
+            )
 
             return {
                 "found_restaurants": restaurants,
                 "current_phase": "restaurants_found",
                 "progress": 0.65,
-                "agent_logs": state.get("agent_logs", []) + [{
+                "agent_logs": [{
                     "agent": "restaurant_agent",
                     "action": "search",
                     "result": f"Found {len(restaurants)} restaurants",
@@ -209,7 +280,7 @@ class TripOrchestrator:
         except Exception as e:
             logger.error("Restaurant search failed", error=str(e))
             return {
-                "errors": state.get("errors", []) + [f"Restaurant search failed: {e}"],
+                "errors": [f"Restaurant search failed: {e}"],
                 "found_restaurants": [],
             }
 
@@ -222,7 +293,7 @@ class TripOrchestrator:
         found_restaurants = state.get("found_restaurants", [])
 
         if not theme_analysis:
-            return {"errors": state.get("errors", []) + ["No theme analysis available"]}
+            return {"errors": ["No theme analysis available"]}
 
         try:
             trip_plan = assemble_trip_plan(
@@ -235,7 +306,7 @@ class TripOrchestrator:
                 "trip_plan": trip_plan,
                 "current_phase": "assembled",
                 "progress": 0.80,
-                "agent_logs": state.get("agent_logs", []) + [{
+                "agent_logs": [{
                     "agent": "assembler",
                     "action": "assemble",
                     "result": f"Created {len(trip_plan.days)} day plan",
@@ -245,7 +316,7 @@ class TripOrchestrator:
         except Exception as e:
             logger.error("Trip assembly failed", error=str(e))
             return {
-                "errors": state.get("errors", []) + [f"Assembly failed: {e}"],
+                "errors": [f"Assembly failed: {e}"],
             }
 
     async def _validate_node(self, state: MultiAgentState) -> dict:
@@ -263,13 +334,16 @@ class TripOrchestrator:
             }
 
         try:
-            validation_result = await validate_trip_plan(trip_plan)
+            validation_result = await validate_trip_plan(
+                trip_plan,
+                use_llm=has_budget(settings.deadline_llm_reserve_seconds),
+            )
 
             return {
                 "validation_result": validation_result,
                 "current_phase": "validated",
                 "progress": 0.90,
-                "agent_logs": state.get("agent_logs", []) + [{
+                "agent_logs": [{
                     "agent": "validator",
                     "action": "validate",
                     "result": f"Score: {validation_result.quality_score:.2f}, Valid: {validation_result.is_valid}",
@@ -286,13 +360,107 @@ class TripOrchestrator:
                 ),
             }
 
+    async def _top_up_node(self, state: MultiAgentState) -> dict:
+        """Node: Fill the gaps validation found and merge them into the trip plan."""
+        logger.info("Node: top_up")
+
+        trip_plan = state.get("trip_plan")
+        theme_analysis = state.get("theme_analysis")
+        validation = state.get("validation_result")
+        if not trip_plan or not theme_analysis or not validation:
+            return {}
+
+        days = {day.day_number: day for day in trip_plan.days}
+        used_ids = {p.place_id for day in trip_plan.days for p in day.places}
+        used_ids |= {r.place_id for day in trip_plan.days for r in day.restaurants}
+        pool = [c for c in state.get("restaurant_candidates", []) if c.place_id not in used_ids]
+
+        def anchor(day_number: int, meal: str) -> PlaceData | None:
+            # Same anchors as the per-day search: first, middle, last place
+            places = days[day_number].places
+            if not places:
+                return None
+            return places[{"breakfast": 0, "lunch": len(places) // 2}.get(meal, -1)]
+
+        gaps = [gap for gap in validation.gaps if gap.day_number in days]
+        tasks = []
+        for gap in gaps:
+            if gap.kind == "places":
+                places = days[gap.day_number].places
+                tasks.append(top_up_places(
+                    theme_analysis,
+                    near=places[0] if places else None,
+                    exclude_ids=used_ids,
+                ))
+            else:
+                tasks.append(top_up_restaurant(
+                    theme_analysis,
+                    gap.meal,
+                    gap.day_number,
+                    anchor(gap.day_number, gap.meal),
+                    pool,
+                    used_ids,
+                ))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Merge into the existing days (concurrent top-ups may overlap)
+        new_places: dict[int, list[PlaceData]] = {}
+        new_restaurants: dict[int, list[RestaurantData]] = {}
+        filled = 0  # Gaps fully filled
+        for gap, result in zip(gaps, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error("Top-up failed", day=gap.day_number, kind=gap.kind, error=str(result))
+                continue
+            # Places: up to the missing count; restaurants: one per meal
+            wanted = gap.count if gap.kind == "places" else 1
+            target = new_places if gap.kind == "places" else new_restaurants
+            picked = [item for item in result if item.place_id not in used_ids][:wanted]
+            used_ids.update(item.place_id for item in picked)
+            target.setdefault(gap.day_number, []).extend(picked)
+            filled += len(picked) == wanted
+
+        merged_days = []
+        for day in trip_plan.days:
+            added_places = new_places.get(day.day_number, [])
+            added_restaurants = new_restaurants.get(day.day_number, [])
+            if not added_places and not added_restaurants:
+                merged_days.append(day)
+                continue
+
+            update = {
+                "restaurants": sorted(
+                    day.restaurants + added_restaurants,
+                    key=lambda r: MEALS.index(r.category) if r.category in MEALS else len(MEALS),
+                ),
+            }
+            if added_places:
+                update["places"] = order_stops(day.places + added_places)
+                update["title"] = generate_day_title(
+                    day.day_number, update["places"], theme_analysis.theme
+                )
+            merged_days.append(day.model_copy(update=update))
+
+        logger.info("Top-up complete", gaps=len(gaps), filled=filled)
+
+        return {
+            "trip_plan": trip_plan.model_copy(update={"days": merged_days}),
+            "current_phase": "topped_up",
+            "progress": 0.85,
+            "agent_logs": [{
+                "agent": "orchestrator",
+                "action": "top_up",
+                "result": f"Filled {filled} of {len(gaps)} gaps",
+            }],
+        }
+
     async def _finalize_node(self, state: MultiAgentState) -> dict:
         """Node: Finalize and format the trip."""
         logger.info("Node: finalize")
 
         trip_plan = state.get("trip_plan")
         if not trip_plan:
-            return {"errors": state.get("errors", []) + ["No trip plan to finalize"]}
+            return {"errors": ["No trip plan to finalize"]}
 
         # Convert to final JSON format
         final_trip = trip_plan_to_dict(trip_plan)
@@ -301,28 +469,44 @@ class TripOrchestrator:
             "final_trip": final_trip,
             "current_phase": "complete",
             "progress": 1.0,
-            "agent_logs": state.get("agent_logs", []) + [{
+            "agent_logs": [{
                 "agent": "orchestrator",
                 "action": "finalize",
                 "result": "Trip finalized",
             }],
         }
 
-    async def run(self, query: str, execution_id: str | None = None) -> dict:
+    async def stream(
+        self,
+        query: str,
+        execution_id: str | None = None,
+    ) -> AsyncIterator[dict]:
         """
-        Run the multi-agent pipeline.
+        Run the multi-agent pipeline, yielding progress as nodes complete.
+
+        Events:
+        - {"type": "analysis", "theme_analysis", "progress"}: query analyzed
+        - {"type": "plan", "trip_plan", "progress"}: provisional plan, sent when
+          places land (no restaurants yet), when restaurants land and on each
+          (re-)assembly
+        - {"type": "complete", "result"}: last event, same dict run() returns
+
+        The whole run is bounded by `trip_deadline_seconds`. When it passes,
+        the graph is cancelled and the best trip built so far is returned
+        (with "partial": True).
 
         Args:
             query: User's trip request
             execution_id: Optional execution ID
 
-        Returns:
-            Final trip data
+        Yields:
+            Progress events
         """
         execution_id = execution_id or str(uuid.uuid4())
 
-        # Clear place cache
-        clear_place_cache()
+        # Start an execution-scoped search scope (place cache + prefetches)
+        search_scope = new_search_scope()
+        place_cache = search_scope.places
 
         # Initialize state
         initial_state: MultiAgentState = {
@@ -331,6 +515,7 @@ class TripOrchestrator:
             "messages": [],
             "theme_analysis": None,
             "found_places": [],
+            "restaurant_candidates": [],
             "found_restaurants": [],
             "trip_plan": None,
             "validation_result": None,
@@ -343,18 +528,40 @@ class TripOrchestrator:
 
         logger.info("Starting multi-agent pipeline", query=query, execution_id=execution_id)
 
-        try:
-            # Run the graph with high recursion limit
-            # Normal flow: analyze -> places -> restaurants -> assemble -> validate -> finalize = 6 steps
-            # With 1 retry: +4 more steps = 10 steps total
-            # Set limit to 100 for safety
-            result = await self.graph.ainvoke(
-                initial_state,
-                config={"recursion_limit": 100}
-            )
+        # The graph runs in its own task (inheriting the deadline and search
+        # scope) and hands states over a queue, so waiting can stop at the
+        # deadline without cancelling this generator's consumer
+        states: asyncio.Queue = asyncio.Queue()
+        graph_task = None
 
-            # Get cached places for photos
-            place_cache = get_cached_places()
+        try:
+            with deadline_scope(settings.trip_deadline_seconds):
+                graph_task = asyncio.create_task(self._run_graph(initial_state, states))
+                time_left = remaining()
+            deadline_at = None if time_left is None else time.monotonic() + time_left
+
+            result = initial_state
+            timed_out = False
+            while True:
+                timeout = None if deadline_at is None else max(0.0, deadline_at - time.monotonic())
+                try:
+                    state = await asyncio.wait_for(states.get(), timeout)
+                except TimeoutError:
+                    timed_out = True
+                    break
+                if state is None:
+                    break
+                if isinstance(state, BaseException):
+                    raise state
+
+                for event in self._progress_events(result, state):
+                    yield event
+                result = state
+
+            if timed_out:
+                best_effort = self._best_effort_result(result, execution_id, place_cache)
+                yield {"type": "complete", "result": best_effort}
+                return
 
             # Check if we have a valid trip
             final_trip = result.get("final_trip")
@@ -364,14 +571,15 @@ class TripOrchestrator:
                 # Pipeline completed but no trip was generated
                 error_msg = "; ".join(errors) if errors else "Failed to generate trip plan"
                 logger.error("Pipeline completed without trip", errors=errors)
-                return {
+                yield {"type": "complete", "result": {
                     "success": False,
                     "execution_id": execution_id,
                     "error": error_msg,
                     "agent_logs": result.get("agent_logs", []),
-                }
+                }}
+                return
 
-            return {
+            yield {"type": "complete", "result": {
                 "success": True,
                 "execution_id": execution_id,
                 "trip": final_trip,
@@ -379,16 +587,146 @@ class TripOrchestrator:
                 "validation": result.get("validation_result"),
                 "agent_logs": result.get("agent_logs", []),
                 "errors": errors,
-            }
+            }}
 
         except Exception as e:
             logger.error("Pipeline failed", error=str(e), execution_id=execution_id)
-            return {
+            yield {"type": "complete", "result": {
                 "success": False,
                 "execution_id": execution_id,
                 "error": str(e),
+            }}
+        finally:
+            if graph_task is not None and not graph_task.done():
+                graph_task.cancel()
+            search_scope.cancel_pending()
+
+    async def _run_graph(self, initial_state: MultiAgentState, states: asyncio.Queue):
+        """Run the graph, putting each state on the queue, then None (or the error)."""
+        try:
+            # Run the graph with high recursion limit
+            # Normal flow: analyze -> places + discovery -> restaurants -> assemble
+            # -> validate -> finalize = 6 steps
+            # With 1 retry: top_up -> validate = 8 steps total
+            # Set limit to 100 for safety
+            async for state in self.graph.astream(
+                initial_state,
+                config={"recursion_limit": 100},
+                stream_mode="values",
+            ):
+                await states.put(state)
+            await states.put(None)
+        except Exception as e:
+            await states.put(e)
+
+    def _best_effort_result(
+        self,
+        state: MultiAgentState,
+        execution_id: str,
+        place_cache: dict,
+    ) -> dict:
+        """Best trip available from the last graph state when the deadline hits."""
+        errors = state.get("errors", []) + [
+            f"Deadline of {settings.trip_deadline_seconds:.0f}s exceeded "
+            f"in phase {state.get('current_phase')}"
+        ]
+        theme_analysis = state.get("theme_analysis")
+
+        final_trip = state.get("final_trip")
+        if not final_trip and state.get("trip_plan"):
+            final_trip = trip_plan_to_dict(state["trip_plan"])
+        elif not final_trip and theme_analysis and state.get("found_places"):
+            final_trip = trip_plan_to_dict(assemble_trip_plan(
+                theme_analysis,
+                state["found_places"],
+                state.get("found_restaurants") or state.get("restaurant_candidates", []),
+            ))
+
+        logger.warning(
+            "Pipeline deadline exceeded",
+            execution_id=execution_id,
+            phase=state.get("current_phase"),
+            partial_trip=bool(final_trip),
+        )
+
+        if not final_trip:
+            return {
+                "success": False,
+                "execution_id": execution_id,
+                "error": "; ".join(errors),
+                "agent_logs": state.get("agent_logs", []),
             }
 
+        return {
+            "success": True,
+            "partial": True,
+            "execution_id": execution_id,
+            "trip": final_trip,
+            "place_cache": place_cache,
+            "validation": state.get("validation_result"),
+            "agent_logs": state.get("agent_logs", []),
+            "errors": errors,
+        }
+
+    def _progress_events(self, previous: MultiAgentState, state: MultiAgentState) -> list[dict]:
+        """Progress events for what changed between two graph states."""
+        events = []
+        progress = state.get("progress", 0.0)
+        theme_analysis = state.get("theme_analysis")
+
+        if theme_analysis and previous.get("theme_analysis") is None:
+            events.append(
+                {"type": "analysis", "theme_analysis": theme_analysis, "progress": progress}
+            )
+
+        if state.get("trip_plan") is not previous.get("trip_plan"):
+            events.append({"type": "plan", "trip_plan": state["trip_plan"], "progress": progress})
+        elif theme_analysis and (
+            state.get("found_places") is not previous.get("found_places")
+            or state.get("found_restaurants") is not previous.get("found_restaurants")
+        ):
+            # Assembly is cheap and deterministic - preview what it will produce
+            plan = assemble_trip_plan(
+                theme_analysis,
+                state.get("found_places", []),
+                state.get("found_restaurants", []),
+            )
+            events.append({"type": "plan", "trip_plan": plan, "progress": progress})
+
+        return events
+
+    async def run(self, query: str, execution_id: str | None = None) -> dict:
+        """
+        Run the multi-agent pipeline.
+
+        Args:
+            query: User's trip request
+            execution_id: Optional execution ID
+
+        Returns:
+            Final trip data
+        """
+        result = {
+            "success": False,
+            "execution_id": execution_id,
+            "error": "Pipeline produced no result",
+        }
+        async for event in self.stream(query, execution_id):
+            if event["type"] == "complete":
+                result = event["result"]
+        return result
+
+
+_orchestrator: TripOrchestrator | None = None
+
+
+def get_orchestrator() -> TripOrchestrator:
+    """Get the shared orchestrator, building and compiling its graph on first use."""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = TripOrchestrator()
+    return _orchestrator
+
 
 def assemble_trip_plan(
     theme_analysis: ThemeAnalysis,
@@ -414,34 +752,32 @@ def assemble_trip_plan(
     )
 
     days = []
-    # Limit places per day to 3-5 (min 3, max 5)
-    MIN_PLACES_PER_DAY = 3
-    MAX_PLACES_PER_DAY = 5
-    calculated_places_per_day = len(places) // theme_analysis.duration_days
-    places_per_day = max(MIN_PLACES_PER_DAY, min(MAX_PLACES_PER_DAY, calculated_places_per_day))
-
-    for day_num in range(1, theme_analysis.duration_days + 1):
-        # Get places for this day
-        start_idx = (day_num - 1) * places_per_day
-        end_idx = start_idx + places_per_day
-        day_places = places[start_idx:end_idx][:MAX_PLACES_PER_DAY]  # Extra safety limit
-
-        # Get restaurants for this day
+    day_plan = plan_days(places, theme_analysis.duration_days)
+    used_restaurant_ids: set[str] = set()
+
+    for day_num, day_places in enumerate(day_plan, 1):
+        # Get restaurants for this day (tagged by the per-day search,
+        # otherwise the day's slice of the list)
         day_restaurants = []
-        restaurants_per_day = len(restaurants) // theme_analysis.duration_days
-        r_start = (day_num - 1) * restaurants_per_day
-        r_end = r_start + restaurants_per_day
+        day_pool = [r for r in restaurants if r.day_number == day_num]
+        if not day_pool:
+            restaurants_per_day = len(restaurants) // theme_analysis.duration_days
+            r_start = (day_num - 1) * restaurants_per_day
+            r_end = r_start + restaurants_per_day
+            day_pool = restaurants[r_start:r_end]
 
         # Try to get one of each meal type
-        for category in ["breakfast", "lunch", "dinner"]:
-            matching = [r for r in restaurants[r_start:r_end] if r.category == category]
+        for category in MEALS:
+            matching = [r for r in day_pool if r.category == category]
+            if not matching:
+                # Find any restaurant with this category not used on another day
+                matching = [
+                    r for r in restaurants
+                    if r.category == category and r.place_id not in used_restaurant_ids
+                ]
             if matching:
                 day_restaurants.append(matching[0])
-            else:
-                # Find any restaurant with this category
-                all_matching = [r for r in restaurants if r.category == category]
-                if all_matching:
-                    day_restaurants.append(all_matching[0])
+                used_restaurant_ids.add(matching[0].place_id)
 
         # Generate day title based on places
         day_title = generate_day_title(day_num, day_places, theme_analysis.theme)
@@ -454,12 +790,11 @@ def assemble_trip_plan(
             restaurants=day_restaurants,
         ))
 
-    # Generate trip title
-    trip_title = f"{theme_analysis.theme.title()} Trip to {theme_analysis.city}"
+    skeleton = trip_skeleton(theme_analysis)
 
     return TripPlan(
-        title=trip_title,
-        description=f"A {theme_analysis.duration_days}-day {theme_analysis.theme} experience in {theme_analysis.city}, {theme_analysis.country}",
+        title=skeleton["title"],
+        description=skeleton["description"],
         city=theme_analysis.city,
         country=theme_analysis.country,
         duration_days=theme_analysis.duration_days,
@@ -468,6 +803,80 @@ def assemble_trip_plan(
     )
 
 
+def plan_days(places: list[PlaceData], duration_days: int) -> list[list[PlaceData]]:
+    """
+    Split places into geographically coherent days, in visiting order.
+
+    The most relevant places (3-5 per day) are clustered into one compact,
+    equally sized group per day; days are ordered by their best-ranked
+    place and each day's stops by a short walking route. Places without
+    coordinates fill the days with room left.
+
+    Args:
+        places: Places sorted by relevance
+        duration_days: Number of days
+
+    Returns:
+        One list of places per day
+    """
+    if duration_days <= 0:
+        return []
+
+    places_per_day = max(MIN_PLACES_PER_DAY, min(MAX_PLACES_PER_DAY, len(places) // duration_days))
+    selected = places[:duration_days * places_per_day]
+
+    located = [p for p in selected if p.latitude is not None and p.longitude is not None]
+    unlocated = [p for p in selected if p.latitude is None or p.longitude is None]
+
+    clusters = balanced_clusters(
+        [p.latitude for p in located],
+        [p.longitude for p in located],
+        k=duration_days,
+        capacity=places_per_day,
+    )
+    rank = {p.place_id: i for i, p in enumerate(selected)}
+    days = sorted(
+        ([located[i] for i in cluster] for cluster in clusters),
+        key=lambda day: min((rank[p.place_id] for p in day), default=len(selected)),
+    )
+
+    for place in unlocated:
+        day = min((d for d in days if len(d) < places_per_day), key=len, default=None)
+        if day is None:
+            break
+        day.append(place)
+
+    return [order_stops(day) for day in days]
+
+
+def order_stops(places: list[PlaceData]) -> list[PlaceData]:
+    """Order a day's places along a short route (places without coordinates last)"""
+    located = [p for p in places if p.latitude is not None and p.longitude is not None]
+    unlocated = [p for p in places if p.latitude is None or p.longitude is None]
+    if len(located) <= 2:
+        return located + unlocated
+
+    dist = haversine_matrix([p.latitude for p in located], [p.longitude for p in located])
+    return [located[i] for i in visit_order(dist)] + unlocated
+
+
+def trip_skeleton(theme_analysis: ThemeAnalysis) -> dict:
+    """Trip-level fields known right after query analysis (SSE skeleton event)."""
+    return {
+        "title": f"{theme_analysis.theme.title()} Trip to {theme_analysis.city}",
+        "description": (
+            f"A {theme_analysis.duration_days}-day {theme_analysis.theme} experience "
+            f"in {theme_analysis.city}, {theme_analysis.country}"
+        ),
+        "city": theme_analysis.city,
+        "country": theme_analysis.country,
+        "durationDays": theme_analysis.duration_days,
+        "theme": theme_analysis.theme,
+        "thematicKeywords": theme_analysis.related_themes,
+        "vibe": [],
+    }
+
+
 def generate_day_title(day_num: int, places: list[PlaceData], theme: str) -> str:
     """Generate a title for a day based on its places."""
     if not places:
@@ -600,8 +1009,7 @@ async def generate_trip_multi_agent(
     agent_logger.start(query)
 
     try:
-        orchestrator = TripOrchestrator()
-        result = await orchestrator.run(query, execution_id)
+        result = await get_orchestrator().run(query, execution_id)
 
         if result.get("success"):
             agent_logger.complete(success=True)
@@ -620,3 +1028,27 @@ async def generate_trip_multi_agent(
             "execution_id": execution_id,
             "error": str(e),
         }
+
+
+async def stream_trip_multi_agent(query: str) -> AsyncIterator[dict]:
+    """
+    Generate a trip using the multi-agent system, streaming progress.
+
+    Args:
+        query: User's trip request
+
+    Yields:
+        Progress events from TripOrchestrator.stream(); the last one is
+        {"type": "complete", "result": ...}
+    """
+    execution_id = str(uuid.uuid4())
+
+    # Initialize agent logger
+    agent_logger = AgentLogger(trip_id=execution_id, query=query)
+    agent_logger.start(query)
+
+    async for event in get_orchestrator().stream(query, execution_id):
+        if event["type"] == "complete":
+            result = event["result"]
+            agent_logger.complete(success=result.get("success", False), error=result.get("error"))
+        yield event
@@ -7,18 +7,113 @@ Searches in parallel and filters results by theme relevance.
 """
 
 import asyncio
+import contextvars
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import re
+import time
+from collections.abc import AsyncIterator
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from ...cache import create_cache
 from ...config import settings
 from ...logging import get_logger
-from ...tools.google_places import search_places_api, convert_google_place, get_cached_places
-from ...tools.web_search import web_search
+from ..llm import get_chat_model, invoke_llm
+from ...tools.google_places import (
+    PlaceResult,
+    search_places_api,
+    convert_google_place,
+    prefetch_places_search,
+)
+from ...tools.deadline import has_budget
+from ...tools.web_search import TAVILY_AVAILABLE, tavily_search
 from .state import ThemeAnalysis, PlaceData
 
 logger = get_logger("places_agent")
 
+# Cross-request store of LLM theme relevance scores, keyed by (place_id, theme)
+_relevance_store = create_cache(
+    "theme_relevance",
+    ttl_seconds=settings.relevance_cache_ttl_seconds,
+    max_entries=settings.relevance_cache_max_entries,
+    path=settings.relevance_cache_path,
+)
+
+# Cross-request store of ticket prices, keyed by place_id. Records older
+# than price_store_stale_seconds are still used but refreshed in the background
+_price_store = create_cache(
+    "place_prices",
+    ttl_seconds=settings.price_store_ttl_seconds,
+    max_entries=settings.price_store_max_entries,
+    path=settings.price_store_path,
+)
+
+# Background refreshes of stale prices, by place_id (kept referenced until done)
+_price_refreshes: dict[str, asyncio.Task] = {}
+
+
+def _relevance_key(place_id: str, theme: str) -> str:
+    return f"{place_id}|{' '.join(theme.lower().split())}"
+
+
+# Results requested per analyzer query
+THEME_QUERY_MAX_RESULTS = 5
+
+# Top-up searches (validation found a day short of places): radius around
+# the day's places, and related themes searched besides the main theme
+TOP_UP_RADIUS_M = 3000
+TOP_UP_RELATED_THEMES = 2
+
+# Ticket prices are looked up for at most this many places per trip
+PRICE_LOOKUP_MAX_PLACES = 15
+
+# Ticket price formats found in search text (most specific first)
+PRICE_PATTERNS = [
+    r'[€$£]\s*\d+(?:\.\d{2})?',
+    r'\d+(?:\.\d{2})?\s*[€$£]',
+    r'(?:EUR|USD|GBP)\s*\d+',
+]
+
+# Characters kept on each side of a matched price as its source snippet
+PRICE_SOURCE_CONTEXT_CHARS = 80
+
+# Unknown places are priced together, this many per combined search; places
+# a combined search misses get their own search, at most this many per trip
+PRICE_BATCH_SIZE = 5
+PRICE_BATCH_MAX_RESULTS = 10
+PRICE_FALLBACK_MAX_SEARCHES = 5
+
+# Generic words that do not identify a place on their own (price matching)
+PLACE_NAME_STOPWORDS = {
+    "the", "and", "of", "de", "del", "della", "di", "du", "des", "la", "le", "les",
+    "museum", "museo", "musée", "gallery", "galleria", "park", "parc", "parque",
+    "church", "cathedral", "palace", "palazzo", "palais", "castle", "tower",
+    "garden", "gardens", "square", "temple", "shrine", "market", "national", "art",
+}
+
+# Types that indicate a restaurant/food establishment - MUST be excluded from places
+RESTAURANT_TYPES = {
+    "restaurant",
+    "food",
+    "cafe",
+    "bakery",
+    "bar",
+    "meal_delivery",
+    "meal_takeaway",
+    "night_club",
+    "liquor_store",
+    "coffee_shop",
+}
+
+
+def prefetch_theme_query(query: str):
+    """
+    Start the Places search for one analyzer query in the background.
+
+    search_places_for_theme() later picks up the in-flight or finished
+    result instead of sending the request again.
+    """
+    prefetch_places_search(query, max_results=THEME_QUERY_MAX_RESULTS)
+
 # Prompt for evaluating theme relevance
 RELEVANCE_PROMPT = """You are evaluating places for a THEMED trip.
 
@@ -73,10 +168,16 @@ async def search_places_for_theme(
     # Search for more than needed to filter
     search_limit = max(total_needed * 2, 20)
 
+    # Short on time: run only the first (most specific) half of the queries
+    queries = theme_analysis.search_queries
+    if not has_budget(settings.deadline_full_search_seconds):
+        queries = queries[:max(2, len(queries) // 2)]
+        logger.info("Deadline near, trimming place queries", queries=len(queries))
+
     # Execute all search queries in parallel
     async def search_single_query(query: str) -> list[dict]:
         try:
-            results = await search_places_api(query, max_results=5)
+            results = await search_places_api(query, max_results=THEME_QUERY_MAX_RESULTS)
             logger.debug(f"Query '{query}' returned {len(results)} results")
             return results
         except Exception as e:
@@ -85,7 +186,7 @@ async def search_places_for_theme(
 
     # Run all searches in parallel
     all_results = await asyncio.gather(
-        *[search_single_query(q) for q in theme_analysis.search_queries],
+        *[search_single_query(q) for q in queries],
         return_exceptions=True
     )
 
@@ -102,9 +203,9 @@ async def search_places_for_theme(
                 seen_ids.add(place_id)
                 unique_places.append(place)
 
-    logger.info(f"Found {len(unique_places)} unique places from {len(theme_analysis.search_queries)} queries")
+    logger.info(f"Found {len(unique_places)} unique places from {len(queries)} queries")
 
-    if not unique_places:
+    if not unique_places and has_budget(settings.deadline_search_reserve_seconds):
         logger.warning("No places found, trying related themes")
         # Try related themes
         for related_theme in theme_analysis.related_themes[:3]:
@@ -119,20 +220,6 @@ async def search_places_for_theme(
             except Exception as e:
                 logger.error(f"Related theme search failed", error=str(e))
 
-    # Types that indicate a restaurant/food establishment - MUST be excluded from places
-    RESTAURANT_TYPES = {
-        "restaurant",
-        "food",
-        "cafe",
-        "bakery",
-        "bar",
-        "meal_delivery",
-        "meal_takeaway",
-        "night_club",
-        "liquor_store",
-        "coffee_shop",
-    }
-
     # Convert to PlaceResult and then to PlaceData
     converted_places = []
     for raw_place in unique_places:
@@ -149,24 +236,14 @@ async def search_places_for_theme(
                 )
                 continue
 
-            converted_places.append(PlaceData(
-                place_id=place_result.place_id,
-                name=place_result.name,
-                address=place_result.address,
-                rating=place_result.rating,
-                price_level=place_result.price_level,
-                types=place_result.types,
-                latitude=place_result.location.get("lat") if place_result.location else None,
-                longitude=place_result.location.get("lng") if place_result.location else None,
-                photo_urls=place_result.photo_urls,
-                opening_hours=place_result.opening_hours,
-                description=place_result.description,
-            ))
+            converted_places.append(_to_place_data(place_result))
         except Exception as e:
             logger.error(f"Failed to convert place", error=str(e))
 
-    # Evaluate theme relevance using LLM
-    if converted_places:
+    # Evaluate theme relevance using LLM (optional when short on time)
+    if converted_places and not has_budget(settings.deadline_llm_reserve_seconds):
+        logger.info("Deadline near, skipping theme relevance pass")
+    elif converted_places:
         converted_places = await evaluate_theme_relevance(
             converted_places,
             theme_analysis.theme,
@@ -196,6 +273,93 @@ async def search_places_for_theme(
     return filtered_places[:search_limit]
 
 
+def _to_place_data(place_result: PlaceResult) -> PlaceData:
+    """Convert a Places result to PlaceData"""
+    return PlaceData(
+        place_id=place_result.place_id,
+        name=place_result.name,
+        address=place_result.address,
+        rating=place_result.rating,
+        price_level=place_result.price_level,
+        types=place_result.types,
+        latitude=place_result.location.get("lat") if place_result.location else None,
+        longitude=place_result.location.get("lng") if place_result.location else None,
+        photo_urls=place_result.photo_urls,
+        opening_hours=place_result.opening_hours,
+        description=place_result.description,
+    )
+
+
+async def top_up_places(
+    theme_analysis: ThemeAnalysis,
+    near: PlaceData | None = None,
+    exclude_ids: set[str] | None = None,
+) -> list[PlaceData]:
+    """
+    Find a few more themed places for one day.
+
+    Used when validation finds a day short of places: searches the theme and
+    a couple of related themes around the day's existing places, instead of
+    re-running every analyzer query.
+
+    Args:
+        theme_analysis: Query analysis
+        near: A place of the day to search around (None = city-wide)
+        exclude_ids: Place IDs already in the trip
+
+    Returns:
+        New places, most relevant first (top-ups for several days may
+        overlap, so the caller takes the unused ones it needs)
+    """
+    exclude_ids = exclude_ids or set()
+    location = None
+    if near and near.latitude and near.longitude:
+        location = {"lat": near.latitude, "lng": near.longitude}
+
+    themes = [theme_analysis.theme] + theme_analysis.related_themes[:TOP_UP_RELATED_THEMES]
+    queries = [f"{theme} {theme_analysis.city}" for theme in themes]
+
+    logger.info("Topping up places", queries=len(queries), near=near.name if near else None)
+
+    results = await asyncio.gather(
+        *[
+            search_places_api(
+                q, max_results=THEME_QUERY_MAX_RESULTS, location=location, radius=TOP_UP_RADIUS_M
+            )
+            for q in queries
+        ],
+        return_exceptions=True,
+    )
+
+    seen_ids = set(exclude_ids)
+    places = []
+    for query, result in zip(queries, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error("Top-up search failed", query=query, error=str(result))
+            continue
+        for raw_place in result:
+            try:
+                place_result = convert_google_place(raw_place)
+            except Exception as e:
+                logger.error("Failed to convert place", error=str(e))
+                continue
+            if place_result.place_id in seen_ids or set(place_result.types) & RESTAURANT_TYPES:
+                continue
+            seen_ids.add(place_result.place_id)
+            places.append(_to_place_data(place_result))
+
+    # Few places: one small LLM call (most scores come from the relevance store)
+    if places and has_budget(settings.deadline_llm_reserve_seconds):
+        places = await evaluate_theme_relevance(
+            places,
+            theme_analysis.theme,
+            theme_analysis.related_themes,
+        )
+
+    places.sort(key=lambda p: (p.theme_relevance, p.rating or 0), reverse=True)
+    return places
+
+
 async def evaluate_theme_relevance(
     places: list[PlaceData],
     theme: str,
@@ -204,6 +368,9 @@ async def evaluate_theme_relevance(
     """
     Use LLM to evaluate how relevant each place is to the theme.
 
+    Scores already known for (place_id, theme) come from the relevance
+    store; only unseen places are sent to the LLM.
+
     Args:
         places: List of places to evaluate
         theme: Main theme
@@ -215,9 +382,30 @@ async def evaluate_theme_relevance(
     if not places:
         return places
 
+    # Reuse stored scores, collect places the LLM has not seen for this theme
+    stored_scores = await asyncio.gather(
+        *[_relevance_store.get(_relevance_key(p.place_id, theme)) for p in places]
+    )
+    unscored = []
+    for place, score in zip(places, stored_scores, strict=True):
+        if score is not None:
+            place.theme_relevance = score
+        else:
+            unscored.append(place)
+
+    logger.info(
+        "Theme relevance store lookup",
+        theme=theme,
+        stored=len(places) - len(unscored),
+        unscored=len(unscored),
+    )
+
+    if not unscored:
+        return places
+
     # Prepare places info for LLM
     places_info = []
-    for p in places[:30]:  # Limit to avoid token limits
+    for p in unscored[:30]:  # Limit to avoid token limits
         places_info.append({
             "place_id": p.place_id,
             "name": p.name,
@@ -225,11 +413,7 @@ async def evaluate_theme_relevance(
             "address": p.address,
         })
 
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
-        google_api_key=settings.google_api_key,
-        temperature=0.1,
-    )
+    model = get_chat_model(temperature=0.1)
 
     prompt = RELEVANCE_PROMPT.format(
         theme=theme,
@@ -238,14 +422,13 @@ async def evaluate_theme_relevance(
     )
 
     try:
-        response = await model.ainvoke([HumanMessage(content=prompt)])
+        response = await invoke_llm(model, [HumanMessage(content=prompt)])
         content = response.content
 
         # Parse response
         if isinstance(content, str):
             # Clean markdown
             if "```" in content:
-                import re
                 match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
                 if match:
                     content = match.group(1)
@@ -255,10 +438,14 @@ async def evaluate_theme_relevance(
             # Create lookup
             score_map = {s["place_id"]: s["relevance_score"] for s in scores}
 
-            # Update places
-            for place in places:
+            # Update places and remember their scores for later trips
+            for place in unscored:
                 if place.place_id in score_map:
                     place.theme_relevance = score_map[place.place_id]
+                    await _relevance_store.set(
+                        _relevance_key(place.place_id, theme),
+                        place.theme_relevance,
+                    )
 
     except Exception as e:
         logger.error("Failed to evaluate theme relevance", error=str(e))
@@ -267,74 +454,335 @@ async def evaluate_theme_relevance(
     return places
 
 
-async def get_place_prices(places: list[PlaceData], city: str) -> list[PlaceData]:
+def _extract_price(text: str) -> tuple[str | None, str | None]:
+    """Find a ticket price in search text, returns (price, surrounding snippet)"""
+    # Look for common price patterns
+    for pattern in PRICE_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            start = max(0, match.start() - PRICE_SOURCE_CONTEXT_CHARS)
+            return match.group(0), text[start:match.end() + PRICE_SOURCE_CONTEXT_CHARS].strip()
+
+    # Check for "free" mentions
+    if "free" in text.lower() and "admission" in text.lower():
+        return "Free", text[:2 * PRICE_SOURCE_CONTEXT_CHARS].strip()
+
+    return None, None
+
+
+def _single_price(text: str) -> tuple[str | None, str | None]:
+    """Like _extract_price, but only if the text states exactly one distinct price"""
+    prices = {re.sub(r"\s+", "", m) for m in re.findall("|".join(PRICE_PATTERNS), text)}
+    if len(prices) > 1:
+        return None, None
+    return _extract_price(text)
+
+
+def _mentions(text: str, name: str) -> bool:
     """
-    Search for real ticket prices for attractions.
+    True if a text mentions a place name.
+
+    Matches the full name, or all of its identifying words (generic words
+    like "museum" or "the" dropped) in any order.
+    """
+    words = re.findall(r"\w+", name.lower())
+    if not words:
+        return False
+
+    if re.search(r"\b" + r"\W+".join(map(re.escape, words)) + r"\b", text, re.IGNORECASE):
+        return True
+
+    tokens = [w for w in words if len(w) >= 3 and w not in PLACE_NAME_STOPWORDS]
+    return bool(tokens) and all(
+        re.search(rf"\b{re.escape(token)}\b", text, re.IGNORECASE) for token in tokens
+    )
+
+
+def _match_batch_prices(
+    places: list[PlaceData],
+    response: dict,
+) -> dict[str, tuple[str, str | None, str | None]]:
+    """
+    Map the prices in a combined search back to the places they belong to.
+
+    Tavily's answer and each result are split into sentences. A sentence
+    is evidence for a place only if it mentions that place and no other
+    and states exactly one price; so does a result whose title names
+    exactly one place and whose content states exactly one price. A place
+    is priced only when all its evidence agrees. Anything ambiguous
+    (enumerations, places sharing a name) is left to the per-place search.
 
     Args:
-        places: Places to get prices for
+        places: Places searched together
+        response: Raw Tavily response
+
+    Returns:
+        Dict of place_id -> (price, source snippet, source URL)
+    """
+    texts = [(response.get("answer") or "", "", None)]
+    texts += [
+        (r.get("content") or "", r.get("title") or "", r.get("url"))
+        for r in response.get("results", [])
+    ]
+
+    segments = []  # (text, url, places it mentions)
+    for content, title, url in texts:
+        for sentence in re.split(r"(?<=[.!?])\s+|\n+", content):
+            segments.append((sentence, url, [p for p in places if _mentions(sentence, p.name)]))
+        # Pages about a single place
+        if title:
+            segments.append((content, url, [p for p in places if _mentions(title, p.name)]))
+
+    evidence: dict[str, list[tuple[str, str | None, str | None]]] = {}
+    for text, url, mentioned in segments:
+        if len(mentioned) != 1:
+            continue
+        price, snippet = _single_price(text)
+        if price:
+            evidence.setdefault(mentioned[0].place_id, []).append((price, snippet, url))
+
+    matches = {}
+    for place_id, found in evidence.items():
+        if len({re.sub(r"\s+", "", price) for price, _, _ in found}) == 1:
+            matches[place_id] = found[0]
+    return matches
+
+
+async def _store_price(
+    place: PlaceData,
+    price: str | None,
+    source: str | None = None,
+    source_url: str | None = None,
+) -> dict:
+    """Record a price search result in the price store, returns the record"""
+    record = {"price": price, "source": source, "source_url": source_url, "fetched_at": time.time()}
+    await _price_store.set(place.place_id, record)
+    return record
+
+
+async def _fetch_price(place: PlaceData, city: str) -> dict | None:
+    """
+    Search the web for a place's ticket price and record it in the price store.
+
+    "No price found" is recorded too, so the place is not searched again
+    until the record goes stale.
+
+    Args:
+        place: Place to price
         city: City name for search context
 
     Returns:
-        Places with updated price information
+        The stored record ({price, source, source_url, fetched_at}),
+        or None if the search failed
     """
-    logger.info(f"Getting prices for {len(places)} places")
+    try:
+        query = f"{place.name} {city} entrance fee ticket price 2024"
+        response = await tavily_search(query, max_results=3)
+    except Exception as e:
+        logger.error(f"Price search failed for {place.name}", error=str(e))
+        return None
 
-    async def get_price_for_place(place: PlaceData) -> tuple[str, str | None]:
-        try:
-            # Use web search to find ticket price
-            query = f"{place.name} {city} entrance fee ticket price 2024"
-            result = await web_search.ainvoke({"query": query, "max_results": 3})
-
-            # Simple extraction - look for price patterns
-            if isinstance(result, str):
-                import re
-                # Look for common price patterns
-                patterns = [
-                    r'[€$£]\s*\d+(?:\.\d{2})?',
-                    r'\d+(?:\.\d{2})?\s*[€$£]',
-                    r'(?:EUR|USD|GBP)\s*\d+',
-                ]
-                for pattern in patterns:
-                    match = re.search(pattern, result)
-                    if match:
-                        return (place.place_id, match.group(0))
-
-                # Check for "free" mentions
-                if "free" in result.lower() and "admission" in result.lower():
-                    return (place.place_id, "Free")
-
-            return (place.place_id, None)
+    # Tavily's answer summary first, then the individual results
+    texts = [(response.get("answer") or "", None)]
+    texts += [(r.get("content") or "", r.get("url")) for r in response.get("results", [])]
 
-        except Exception as e:
-            logger.error(f"Price search failed for {place.name}", error=str(e))
-            return (place.place_id, None)
+    for text, url in texts:
+        price, snippet = _extract_price(text)
+        if price:
+            return await _store_price(place, price, snippet, url)
+    return await _store_price(place, None)
+
+
+async def _fetch_batch_prices(
+    places: list[PlaceData],
+    city: str,
+) -> tuple[list[tuple[PlaceData, str]], list[PlaceData]]:
+    """
+    One combined price search for several places in a city.
 
-    # Get prices in parallel (limit concurrency)
-    semaphore = asyncio.Semaphore(5)
+    Prices matched to a place are recorded in the price store. A place the
+    search does not price is left for a per-place search (one combined
+    search missing it is no evidence it has no price).
 
-    async def limited_get_price(place):
-        async with semaphore:
-            return await get_price_for_place(place)
+    Args:
+        places: Places to search together (PRICE_BATCH_SIZE at most)
+        city: City name for search context
+
+    Returns:
+        (priced places, places the search did not price)
+    """
+    names = ", ".join(p.name for p in places)
+    try:
+        response = await tavily_search(
+            f"{names} {city} entrance fee ticket prices",
+            max_results=PRICE_BATCH_MAX_RESULTS,
+        )
+    except Exception as e:
+        logger.error("Batched price search failed", places=len(places), error=str(e))
+        return [], places
+
+    matches = _match_batch_prices(places, response)
+    priced = []
+    for place in places:
+        if place.place_id in matches:
+            price, snippet, url = matches[place.place_id]
+            await _store_price(place, price, snippet, url)
+            priced.append((place, price))
+
+    logger.debug("Batched price search", places=len(places), priced=len(priced))
+    return priced, [p for p in places if p.place_id not in matches]
+
+
+async def _refresh_prices(places: list[PlaceData], city: str):
+    """Re-search stale prices: combined searches, then per place for the rest"""
+    for i in range(0, len(places), PRICE_BATCH_SIZE):
+        _, unmatched = await _fetch_batch_prices(places[i:i + PRICE_BATCH_SIZE], city)
+        for place in unmatched:
+            await _fetch_price(place, city)
+
+
+def _start_price_refresh(places: list[PlaceData], city: str):
+    """Refresh stale prices off the request path (once per place at a time)"""
+    places = [p for p in places if p.place_id not in _price_refreshes]
+    if not places:
+        return
+
+    # Fresh context: the refresh is not bound by the request deadline
+    task = asyncio.create_task(_refresh_prices(places, city), context=contextvars.Context())
+    for place in places:
+        _price_refreshes[place.place_id] = task
 
+    def done(_):
+        for place in places:
+            _price_refreshes.pop(place.place_id, None)
+
+    task.add_done_callback(done)
+
+
+async def cancel_price_refreshes():
+    """Cancel background price refreshes (app shutdown)"""
+    tasks = set(_price_refreshes.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def iter_place_prices(
+    places: list[PlaceData],
+    city: str,
+) -> AsyncIterator[tuple[PlaceData, str]]:
+    """
+    Get ticket prices and yield each one as soon as it is known.
+
+    Prices in the price store are yielded first; stale ones are also
+    refreshed in the background for later trips. Places the store does not
+    know are searched together, PRICE_BATCH_SIZE per combined search, and
+    the prices are matched back to places by name. Places a combined search
+    misses get their own search, at most PRICE_FALLBACK_MAX_SEARCHES per
+    call. Searches run concurrently (bounded by the shared Tavily limiter);
+    one slower than price_lookup_timeout_seconds is dropped, and searches
+    still running when the price_phase_budget_seconds budget runs out are
+    cancelled, as are any left when the caller stops iterating.
+
+    Args:
+        places: Places to get prices for (only the first PRICE_LOOKUP_MAX_PLACES)
+        city: City name for search context
+
+    Yields:
+        (place, price) for each place whose price was found
+    """
     # Only get prices for top places (to save API calls)
-    top_places = places[:15]
-    price_results = await asyncio.gather(
-        *[limited_get_price(p) for p in top_places],
-        return_exceptions=True
+    top_places = places[:PRICE_LOOKUP_MAX_PLACES]
+    records = await asyncio.gather(*[_price_store.get(p.place_id) for p in top_places])
+
+    known = []
+    unknown = []
+    stale = []
+    for place, record in zip(top_places, records, strict=True):
+        if record is None:
+            unknown.append(place)
+            continue
+        known.append((place, record["price"]))
+        if time.time() - record["fetched_at"] >= settings.price_store_stale_seconds:
+            stale.append(place)
+
+    if not TAVILY_AVAILABLE:
+        unknown, stale = [], []
+    if stale:
+        _start_price_refresh(stale, city)
+
+    logger.info(
+        f"Getting prices for {len(top_places)} places",
+        stored=len(known),
+        stale=len(stale),
+        searching=len(unknown),
     )
 
-    # Update places with prices
-    price_map = {}
-    for result in price_results:
-        if isinstance(result, tuple):
-            place_id, price = result
+    async def timed(search, searched: list[PlaceData]):
+        try:
+            return await asyncio.wait_for(search, settings.price_lookup_timeout_seconds)
+        except TimeoutError:
+            logger.debug("Price search timed out", places=[p.name for p in searched])
+            return [], searched
+
+    async def search_one(place: PlaceData):
+        record = await _fetch_price(place, city)
+        return ([(place, record["price"])] if record and record["price"] else []), []
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.price_phase_budget_seconds
+    batches = [unknown[i:i + PRICE_BATCH_SIZE] for i in range(0, len(unknown), PRICE_BATCH_SIZE)]
+    batch_tasks = {
+        asyncio.create_task(timed(_fetch_batch_prices(batch, city), batch)) for batch in batches
+    }
+    pending = set(batch_tasks)
+    fallbacks_left = PRICE_FALLBACK_MAX_SEARCHES
+    found = 0
+    try:
+        for place, price in known:
             if price:
-                price_map[place_id] = price
+                found += 1
+                yield place, price
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                logger.warning("Price search budget exhausted", pending=len(pending))
+                break
+
+            for task in done:
+                priced, unmatched = task.result()
+                for place, price in priced:
+                    found += 1
+                    yield place, price
+
+                # Places a combined search missed get their own search
+                if task in batch_tasks:
+                    for place in unmatched[:fallbacks_left]:
+                        pending.add(asyncio.create_task(timed(search_one(place), [place])))
+                    fallbacks_left -= min(fallbacks_left, len(unmatched))
+    finally:
+        for task in pending:
+            task.cancel()
+
+    logger.info(f"Found prices for {found} places")
 
-    for place in places:
-        if place.place_id in price_map:
-            place.price = price_map[place.place_id]
 
-    logger.info(f"Found prices for {len(price_map)} places")
+async def get_place_prices(places: list[PlaceData], city: str) -> list[PlaceData]:
+    """
+    Search for real ticket prices for attractions.
+
+    Args:
+        places: Places to get prices for
+        city: City name for search context
+
+    Returns:
+        Places with updated price information
+    """
+    async for place, price in iter_place_prices(places, city):
+        place.price = price
     return places
@@ -10,11 +10,14 @@ Analyzes user queries to extract:
 """
 
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import re
+from collections.abc import Callable
+
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, SystemMessage
 
-from ...config import settings
 from ...logging import get_logger
+from ..llm import get_chat_model, invoke_llm, stream_llm
 from .state import ThemeAnalysis
 
 logger = get_logger("query_analyzer")
@@ -124,23 +127,79 @@ Query: "5 day vegan food trip to Berlin"
 Return ONLY valid JSON, no markdown or explanation."""
 
 
-async def analyze_query(query: str) -> ThemeAnalysis:
+class JsonArrayScanner:
+    """
+    Pulls completed string items of one JSON array out of a partial JSON document.
+
+    Feed it the growing model output; each call returns the items that became
+    complete since the previous call.
+    """
+
+    def __init__(self, key: str):
+        self._start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+        self._decoder = json.JSONDecoder()
+        self.emitted = 0
+
+    def feed(self, text: str) -> list[str]:
+        match = self._start.search(text)
+        if not match:
+            return []
+
+        items = []
+        pos = match.end()
+        while True:
+            while pos < len(text) and text[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(text) or text[pos] != '"':
+                break  # End of array or not streamed yet
+            try:
+                item, pos = self._decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                break  # String still incomplete
+            items.append(item)
+
+        new_items = items[self.emitted:]
+        self.emitted = len(items)
+        return new_items
+
+
+async def _stream_analysis(
+    model: BaseChatModel,
+    messages: list,
+    on_search_query: Callable[[str], None],
+) -> str:
+    """Stream the analyzer response, reporting each search query as soon as it is complete"""
+    scanner = JsonArrayScanner("search_queries")
+    content = ""
+    async for chunk in stream_llm(model, messages):
+        content += chunk
+        for search_query in scanner.feed(content):
+            on_search_query(search_query)
+
+    logger.debug("Analyzer stream complete", streamed_queries=scanner.emitted)
+    return content
+
+
+async def analyze_query(
+    query: str,
+    on_search_query: Callable[[str], None] | None = None,
+) -> ThemeAnalysis:
     """
     Analyze user query and extract theme, city, duration, and search queries.
 
     Args:
         query: User's trip request
+        on_search_query: Optional callback called with each search query as soon
+            as it is complete in the model output. When given, the response is
+            streamed so searches can start before the analysis finishes.
 
     Returns:
         ThemeAnalysis with extracted information
     """
     logger.info("Analyzing query", query=query)
 
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
-        google_api_key=settings.google_api_key,
-        temperature=0.3,  # Lower temperature for more consistent parsing
-    )
+    # Lower temperature for more consistent parsing
+    model = get_chat_model(temperature=0.3)
 
     messages = [
         SystemMessage(content=ANALYZER_SYSTEM_PROMPT),
@@ -148,14 +207,16 @@ async def analyze_query(query: str) -> ThemeAnalysis:
     ]
 
     try:
-        response = await model.ainvoke(messages)
-        content = response.content
+        if on_search_query is None:
+            response = await invoke_llm(model, messages)
+            content = response.content
+        else:
+            content = await _stream_analysis(model, messages, on_search_query)
 
         # Clean up response
         if isinstance(content, str):
             # Remove markdown code blocks if present
             if content.startswith("```"):
-                import re
                 match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
                 if match:
                     content = match.group(1)
@@ -3,16 +3,21 @@ Restaurant Agent
 
 Specialized agent for finding themed restaurants.
 Finds breakfast, lunch, and dinner spots that match the trip theme.
-Uses location-aware search to place restaurants near day's attractions.
+
+Runs in two steps so it can overlap with the place search:
+1. discover_restaurants() - city-wide candidates, right after query analysis
+2. search_restaurants_parallel() - per-day refinement once places land:
+   nearby candidates are reused, location-aware search fills the gaps
 """
 
 import asyncio
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 
 from ...config import settings
 from ...logging import get_logger
+from ...tools.deadline import has_budget
+from ...tools.geo import distance_m
 from ...tools.google_places import search_places_api, convert_google_place
 from .state import ThemeAnalysis, PlaceData, RestaurantData
 
@@ -44,6 +49,18 @@ MEAL_PREFERENCES = {
     "dinner": ["restaurant", "fine dining", "dinner", "evening dining"],
 }
 
+# Candidate categories that can fill each meal slot
+MEAL_COMPATIBILITY = {
+    "breakfast": ("breakfast",),
+    "lunch": ("lunch", "dinner"),
+    "dinner": ("dinner", "lunch"),
+}
+
+# City-wide discovery: results per query, and how far a candidate may be
+# from a day's anchor place to be used for that day's meal
+DISCOVERY_MAX_RESULTS = 10
+CANDIDATE_MAX_DISTANCE_M = 2000
+
 
 async def search_restaurants_for_theme(
     theme_analysis: ThemeAnalysis,
@@ -197,115 +214,309 @@ async def search_single_restaurant(
     return None
 
 
+def _meal_for_query(query: str) -> str:
+    """Guess the meal a restaurant query is for (defaults to dinner)"""
+    query = query.lower()
+    if any(word in query for word in MEAL_PREFERENCES["breakfast"]):
+        return "breakfast"
+    if "lunch" in query:
+        return "lunch"
+    return "dinner"
+
+
+def _to_restaurant(raw_place: dict, meal_type: str, cuisine: str) -> RestaurantData:
+    """Convert a raw Places result to RestaurantData"""
+    place = convert_google_place(raw_place)
+
+    price_range = None
+    if place.price_level is not None:
+        price_symbols = ["Free", "$", "$$", "$$$", "$$$$"]
+        price_range = price_symbols[min(place.price_level, 4)]
+
+    return RestaurantData(
+        place_id=place.place_id,
+        name=place.name,
+        address=place.address,
+        rating=place.rating,
+        price_range=price_range,
+        price_level=place.price_level,
+        cuisine=cuisine,
+        latitude=place.location.get("lat") if place.location else None,
+        longitude=place.location.get("lng") if place.location else None,
+        photo_urls=place.photo_urls,
+        category=meal_type,
+        opening_hours=place.opening_hours,
+        description=place.description,
+    )
+
+
+async def discover_restaurants(theme_analysis: ThemeAnalysis) -> list[RestaurantData]:
+    """
+    City-wide restaurant discovery.
+
+    Needs only the query analysis, so it runs in parallel with the place
+    search. Searches are biased to the city by name; per-day refinement in
+    search_restaurants_parallel() then picks candidates near each day's places.
+
+    Args:
+        theme_analysis: Query analysis
+
+    Returns:
+        Unique candidates (best rated first per query) with a meal category
+    """
+    theme_cuisines = THEME_CUISINE_MAP.get(
+        theme_analysis.theme.lower(),
+        ["local cuisine", "popular restaurant"]
+    )
+    cuisine = theme_cuisines[0] if theme_cuisines else "restaurant"
+
+    # Same per-meal queries the per-day search uses, plus the analyzer's ones
+    searches = [
+        (meal_type, f"{cuisine} {meal_type} {theme_analysis.city}")
+        for meal_type in MEAL_COMPATIBILITY
+    ]
+    searches += [(_meal_for_query(q), q) for q in theme_analysis.restaurant_queries]
+
+    logger.info(
+        "Discovering restaurants city-wide", city=theme_analysis.city, queries=len(searches)
+    )
+
+    results = await asyncio.gather(
+        *[search_places_api(query, max_results=DISCOVERY_MAX_RESULTS) for _, query in searches],
+        return_exceptions=True,
+    )
+
+    candidates: list[RestaurantData] = []
+    seen_ids: set[str] = set()
+    for (meal_type, query), result in zip(searches, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error("Restaurant discovery failed", query=query, error=str(result))
+            continue
+
+        for raw_place in sorted(result, key=lambda x: x.get("rating", 0), reverse=True):
+            restaurant = _to_restaurant(raw_place, meal_type, cuisine)
+            if restaurant.place_id in seen_ids:
+                continue
+            seen_ids.add(restaurant.place_id)
+            candidates.append(restaurant)
+
+    logger.info("Restaurant discovery complete", candidates=len(candidates))
+    return candidates
+
+
+def _name_key(name: str) -> str:
+    """Restaurant name as compared for duplicates"""
+    return name.lower().strip()
+
+
+def _take_nearby_candidate(
+    pool: list[RestaurantData],
+    meal_type: str,
+    near_place: PlaceData,
+) -> RestaurantData | None:
+    """Remove and return the closest suitable candidate within range of a place"""
+    if near_place.latitude is None or near_place.longitude is None:
+        return None
+
+    best, best_distance = None, CANDIDATE_MAX_DISTANCE_M
+    for candidate in pool:
+        if candidate.category not in MEAL_COMPATIBILITY[meal_type]:
+            continue
+        if candidate.latitude is None or candidate.longitude is None:
+            continue
+        distance = distance_m(
+            near_place.latitude, near_place.longitude,
+            candidate.latitude, candidate.longitude,
+        )
+        if distance <= best_distance:
+            best, best_distance = candidate, distance
+
+    if best is not None:
+        pool.remove(best)
+    return best
+
+
+async def top_up_restaurant(
+    theme_analysis: ThemeAnalysis,
+    meal_type: str,
+    day_number: int,
+    near_place: PlaceData | None,
+    pool: list[RestaurantData],
+    exclude_ids: set[str],
+) -> list[RestaurantData]:
+    """
+    Find options for one meal validation found missing.
+
+    Takes a discovered candidate near the anchor place when there is one
+    (removed from `pool`, so concurrent top-ups never pick the same one),
+    otherwise runs a single location-aware search with the general meal
+    query (the themed one already came back empty for this meal).
+
+    Args:
+        theme_analysis: Query analysis
+        meal_type: breakfast, lunch, or dinner
+        day_number: Day the meal is for
+        near_place: Place to search near (None = city-wide)
+        pool: Unused city-wide candidates
+        exclude_ids: Restaurant IDs already in the trip
+
+    Returns:
+        Options tagged with the day, best first (nearby days may get the
+        same search results, so the caller picks the first unused one)
+    """
+    if near_place is not None:
+        candidate = _take_nearby_candidate(pool, meal_type, near_place)
+        if candidate is not None:
+            return [candidate.model_copy(update={"category": meal_type, "day_number": day_number})]
+
+    cuisine = MEAL_PREFERENCES[meal_type][0]
+    query = f"{cuisine} {meal_type} {theme_analysis.city}"
+
+    location = None
+    if near_place and near_place.latitude and near_place.longitude:
+        location = {"lat": near_place.latitude, "lng": near_place.longitude}
+
+    try:
+        results = await search_places_api(query, max_results=5, location=location, radius=2000)
+    except Exception as e:
+        logger.error("Restaurant top-up failed", day=day_number, meal=meal_type, error=str(e))
+        return []
+
+    options = []
+    for raw_place in sorted(results, key=lambda x: x.get("rating", 0), reverse=True):
+        restaurant = _to_restaurant(raw_place, meal_type, cuisine)
+        if restaurant.place_id not in exclude_ids:
+            restaurant.day_number = day_number
+            options.append(restaurant)
+
+    return options
+
+
 async def search_restaurants_parallel(
     theme_analysis: ThemeAnalysis,
     day_places: list[list[PlaceData]],
+    candidates: list[RestaurantData] | None = None,
+    exclude_ids: set[str] | None = None,
+    exclude_names: set[str] | None = None,
 ) -> list[RestaurantData]:
     """
-    Search for all restaurants in parallel.
+    Find breakfast, lunch and dinner for every day in one round.
 
-    More efficient version that batches searches.
+    Meals with a nearby discovered candidate use it. All other day x meal
+    searches run concurrently (bounded by the shared Places limiter), and
+    their results are assigned in one step: options are ranked per meal and
+    handed out best-first across all days, so no restaurant is used twice.
 
     Args:
         theme_analysis: Query analysis
-        day_places: Places by day
+        day_places: Places by day, in visiting order
+        candidates: City-wide candidates from discover_restaurants()
+        exclude_ids: Restaurants never to pick (e.g. already in the trip)
+        exclude_names: Restaurant names never to pick (e.g. other branches
+            of a chain already in the trip)
 
     Returns:
-        All found restaurants
+        One restaurant per day and meal found, tagged with its day, ordered
+        by day and then breakfast, lunch, dinner
     """
-    logger.info("Searching restaurants in parallel")
+    logger.info("Searching restaurants in parallel", candidates=len(candidates or []))
+
+    used_ids = set(exclude_ids or ())
+    used_names = {_name_key(name) for name in exclude_names or ()}
+
+    # Each candidate is used at most once across all days
+    pool = [
+        c for c in candidates or []
+        if c.place_id not in used_ids and _name_key(c.name) not in used_names
+    ]
 
     # Get theme cuisines
     theme_cuisines = THEME_CUISINE_MAP.get(
         theme_analysis.theme.lower(),
         ["local cuisine", "popular restaurant"]
     )
+    cuisine = theme_cuisines[0] if theme_cuisines else "restaurant"
 
-    async def search_day_restaurants(day_num: int, places: list[PlaceData]) -> list[RestaurantData]:
-        """Search restaurants for a single day"""
-        restaurants = []
+    restaurants: list[RestaurantData] = []
+    searches: list[tuple[int, str, dict | None]] = []  # (day, meal, location)
 
+    for day_num, places in enumerate(day_places, 1):
         if not places:
-            return restaurants
-
-        first_place = places[0]
-        middle_place = places[len(places) // 2]
-        last_place = places[-1]
-
-        # Parallel search for all three meals
-        tasks = []
+            continue
 
+        # Breakfast near the first stop, lunch mid-day, dinner near the last
         for meal_type, near_place in [
-            ("breakfast", first_place),
-            ("lunch", middle_place),
-            ("dinner", last_place),
+            ("breakfast", places[0]),
+            ("lunch", places[len(places) // 2]),
+            ("dinner", places[-1]),
         ]:
+            # A discovered candidate close to the anchor place needs no search
+            candidate = _take_nearby_candidate(pool, meal_type, near_place)
+            if candidate is not None:
+                used_ids.add(candidate.place_id)
+                used_names.add(_name_key(candidate.name))
+                pool[:] = [c for c in pool if _name_key(c.name) != _name_key(candidate.name)]
+                restaurants.append(candidate.model_copy(
+                    update={"category": meal_type, "day_number": day_num}
+                ))
+                continue
+
             location = None
             if near_place.latitude and near_place.longitude:
                 location = {"lat": near_place.latitude, "lng": near_place.longitude}
-
-            # Build query
-            cuisine = theme_cuisines[0] if theme_cuisines else "restaurant"
-            query = f"{cuisine} {meal_type} {theme_analysis.city}"
-
-            tasks.append((meal_type, query, location))
-
-        # Execute searches - get more results for deduplication buffer
-        seen_ids = set()
-        for meal_type, query, location in tasks:
-            try:
-                # Get more results to have buffer for deduplication
-                results = await search_places_api(query, max_results=5, location=location, radius=2000)
-
-                if results:
-                    # Sort by rating, keep all unique restaurants (not just the best)
-                    sorted_results = sorted(results, key=lambda x: x.get("rating", 0), reverse=True)
-
-                    for raw_place in sorted_results:
-                        place = convert_google_place(raw_place)
-
-                        # Skip if we already have this restaurant
-                        if place.place_id in seen_ids:
-                            continue
-                        seen_ids.add(place.place_id)
-
-                        price_range = None
-                        if place.price_level is not None:
-                            price_symbols = ["Free", "$", "$$", "$$$", "$$$$"]
-                            price_range = price_symbols[min(place.price_level, 4)]
-
-                        restaurants.append(RestaurantData(
-                            place_id=place.place_id,
-                            name=place.name,
-                            address=place.address,
-                            rating=place.rating,
-                            price_range=price_range,
-                            price_level=place.price_level,
-                            cuisine=theme_cuisines[0] if theme_cuisines else "local",
-                            latitude=place.location.get("lat") if place.location else None,
-                            longitude=place.location.get("lng") if place.location else None,
-                            photo_urls=place.photo_urls,
-                            category=meal_type,
-                            opening_hours=place.opening_hours,
-                            description=place.description,
-                        ))
-
-            except Exception as e:
-                logger.error(f"Restaurant search failed for day {day_num}", error=str(e))
-
-        return restaurants
-
-    # Search all days in parallel
-    all_results = await asyncio.gather(
-        *[search_day_restaurants(i, places) for i, places in enumerate(day_places, 1)],
-        return_exceptions=True
+            searches.append((day_num, meal_type, location))
+
+    # Short on time: keep the candidates, skip the extra searches
+    if searches and not has_budget(settings.deadline_search_reserve_seconds):
+        logger.info("Deadline near, skipping restaurant searches", meals=len(searches))
+        searches = []
+
+    # Every remaining day x meal search at once (identical queries share
+    # one request through the Places cache / singleflight)
+    results = await asyncio.gather(
+        *[
+            search_places_api(
+                f"{cuisine} {meal_type} {theme_analysis.city}",
+                max_results=5,
+                location=location,
+                radius=2000,
+            )
+            for _, meal_type, location in searches
+        ],
+        return_exceptions=True,
     )
 
-    # Flatten results
-    all_restaurants = []
-    for result in all_results:
-        if isinstance(result, list):
-            all_restaurants.extend(result)
+    # Rank each meal's options by rating, then assign globally: the best
+    # (rank, meal) pairs first, each restaurant (and name) to one meal only
+    options: list[tuple[int, int, RestaurantData]] = []  # (rank, search index, option)
+    for index, ((day_num, meal_type, _), result) in enumerate(zip(searches, results, strict=True)):
+        if isinstance(result, Exception):
+            logger.error(
+                f"Restaurant search failed for day {day_num}", meal=meal_type, error=str(result)
+            )
+            continue
+        ranked = sorted(result, key=lambda x: x.get("rating", 0), reverse=True)
+        for rank, raw_place in enumerate(ranked):
+            options.append((rank, index, _to_restaurant(raw_place, meal_type, cuisine)))
 
-    logger.info(f"Found {len(all_restaurants)} restaurants total")
-    return all_restaurants
+    filled: set[int] = set()
+    for _, index, restaurant in sorted(options, key=lambda o: (o[0], o[1])):
+        if index in filled or restaurant.place_id in used_ids:
+            continue
+        if _name_key(restaurant.name) in used_names:
+            continue
+        filled.add(index)
+        used_ids.add(restaurant.place_id)
+        used_names.add(_name_key(restaurant.name))
+        restaurant.day_number = searches[index][0]
+        restaurants.append(restaurant)
+
+    meal_order = list(MEAL_PREFERENCES)
+    restaurants.sort(key=lambda r: (r.day_number, meal_order.index(r.category)))
+
+    logger.info(
+        f"Found {len(restaurants)} restaurants total",
+        searches=len(searches),
+        unfilled=len(searches) - len(filled),
+    )
+    return restaurants
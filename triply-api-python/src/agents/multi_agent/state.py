@@ -5,6 +5,7 @@ Defines the state that flows through the multi-agent graph.
 Each agent reads from and writes to this shared state.
 """
 
+import operator
 from typing import Annotated, Any
 from typing_extensions import TypedDict
 from pydantic import BaseModel
@@ -58,6 +59,7 @@ class RestaurantData(BaseModel):
     description: str | None = None
     duration_minutes: int = 45
     opening_hours: list[str] | None = None
+    day_number: int | None = None  # Day this restaurant was picked for
 
 
 class DayPlan(BaseModel):
@@ -80,12 +82,31 @@ class TripPlan(BaseModel):
     days: list[DayPlan] = []
 
 
+class ValidationGap(BaseModel):
+    """A fixable shortfall found by validation (drives the targeted top-up)"""
+    day_number: int
+    kind: str  # "places" or "restaurant"
+    count: int = 1  # Places missing (kind="places")
+    meal: str | None = None  # Missing meal (kind="restaurant")
+
+
 class ValidationResult(BaseModel):
     """Result of validation"""
     is_valid: bool
     issues: list[str] = []
     suggestions: list[str] = []
     quality_score: float = 0.0  # 0-1
+    gaps: list[ValidationGap] = []
+
+
+def _latest(current: Any, update: Any) -> Any:
+    """Reducer keeping the most recent write (allows parallel writers)"""
+    return update
+
+
+def _furthest(current: float, update: float) -> float:
+    """Reducer keeping the highest progress reported so far"""
+    return max(current, update)
 
 
 class MultiAgentState(TypedDict):
@@ -94,6 +115,10 @@ class MultiAgentState(TypedDict):
 
     This state flows through all agents in the graph.
     Each agent reads what it needs and writes its results.
+
+    Nodes run in parallel (place search and restaurant discovery), so keys
+    written by several nodes have reducers: nodes return only the log
+    entries / errors they add, never the accumulated lists.
     """
 
     # Input
@@ -106,8 +131,9 @@ class MultiAgentState(TypedDict):
     # Phase 1: Query Analysis
     theme_analysis: ThemeAnalysis | None
 
-    # Phase 2: Place Search (parallel)
+    # Phase 2: Place Search and restaurant discovery (parallel)
     found_places: list[PlaceData]
+    restaurant_candidates: list[RestaurantData]  # City-wide, before per-day refinement
     found_restaurants: list[RestaurantData]
 
     # Phase 3: Trip Assembly
@@ -120,11 +146,11 @@ class MultiAgentState(TypedDict):
     final_trip: dict | None
 
     # Progress tracking
-    current_phase: str
-    progress: float  # 0.0 - 1.0
+    current_phase: Annotated[str, _latest]
+    progress: Annotated[float, _furthest]  # 0.0 - 1.0
 
     # Error handling
-    errors: list[str]
+    errors: Annotated[list[str], operator.add]
 
     # Agent execution log
-    agent_logs: list[dict]
+    agent_logs: Annotated[list[dict], operator.add]
@@ -7,18 +7,42 @@ Checks for:
 - Minimum places/restaurants per day
 - Geographic logic (places not too far apart)
 - Data completeness
+
+Tiered: deterministic checks score every plan; the LLM validator only
+reviews plans whose score is uncertain (plus a sampled audit).
 """
 
+import asyncio
+import contextvars
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import random
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from ...config import settings
 from ...logging import get_logger
-from .state import TripPlan, ValidationResult, DayPlan
+from ...logging.metrics import VALIDATION_AUDITS, VALIDATIONS, metrics_caller
+from ...tools.geo import distance_m
+from ..llm import get_chat_model, invoke_llm
+from .state import TripPlan, ValidationResult, ValidationGap, DayPlan
 
 logger = get_logger("validator_agent")
 
+# Rule-tier score weights: rule checks, geographic spread, theme coverage
+RULE_WEIGHT = 0.6
+GEO_WEIGHT = 0.2
+THEME_WEIGHT = 0.2
+
+# A day whose places all lie within this radius of its centroid is compact;
+# at the max radius its spread score reaches 0
+GEO_COMPACT_RADIUS_M = 3000
+GEO_MAX_RADIUS_M = 12000
+
+# Theme relevance (from the places agent) counted as a theme match
+THEME_MATCH_MIN = 0.5
+
+# Background audit tasks (kept referenced until done)
+_audit_tasks: set[asyncio.Task] = set()
+
 VALIDATOR_PROMPT = """You are a trip plan quality validator.
 
 Analyze this trip plan and check for issues:
@@ -63,99 +87,169 @@ Be strict but fair. A good trip should score 0.7+.
 Return ONLY valid JSON."""
 
 
-async def validate_trip_plan(trip_plan: TripPlan) -> ValidationResult:
+async def validate_trip_plan(trip_plan: TripPlan, use_llm: bool = True) -> ValidationResult:
     """
     Validate the trip plan for quality and completeness.
 
+    Tiered: quick_validate() scores the plan with deterministic checks; the
+    LLM theme check runs only when that score is in the uncertain band.
+    Clear passes/failures are decided by the rules alone, and a sample of
+    them is audited by the LLM in the background.
+
     Args:
         trip_plan: The assembled trip plan
+        use_llm: Allow the LLM tier (disabled when short on time)
 
     Returns:
-        ValidationResult with issues and suggestions
+        ValidationResult with issues, suggestions and the fixable gaps
+        (missing places / meals per day) the top-up step can fill
     """
     logger.info("Validating trip plan", title=trip_plan.title, days=len(trip_plan.days))
 
-    issues = []
-    suggestions = []
-    quality_score = 1.0
+    result = quick_validate(trip_plan)
+    low, high = settings.validator_uncertain_low, settings.validator_uncertain_high
+    uncertain = low <= result.quality_score < high
+
+    # LLM validation for theme consistency (uncertain plans only)
+    if not uncertain:
+        VALIDATIONS.labels(tier="rules").inc()
+        if random.random() < settings.validator_audit_rate:
+            _start_audit(trip_plan, result)
+    elif not use_llm:
+        VALIDATIONS.labels(tier="rules").inc()
+        logger.info("Skipping LLM validation")
+        result.suggestions.append("Could not perform deep theme validation")
+    else:
+        VALIDATIONS.labels(tier="llm").inc()
+        try:
+            llm_result = await validate_with_llm(trip_plan)
+            result.issues.extend(llm_result.get("issues", []))
+            result.suggestions.extend(llm_result.get("suggestions", []))
+
+            # Adjust quality score based on LLM assessment
+            llm_score = llm_result.get("quality_score", 0.7)
+            result.quality_score = max(0.0, min(1.0, (result.quality_score + llm_score) / 2))
+            result.is_valid = result.quality_score >= 0.5 and not _has_shortfall(result.issues)
+
+        except Exception as e:
+            logger.error("LLM validation failed", error=str(e))
+            result.suggestions.append("Could not perform deep theme validation")
 
-    # Basic validation
-    for day in trip_plan.days:
-        day_num = day.day_number
+    logger.info(
+        "Validation complete",
+        is_valid=result.is_valid,
+        quality_score=result.quality_score,
+        issues_count=len(result.issues),
+        gaps=len(result.gaps),
+        tier="llm" if uncertain and use_llm else "rules",
+    )
 
-        # Check minimum places
-        if len(day.places) < 3:
-            issues.append(f"Day {day_num}: Only {len(day.places)} places (minimum 3 required)")
-            quality_score -= 0.1
+    return result
 
-        # Check restaurants
-        if len(day.restaurants) < 3:
-            issues.append(f"Day {day_num}: Only {len(day.restaurants)} restaurants (need breakfast, lunch, dinner)")
-            quality_score -= 0.1
 
-        # Check restaurant categories
-        categories = {r.category for r in day.restaurants}
-        for required in ["breakfast", "lunch", "dinner"]:
-            if required not in categories:
-                issues.append(f"Day {day_num}: Missing {required} restaurant")
-                quality_score -= 0.05
+def _start_audit(trip_plan: TripPlan, result: ValidationResult):
+    """Compare a rule-tier decision with the LLM validator, off the request path"""
+
+    async def audit():
+        try:
+            with metrics_caller("validator_audit"):
+                llm_result = await llm_verdict(trip_plan)
+        except Exception as e:
+            logger.error("Validation audit failed", error=str(e))
+            llm_result = None
+        # No verdict (call or parse failed, or no is_valid): nothing to compare
+        if llm_result is None or not isinstance(llm_result.get("is_valid"), bool):
+            VALIDATION_AUDITS.labels(agreement="failed").inc()
+            logger.warning("Validation audit got no LLM verdict")
+            return
+        agrees = llm_result["is_valid"] == result.is_valid
+        VALIDATION_AUDITS.labels(agreement="agree" if agrees else "disagree").inc()
+        logger.info(
+            "Validation audit",
+            agrees=agrees,
+            rule_score=result.quality_score,
+            llm_score=llm_result.get("quality_score"),
+            llm_issues=llm_result.get("issues", []),
+        )
+
+    # Fresh context: the audit is not bound by the request deadline
+    task = asyncio.create_task(audit(), context=contextvars.Context())
+    _audit_tasks.add(task)
+    task.add_done_callback(_audit_tasks.discard)
+
+
+async def cancel_audits():
+    """Cancel sampled LLM audits still running (app shutdown)"""
+    tasks = list(_audit_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _has_shortfall(issues: list[str]) -> bool:
+    """True if a day has too few places or restaurants"""
+    return any("Only" in issue for issue in issues)
+
+
+def geo_spread_score(day: DayPlan) -> tuple[float, float]:
+    """
+    Score how compact a day is.
 
-        # Check data completeness
-        for place in day.places:
-            if not place.latitude or not place.longitude:
-                issues.append(f"Day {day_num}: Place '{place.name}' missing coordinates")
-                quality_score -= 0.02
+    Args:
+        day: Day to score
 
-        for restaurant in day.restaurants:
-            if not restaurant.category:
-                issues.append(f"Day {day_num}: Restaurant '{restaurant.name}' missing category")
-                quality_score -= 0.02
+    Returns:
+        (score 0-1, radius in meters: farthest place from the day's centroid)
+    """
+    points = [(p.latitude, p.longitude) for p in day.places if p.latitude and p.longitude]
+    if len(points) < 2:
+        return 1.0, 0.0
 
-    # LLM validation for theme consistency
-    try:
-        llm_result = await validate_with_llm(trip_plan)
-        issues.extend(llm_result.get("issues", []))
-        suggestions.extend(llm_result.get("suggestions", []))
+    center_lat = sum(lat for lat, _ in points) / len(points)
+    center_lng = sum(lng for _, lng in points) / len(points)
+    radius = max(distance_m(center_lat, center_lng, lat, lng) for lat, lng in points)
 
-        # Adjust quality score based on LLM assessment
-        llm_score = llm_result.get("quality_score", 0.7)
-        quality_score = (quality_score + llm_score) / 2
+    if radius <= GEO_COMPACT_RADIUS_M:
+        return 1.0, radius
+    if radius >= GEO_MAX_RADIUS_M:
+        return 0.0, radius
+    return 1 - (radius - GEO_COMPACT_RADIUS_M) / (GEO_MAX_RADIUS_M - GEO_COMPACT_RADIUS_M), radius
 
-    except Exception as e:
-        logger.error("LLM validation failed", error=str(e))
-        suggestions.append("Could not perform deep theme validation")
 
-    # Ensure score is in range
-    quality_score = max(0.0, min(1.0, quality_score))
+def theme_coverage_score(day: DayPlan) -> float:
+    """Share of a day's places that match the theme (scored by the places agent)"""
+    if not day.places:
+        return 0.0
+    return sum(p.theme_relevance >= THEME_MATCH_MIN for p in day.places) / len(day.places)
 
-    is_valid = quality_score >= 0.5 and len([i for i in issues if "Only" in i]) == 0
 
-    result = ValidationResult(
-        is_valid=is_valid,
-        issues=issues,
-        suggestions=suggestions,
-        quality_score=quality_score,
-    )
+async def validate_with_llm(trip_plan: TripPlan) -> dict:
+    """
+    Use LLM to validate theme consistency and quality.
 
-    logger.info(
-        "Validation complete",
-        is_valid=result.is_valid,
-        quality_score=result.quality_score,
-        issues_count=len(result.issues),
-    )
+    Args:
+        trip_plan: Trip plan to validate
 
-    return result
+    Returns:
+        Dict with issues, suggestions, and quality_score (neutral defaults
+        if the LLM call or its parsing fails)
+    """
+    verdict = await llm_verdict(trip_plan)
+    if verdict is None:
+        return {"issues": [], "suggestions": [], "quality_score": 0.7}
+    return verdict
 
 
-async def validate_with_llm(trip_plan: TripPlan) -> dict:
+async def llm_verdict(trip_plan: TripPlan) -> dict | None:
     """
-    Use LLM to validate theme consistency and quality.
+    The LLM validator's parsed reply.
 
     Args:
         trip_plan: Trip plan to validate
 
     Returns:
-        Dict with issues, suggestions, and quality_score
+        Dict with is_valid, quality_score, issues and suggestions,
+        or None if the LLM call or its parsing failed
     """
     # Prepare trip summary for LLM
     trip_summary = {
@@ -174,11 +268,7 @@ async def validate_with_llm(trip_plan: TripPlan) -> dict:
         }
         trip_summary["days"].append(day_summary)
 
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
-        google_api_key=settings.google_api_key,
-        temperature=0.1,
-    )
+    model = get_chat_model(temperature=0.1)
 
     prompt = VALIDATOR_PROMPT.format(
         theme=trip_plan.theme,
@@ -188,7 +278,7 @@ async def validate_with_llm(trip_plan: TripPlan) -> dict:
     )
 
     try:
-        response = await model.ainvoke([HumanMessage(content=prompt)])
+        response = await invoke_llm(model, [HumanMessage(content=prompt)])
         content = response.content
 
         if isinstance(content, str):
@@ -199,31 +289,95 @@ async def validate_with_llm(trip_plan: TripPlan) -> dict:
                 if match:
                     content = match.group(1)
 
-            return json.loads(content)
+            verdict = json.loads(content)
+            if isinstance(verdict, dict):
+                return verdict
 
     except Exception as e:
         logger.error("LLM validation parsing failed", error=str(e))
 
-    return {"issues": [], "suggestions": [], "quality_score": 0.7}
+    return None
 
 
-def quick_validate(trip_plan: TripPlan) -> tuple[bool, list[str]]:
+def quick_validate(trip_plan: TripPlan) -> ValidationResult:
     """
-    Quick synchronous validation without LLM.
-    Used for fast feedback during assembly.
+    Deterministic validation (first tier, no LLM).
+
+    Rule checks (place/meal counts, data completeness) plus a geographic
+    spread and theme coverage score per day.
 
     Args:
         trip_plan: Trip plan to validate
 
     Returns:
-        Tuple of (is_valid, list of issues)
+        ValidationResult; quality_score blends rules, spread and coverage
     """
     issues = []
+    gaps = []
+    rule_score = 1.0
+    geo_scores = []
+    theme_scores = []
 
+    # Basic validation
     for day in trip_plan.days:
+        day_num = day.day_number
+
+        # Check minimum places
         if len(day.places) < 3:
-            issues.append(f"Day {day.day_number}: Need more places ({len(day.places)}/3)")
+            issues.append(f"Day {day_num}: Only {len(day.places)} places (minimum 3 required)")
+            gaps.append(ValidationGap(day_number=day_num, kind="places", count=3 - len(day.places)))
+            rule_score -= 0.1
+
+        # Check restaurants
         if len(day.restaurants) < 3:
-            issues.append(f"Day {day.day_number}: Need more restaurants ({len(day.restaurants)}/3)")
+            issues.append(f"Day {day_num}: Only {len(day.restaurants)} restaurants (need breakfast, lunch, dinner)")
+            rule_score -= 0.1
 
-    return len(issues) == 0, issues
+        # Check restaurant categories
+        categories = {r.category for r in day.restaurants}
+        for required in ["breakfast", "lunch", "dinner"]:
+            if required not in categories:
+                issues.append(f"Day {day_num}: Missing {required} restaurant")
+                gaps.append(ValidationGap(day_number=day_num, kind="restaurant", meal=required))
+                rule_score -= 0.05
+
+        # Check data completeness
+        for place in day.places:
+            if not place.latitude or not place.longitude:
+                issues.append(f"Day {day_num}: Place '{place.name}' missing coordinates")
+                rule_score -= 0.02
+
+        for restaurant in day.restaurants:
+            if not restaurant.category:
+                issues.append(f"Day {day_num}: Restaurant '{restaurant.name}' missing category")
+                rule_score -= 0.02
+
+        # Check geographic spread
+        geo_score, radius = geo_spread_score(day)
+        geo_scores.append(geo_score)
+        if geo_score < 0.5:
+            issues.append(
+                f"Day {day_num}: Places spread over {radius / 1000:.1f} km from the day's center"
+            )
+
+        # Check theme coverage
+        theme_score = theme_coverage_score(day)
+        theme_scores.append(theme_score)
+        if day.places and theme_score < 0.5:
+            matching = round(theme_score * len(day.places))
+            issues.append(f"Day {day_num}: {matching} of {len(day.places)} places match the theme")
+
+    geo_score = sum(geo_scores) / len(geo_scores) if geo_scores else 1.0
+    theme_score = sum(theme_scores) / len(theme_scores) if theme_scores else 0.0
+    quality_score = (
+        RULE_WEIGHT * max(0.0, rule_score)
+        + GEO_WEIGHT * geo_score
+        + THEME_WEIGHT * theme_score
+    )
+
+    return ValidationResult(
+        is_valid=quality_score >= 0.5 and not _has_shortfall(issues),
+        issues=issues,
+        quality_score=max(0.0, min(1.0, quality_score)),
+        gaps=gaps,
+    )
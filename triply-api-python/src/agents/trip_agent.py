@@ -10,16 +10,16 @@ This is a TRUE ReAct agent that can:
 """
 
 import uuid
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
-from ..config import settings
 from ..tools import ALL_TOOLS
 from ..schemas import Trip, TripIntent
 from ..logging import get_logger
 from ..logging.logger import AgentLogger
+from ..logging.metrics import metrics_caller
+from .llm import LimitedChatModel, get_chat_model
 
 logger = get_logger("agent")
 
@@ -146,7 +146,7 @@ VALIDATION CHECKLIST before outputting JSON:
 """
 
 
-def create_trip_agent(checkpointer: MemorySaver | None = None):
+def create_trip_agent(checkpointer: BaseCheckpointSaver | None = None):
     """
     Create a ReAct agent for trip planning
 
@@ -159,13 +159,9 @@ def create_trip_agent(checkpointer: MemorySaver | None = None):
     Returns:
         Compiled LangGraph agent
     """
-    # Initialize Gemini model with tools bound
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
-        google_api_key=settings.google_api_key,
-        temperature=0.7,
-        max_output_tokens=8192,
-    )
+    # Shared Gemini model with tools bound; LangGraph calls it directly, so
+    # it is wrapped to go through the Gemini limiter and timeouts
+    model = LimitedChatModel(inner=get_chat_model(temperature=0.7, max_output_tokens=8192))
 
     # Bind tools to the model explicitly
     model_with_tools = model.bind_tools(ALL_TOOLS)
@@ -184,10 +180,28 @@ def create_trip_agent(checkpointer: MemorySaver | None = None):
     return agent
 
 
+# Compiled agents by checkpointer id (agent, checkpointer kept alive together)
+_trip_agents: dict[int, tuple] = {}
+
+
+def get_trip_agent(checkpointer: BaseCheckpointSaver | None = None):
+    """
+    Get the compiled ReAct agent for a checkpointer, compiling it once.
+
+    The compiled graph holds no per-request state (that lives in the
+    checkpointer under each thread_id), so it is shared by all requests.
+    """
+    entry = _trip_agents.get(id(checkpointer))
+    if entry is None:
+        entry = (create_trip_agent(checkpointer), checkpointer)
+        _trip_agents[id(checkpointer)] = entry
+    return entry[0]
+
+
 async def generate_trip(
     query: str,
     thread_id: str | None = None,
-    checkpointer: MemorySaver | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
 ) -> dict:
     """
     Generate a trip using the ReAct agent
@@ -200,20 +214,20 @@ async def generate_trip(
     Returns:
         Dictionary with trip data and metadata
     """
-    from ..tools.google_places import clear_place_cache, get_cached_places
+    from ..tools.google_places import new_search_scope
 
     execution_id = str(uuid.uuid4())
     effective_thread_id = thread_id or f"trip-{execution_id}"
 
-    # Clear place cache at start of generation
-    clear_place_cache()
+    # Start an execution-scoped place cache for this generation
+    place_cache = new_search_scope().places
 
     # Initialize agent logger
     agent_logger = AgentLogger(trip_id=execution_id, query=query)
     agent_logger.start(query)
 
-    # Create agent
-    agent = create_trip_agent(checkpointer)
+    # Get the shared compiled agent
+    agent = get_trip_agent(checkpointer)
 
     # Prepare input - explicitly require tool usage
     input_message = HumanMessage(content=f"""
@@ -255,10 +269,11 @@ Start by analyzing the theme and generating themed search queries.
         tool_calls = []
 
         # Use ainvoke for complete execution
-        result = await agent.ainvoke(
-            {"messages": [input_message]},
-            config=config,
-        )
+        with metrics_caller("trip_agent"):
+            result = await agent.ainvoke(
+                {"messages": [input_message]},
+                config=config,
+            )
 
         # Extract messages and tool calls
         messages = result.get("messages", [])
@@ -303,9 +318,6 @@ Start by analyzing the theme and generating themed search queries.
             response_length=len(final_message),
         )
 
-        # Get cached places for post-processing (photos, prices, etc.)
-        place_cache = get_cached_places()
-
         return {
             "success": True,
             "execution_id": execution_id,
@@ -328,7 +340,7 @@ Start by analyzing the theme and generating themed search queries.
 async def stream_trip_generation(
     query: str,
     thread_id: str | None = None,
-    checkpointer: MemorySaver | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
 ):
     """
     Stream trip generation events for SSE
@@ -348,7 +360,7 @@ async def stream_trip_generation(
 
     logger.info("Starting streaming trip generation", query=query)
 
-    agent = create_trip_agent(checkpointer)
+    agent = get_trip_agent(checkpointer)
 
     input_message = HumanMessage(content=f"""
 Please create a trip itinerary for the following request:
@@ -0,0 +1,40 @@
+"""
+Agent Warm-Up
+
+Builds the shared agent components at startup so the first request does
+not pay for graph compilation or model client creation.
+"""
+
+import time
+
+from ..logging import get_logger
+from .llm import get_chat_model
+from .multi_agent import get_orchestrator
+from .trip_agent import get_trip_agent
+
+logger = get_logger("warmup")
+
+# (temperature, max_output_tokens) of the models used by the agents
+AGENT_MODEL_CONFIGS = [
+    (0.1, None),   # relevance, validator, modification
+    (0.3, None),   # query analyzer
+    (0.7, 8192),   # ReAct trip agent
+]
+
+
+def warm_up_agents(checkpointer=None):
+    """
+    Create shared model clients and compile the agent graphs.
+
+    Args:
+        checkpointer: Checkpointer the ReAct agent is served with
+    """
+    start = time.time()
+
+    for temperature, max_output_tokens in AGENT_MODEL_CONFIGS:
+        get_chat_model(temperature=temperature, max_output_tokens=max_output_tokens)
+
+    get_orchestrator()
+    get_trip_agent(checkpointer)
+
+    logger.info("Agents warmed up", duration_ms=round((time.time() - start) * 1000, 1))
@@ -0,0 +1,39 @@
+"""
+Triply API Cache Module
+
+Shared caches for upstream results:
+- TTL + LRU eviction with hit/miss counters
+- Optional SQLite tier that survives restarts
+"""
+
+from .ttl_cache import CacheEntry, MemoryBackend, SQLiteBackend, TTLCache
+
+# All caches created through create_cache(), for stats reporting
+_caches: dict[str, TTLCache] = {}
+
+
+def create_cache(
+    name: str,
+    ttl_seconds: float,
+    max_entries: int,
+    path: str | None = None,
+) -> TTLCache:
+    """Create a named cache and register it for stats reporting"""
+    cache = TTLCache(name, ttl_seconds, max_entries, path=path)
+    _caches[name] = cache
+    return cache
+
+
+def cache_stats() -> list[dict]:
+    """Stats for all registered caches"""
+    return [cache.stats() for cache in _caches.values()]
+
+
+__all__ = [
+    "TTLCache",
+    "CacheEntry",
+    "MemoryBackend",
+    "SQLiteBackend",
+    "create_cache",
+    "cache_stats",
+]
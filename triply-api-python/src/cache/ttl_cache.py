@@ -0,0 +1,235 @@
+"""
+TTL/LRU Cache
+
+Size-bounded LRU cache with per-entry TTL and hit/miss counters.
+Always keeps an in-memory tier; optionally writes through to SQLite so
+entries survive restarts and are shared by workers on the same host.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from ..logging import get_logger
+from ..logging.metrics import CACHE_REQUESTS
+
+logger = get_logger("cache")
+
+
+class CacheEntry(NamedTuple):
+    """Cached value with the time it was stored"""
+    value: Any
+    stored_at: float
+
+
+class MemoryBackend:
+    """In-process LRU storage bounded by entry count"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> int:
+        """Store an entry, returns the number of evicted entries"""
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """
+    SQLite storage with LRU eviction by last access time.
+
+    Values are stored as JSON. All queries run in a worker thread so the
+    event loop never waits on disk I/O.
+    """
+
+    def __init__(self, path: str, table: str, max_entries: int):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)"
+        )
+
+    def _get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return CacheEntry(json.loads(row[0]), row[1])
+
+    def _set(self, key: str, entry: CacheEntry) -> int:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry.value), entry.stored_at, time.time()),
+            )
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                return overflow
+        return 0
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CacheEntry) -> int:
+        return await asyncio.to_thread(self._set, key, entry)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+    async def clear(self):
+        await asyncio.to_thread(self._clear)
+
+
+class TTLCache:
+    """
+    Named TTL cache with LRU eviction and hit/miss counters.
+
+    Lookups hit the memory tier first, then SQLite (if configured).
+    A TTL of 0 disables the cache entirely.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        max_entries: int,
+        path: str | None = None,
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.memory = MemoryBackend(max_entries)
+        self.disk: SQLiteBackend | None = None
+        if path:
+            try:
+                self.disk = SQLiteBackend(path, table=f"cache_{name}", max_entries=max_entries)
+            except sqlite3.Error as e:
+                logger.error("Cache disk backend unavailable", cache=name, path=path, error=str(e))
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl_seconds
+
+    async def _lookup(self, key: str) -> CacheEntry | None:
+        entry = await self.memory.get(key)
+        if entry is None and self.disk is not None:
+            try:
+                entry = await self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning("Cache disk read failed", cache=self.name, error=str(e))
+            if entry is not None:
+                self.evictions += await self.memory.set(key, entry)
+        return entry
+
+    async def get(self, key: str) -> Any | None:
+        """Get a fresh value, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+
+        entry = await self._lookup(key)
+        if entry is None or not self.is_fresh(entry):
+            self.misses += 1
+            CACHE_REQUESTS.labels(cache=self.name, result="miss").inc()
+            return None
+
+        self.hits += 1
+        CACHE_REQUESTS.labels(cache=self.name, result="hit").inc()
+        return entry.value
+
+    async def set(self, key: str, value: Any):
+        """Store a value (must be JSON-serializable when a disk tier is used)"""
+        if not self.enabled:
+            return
+
+        entry = CacheEntry(value, time.time())
+        self.evictions += await self.memory.set(key, entry)
+        if self.disk is not None:
+            try:
+                await self.disk.set(key, entry)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning("Cache disk write failed", cache=self.name, error=str(e))
+
+    async def delete(self, key: str):
+        await self.memory.delete(key)
+        if self.disk is not None:
+            await self.disk.delete(key)
+
+    async def clear(self):
+        await self.memory.clear()
+        if self.disk is not None:
+            await self.disk.clear()
+
+    def stats(self) -> dict:
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "persistent": self.disk is not None,
+            "size": len(self.memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
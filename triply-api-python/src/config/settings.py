@@ -26,9 +26,111 @@ class Settings(BaseSettings):
     # Google Places API
     google_places_api_key: str | None = None
 
+    # Outbound HTTP (shared connection pools, per upstream host)
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0
+    http_connect_timeout: float = 5.0
+    http_warmup: bool = True
+
+    # Stream the query analyzer and start place searches as queries arrive
+    analyzer_streaming: bool = True
+
+    # Places Text Search cache (shared across requests; TTL 0 disables)
+    places_cache_ttl_seconds: int = 21600
+    places_cache_max_entries: int = 5000
+    places_cache_path: str | None = None  # SQLite file, persists across restarts
+
+    # Theme relevance score store, keyed by (place_id, theme) (TTL 0 disables)
+    relevance_cache_ttl_seconds: int = 604800
+    relevance_cache_max_entries: int = 50000
+    relevance_cache_path: str | None = None  # SQLite file, persists across restarts
+
+    # Upstream rate limits: token bucket QPS + adaptive (AIMD) concurrency
+    places_qps: float = 50.0
+    places_burst: int = 20
+    places_concurrency: int = 16
+    places_max_concurrency: int = 64
+    tavily_qps: float = 10.0
+    tavily_burst: int = 5
+    tavily_concurrency: int = 5
+    tavily_max_concurrency: int = 20
+    gemini_qps: float = 10.0
+    gemini_burst: int = 5
+    gemini_concurrency: int = 8
+    gemini_max_concurrency: int = 32
+
     # Tavily Web Search
     tavily_api_key: str | None = None
 
+    # Ticket price search after the trip is sent: prices stream as lookups
+    # finish; slow lookups are dropped and the phase stops at the budget
+    price_lookup_timeout_seconds: float = 8.0
+    price_phase_budget_seconds: float = 20.0
+
+    # Ticket price store, keyed by place_id: only unknown places are searched;
+    # prices older than the stale window are used and refreshed in the
+    # background; records expire after the TTL (TTL 0 disables)
+    price_store_stale_seconds: float = 604800.0
+    price_store_ttl_seconds: int = 7776000
+    price_store_max_entries: int = 20000
+    price_store_path: str | None = None  # SQLite file, persists across restarts
+
+    # Destination info (travel guide search) cache, keyed by (city, country):
+    # guides older than the stale window are used and refreshed in the
+    # background; entries expire after the TTL (TTL 0 disables). The first
+    # preload_top_n popular destinations are fetched at startup (0 disables)
+    destination_cache_stale_seconds: float = 2592000.0
+    destination_cache_ttl_seconds: int = 15552000
+    destination_cache_max_entries: int = 2000
+    destination_cache_path: str | None = None  # SQLite file, persists across restarts
+    destination_cache_preload_top_n: int = 0
+    destination_cache_preload: list[str] = []  # "City, Country" entries, replaces the built-in list
+
+    # SSE event logs: generation runs in the background and clients replay
+    # from Last-Event-ID; finished logs are kept for late reconnects
+    stream_event_log_max_events: int = 1000
+    stream_event_log_retention_seconds: float = 300.0
+    stream_poll_interval_seconds: float = 0.25  # Following another worker's stream
+    stream_stall_timeout_seconds: float = 90.0  # No event from that worker for this long: it died
+    # Abandoned streams: generation is cancelled when no client has been
+    # connected for this long (reconnecting within the grace resumes it)
+    stream_connect_timeout_seconds: float = 30.0  # POST without an SSE GET
+    stream_abandon_grace_seconds: float = 15.0  # After the last client disconnects
+
+    # Pending trips (POST -> SSE GET). Set a path to share them between
+    # workers via SQLite (WAL); entries expire after the TTL
+    pending_trip_ttl_seconds: float = 900.0
+    pending_trip_max_entries: int = 1000
+    pending_trip_store_path: str | None = None
+
+    # Conversation checkpointer (/generate threads). In memory it is bounded
+    # by threads, idle TTL, checkpoints and messages per thread; set a path
+    # to store threads in SQLite (needs langgraph-checkpoint-sqlite)
+    checkpointer_max_threads: int = 1000
+    checkpointer_thread_ttl_seconds: float = 3600.0
+    checkpointer_max_checkpoints: int = 3
+    checkpointer_max_messages: int = 40
+    checkpointer_path: str | None = None
+
+    # Trip generation deadline (0 disables). Stages trim their work to the
+    # remaining budget and the best trip so far is returned when it hits
+    trip_deadline_seconds: float = 60.0
+    deadline_full_search_seconds: float = 30.0  # Less left: run half the place queries
+    deadline_llm_reserve_seconds: float = 10.0  # Less left: skip optional LLM passes
+    deadline_search_reserve_seconds: float = 5.0  # Less left: skip fallback searches
+    deadline_retry_reserve_seconds: float = 25.0  # Less left: skip the validation retry
+    gemini_timeout_seconds: float = 60.0
+
+    # Tiered validation: the LLM validator runs only when the rule-based
+    # score is in [low, high), plus a sampled background audit of the rest
+    validator_uncertain_low: float = 0.5
+    validator_uncertain_high: float = 0.8
+    validator_audit_rate: float = 0.05
+
+    # Event loop watchdog: log calls blocking the loop longer than this (0 disables)
+    blocking_call_threshold_ms: int = 100
+
     # LangSmith Tracing
     langchain_tracing_v2: bool = False
     langchain_api_key: str | None = None
@@ -0,0 +1,89 @@
+"""
+Blocking Call Detector
+
+Watchdog that reports synchronous calls blocking the event loop.
+
+A heartbeat task on the loop stamps the time every few milliseconds.
+A daemon thread checks the stamp; when it goes stale past the threshold
+the loop is stuck in a blocking call, and the thread logs the loop
+thread's current stack so the offending call can be found.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from .logger import get_logger
+
+logger = get_logger("blocking")
+
+
+class BlockingCallDetector:
+    """Detects and logs event loop stalls longer than threshold_ms"""
+
+    def __init__(self, threshold_ms: int = 100, interval_ms: int = 20):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.detected = 0
+        self.max_blocked_ms = 0.0
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat
+            if blocked < self.threshold or beat == reported_beat:
+                continue
+
+            # Report each stall once, with the loop thread's stack
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.format_stack(frame)[-8:] if frame else []
+            self.detected += 1
+            self.max_blocked_ms = max(self.max_blocked_ms, blocked * 1000)
+            logger.warning(
+                "blocking_call_detected",
+                component="event_loop",
+                blocked_ms=round(blocked * 1000, 1),
+                stack="".join(stack),
+            )
+
+    def start(self):
+        """Start watching the running event loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="blocking-call-detector", daemon=True
+        )
+        self._watchdog.start()
+        logger.info("Blocking call detector started", threshold_ms=self.threshold * 1000)
+
+    async def stop(self):
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "detected": self.detected,
+            "max_blocked_ms": round(self.max_blocked_ms, 1),
+        }
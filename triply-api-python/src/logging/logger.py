@@ -15,6 +15,7 @@ import structlog
 from structlog.typing import Processor
 
 from ..config import settings
+from .metrics import SSE_STREAM_DURATION
 
 
 # Context variable for request-scoped data
@@ -219,9 +220,10 @@ class AgentLogger:
 class SSELogger:
     """Logger for SSE streaming events"""
 
-    def __init__(self, trip_id: str):
+    def __init__(self, trip_id: str, stream: str = "trip"):
         self.logger = get_logger("sse")
         self.trip_id = trip_id
+        self.stream = stream
         self.event_count = 0
         self.start_time = time.time()
 
@@ -254,6 +256,10 @@ class SSELogger:
     def stream_end(self, success: bool = True, error: str = None):
         """Log SSE stream end"""
         elapsed = time.time() - self.start_time
+        SSE_STREAM_DURATION.labels(
+            stream=self.stream,
+            outcome="success" if success else "error",
+        ).observe(elapsed)
         log_data = {
             **self._base_context(),
             "total_events": self.event_count,
@@ -267,6 +273,19 @@ class SSELogger:
             self.logger.info("sse_stream_end", **log_data)
 
 
+    def stream_cancelled(self, reason: str):
+        """Log an SSE stream cancelled before it finished (e.g. client gone)"""
+        elapsed = time.time() - self.start_time
+        SSE_STREAM_DURATION.labels(stream=self.stream, outcome="cancelled").observe(elapsed)
+        self.logger.warning(
+            "sse_stream_cancelled",
+            **self._base_context(),
+            total_events=self.event_count,
+            duration_seconds=round(elapsed, 2),
+            reason=reason,
+        )
+
+
 class RequestLogger:
     """Logger for HTTP requests"""
 
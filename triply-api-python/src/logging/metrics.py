@@ -0,0 +1,194 @@
+"""
+Prometheus Metrics
+
+Latency histograms and counters served at GET /metrics:
+- triply_node_duration_seconds: each orchestrator node
+- triply_upstream_request_duration_seconds: each upstream call (Places,
+  Tavily, Gemini), labelled by the node or agent that made it
+- triply_upstream_queue_seconds: time waiting for an upstream limiter slot
+- triply_upstream_concurrency_limit / _in_flight / _waiting / _qps: upstream
+  limiter state; triply_upstream_overloads_total / _backoffs_total: 429/5xx
+  responses and the concurrency cuts they caused
+- triply_cache_requests_total: cache hits/misses
+- triply_validation_retries_total: targeted top-ups for gaps found by validation
+- triply_validations_total: validations by the tier that decided them
+- triply_validation_audits_total: sampled LLM audits of rule-tier decisions
+- triply_sse_stream_duration_seconds: SSE stream durations
+
+The caller label comes from a context variable set by the node wrapper,
+so tasks spawned inside a node inherit it.
+"""
+
+import os
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Seconds; upstream calls range from ~50ms (cached Places) to 10s+ (Gemini)
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60)
+STREAM_BUCKETS = (1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+
+NODE_DURATION = Histogram(
+    "triply_node_duration_seconds",
+    "Orchestrator node duration",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_DURATION = Histogram(
+    "triply_upstream_request_duration_seconds",
+    "Upstream call duration",
+    ["upstream", "operation", "caller", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_QUEUE = Histogram(
+    "triply_upstream_queue_seconds",
+    "Time waiting for an upstream rate limiter slot",
+    ["upstream"],
+    buckets=LATENCY_BUCKETS,
+)
+# Limiter state; with several workers (multiprocess mode) live processes are summed
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "triply_upstream_concurrency_limit",
+    "Adaptive (AIMD) in-flight limit of an upstream limiter",
+    ["upstream"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "triply_upstream_in_flight",
+    "Upstream calls holding a limiter slot",
+    ["upstream"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_WAITING = Gauge(
+    "triply_upstream_waiting",
+    "Upstream calls waiting for a limiter slot",
+    ["upstream"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_QPS = Gauge(
+    "triply_upstream_qps",
+    "Token bucket rate of an upstream limiter (0 = uncapped)",
+    ["upstream"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_OVERLOADS = Counter(
+    "triply_upstream_overloads_total",
+    "Upstream calls that failed with an overload (429, 5xx, timeout)",
+    ["upstream"],
+)
+UPSTREAM_BACKOFFS = Counter(
+    "triply_upstream_backoffs_total",
+    "Concurrency limit cuts after upstream overloads",
+    ["upstream"],
+)
+CACHE_REQUESTS = Counter(
+    "triply_cache_requests_total",
+    "Cache lookups",
+    ["cache", "result"],
+)
+VALIDATION_RETRIES = Counter(
+    "triply_validation_retries_total",
+    "Targeted top-up searches for day slots and meals left empty after validation",
+)
+VALIDATIONS = Counter(
+    "triply_validations_total",
+    "Trip validations by the tier that decided them",
+    ["tier"],
+)
+VALIDATION_AUDITS = Counter(
+    "triply_validation_audits_total",
+    "Sampled LLM audits of rule-tier decisions (agree, disagree, failed: no LLM verdict)",
+    ["agreement"],
+)
+SSE_STREAM_DURATION = Histogram(
+    "triply_sse_stream_duration_seconds",
+    "SSE stream duration",
+    ["stream", "outcome"],
+    buckets=STREAM_BUCKETS,
+)
+
+# Node or agent making upstream calls in the current context
+_caller: ContextVar[str] = ContextVar("metrics_caller", default="unknown")
+
+
+@contextmanager
+def metrics_caller(name: str):
+    """Label upstream calls made inside this block (and tasks it spawns) with `name`"""
+    token = _caller.set(name)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def timed_node(name: str, fn: Callable[[Any], Awaitable[dict]]) -> Callable[[Any], Awaitable[dict]]:
+    """
+    Wrap a graph node to record its duration and label its upstream calls.
+
+    Args:
+        name: Node name
+        fn: Async node function taking the graph state
+
+    Returns:
+        Wrapped node function
+    """
+    @wraps(fn)
+    async def wrapper(state):
+        start = time.perf_counter()
+        with metrics_caller(name):
+            try:
+                return await fn(state)
+            finally:
+                NODE_DURATION.labels(node=name).observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+@asynccontextmanager
+async def track_upstream(upstream: str, operation: str):
+    """Time one upstream call, labelled with the current caller and its outcome"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_DURATION.labels(
+            upstream=upstream,
+            operation=operation,
+            caller=_caller.get(),
+            outcome=outcome,
+        ).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Metrics in Prometheus text format.
+
+    With several workers, set PROMETHEUS_MULTIPROC_DIR so all processes
+    write to a shared directory and any worker can serve the totals.
+
+    Returns:
+        (payload, content type)
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -10,42 +10,78 @@ import re
 import random
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
-from langgraph.checkpoint.memory import MemorySaver
 
 from .config import settings
-from .agents import generate_trip, stream_trip_generation
-from .agents.multi_agent import generate_trip_multi_agent
-from .agents.multi_agent.places_agent import get_place_prices
+from .agents import generate_trip, stream_trip_generation, warm_up_agents
+from .agents.checkpointer import checkpointer_stats, create_memory_checkpointer, open_checkpointer
+from .agents.multi_agent import generate_trip_multi_agent, stream_trip_multi_agent
+from .agents.multi_agent.orchestrator import trip_plan_to_dict, trip_skeleton
+from .agents.multi_agent.places_agent import cancel_price_refreshes, iter_place_prices
 from .agents.multi_agent.state import PlaceData
+from .agents.multi_agent.validator_agent import cancel_audits
 from .agents.multi_agent.modification_agent import (
     ModificationAgent,
     ModificationAnalysis,
     ModificationType,
 )
+from .cache import cache_stats
+from .tools.http_client import http_clients
+from .tools.web_search import cancel_destination_refreshes, preload_destination_info
+from .tools.singleflight import singleflight_stats
+from .tools.rate_limit import limiter_stats
 from .logging import setup_logging, get_logger, RequestLoggingMiddleware
 from .logging.logger import SSELogger
+from .logging.blocking import BlockingCallDetector
+from .logging.metrics import render_metrics
+from .streaming import event_logs, pending_trips
 
 # Initialize logging
 setup_logging()
 logger = get_logger("main")
 
-# In-memory storage for pending trips (for SSE streaming)
-pending_trips: dict[str, dict] = {}
+# Global checkpointer for conversation memory (replaced in lifespan when
+# a SQLite checkpointer is configured)
+checkpointer = create_memory_checkpointer()
 
-# Global checkpointer for conversation memory
-checkpointer = MemorySaver()
+# Reports synchronous calls that stall the event loop
+blocking_detector = BlockingCallDetector(threshold_ms=settings.blocking_call_threshold_ms)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
+    global checkpointer
     logger.info("Starting Triply API", port=settings.port, env=settings.env)
-    yield
-    logger.info("Shutting down Triply API")
+    if settings.blocking_call_threshold_ms > 0:
+        blocking_detector.start()
+    await http_clients.start(warm_up=settings.http_warmup)
+
+    # Fill the destination info cache without delaying startup
+    preload = asyncio.create_task(preload_destination_info())
+
+    async with open_checkpointer() as saver:
+        checkpointer = saver
+        warm_up_agents(checkpointer)
+        yield
+        logger.info("Shutting down Triply API")
+        preload.cancel()
+        await event_logs.aclose()
+
+        # Background work started by requests, before its HTTP clients close
+        await asyncio.gather(
+            preload,
+            cancel_price_refreshes(),
+            cancel_destination_refreshes(),
+            cancel_audits(),
+            return_exceptions=True,
+        )
+
+    await http_clients.aclose()
+    await blocking_detector.stop()
 
 
 app = FastAPI(
@@ -129,11 +165,34 @@ async def health_check():
             "frontend_stream": "POST /api/trips/generate/stream",
             "modify": "POST /api/trips/modify",
             "analyze": "POST /api/trips/analyze-request",
+            "stats": "GET /api/stats",
+            "metrics": "GET /metrics",
             "docs": "GET /docs",
         },
     }
 
 
+@app.get("/api/stats")
+async def service_stats():
+    """Runtime counters for caches, upstream clients and trip streams"""
+    return {
+        "caches": cache_stats(),
+        "singleflight": singleflight_stats(),
+        "upstreams": limiter_stats(),
+        "event_loop": blocking_detector.stats(),
+        "streams": event_logs.stats(),
+        "pending_trips": pending_trips.stats(),
+        "checkpointer": checkpointer_stats(checkpointer),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics (latency histograms and counters)"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Trip Generation Endpoints
 # ─────────────────────────────────────────────────────────────────────────────
@@ -603,6 +662,9 @@ async def frontend_generate_stream(request: FrontendGenerateRequest):
     Frontend-compatible endpoint that starts trip generation.
     Returns tripId and streamUrl for SSE connection.
 
+    Generation starts right away in the background, so it overlaps with
+    the client opening the SSE connection.
+
     If currentTrip is provided, automatically detects if this is a modification
     request and routes appropriately.
     """
@@ -636,13 +698,19 @@ async def frontend_generate_stream(request: FrontendGenerateRequest):
             logger.error("Modification detection failed", error=str(e))
 
     # Store the pending request with modification info
-    pending_trips[trip_id] = {
+    trip_data = {
         "query": request.query,
         "status": "pending",
         "is_modification": is_modification,
         "modification_analysis": modification_analysis,
         "current_trip": request.currentTrip if is_modification else None,
     }
+    await pending_trips.put(trip_id, {
+        **trip_data,
+        "modification_analysis": (
+            modification_analysis.model_dump(mode="json") if modification_analysis else None
+        ),
+    })
 
     logger.info(
         "Frontend stream request",
@@ -651,6 +719,9 @@ async def frontend_generate_stream(request: FrontendGenerateRequest):
         is_modification=is_modification,
     )
 
+    # Start generating now; the SSE connection replays the event log
+    event_logs.start(trip_id, _trip_events(trip_id, trip_data))
+
     return {
         "success": True,
         "data": {
@@ -663,39 +734,53 @@ async def frontend_generate_stream(request: FrontendGenerateRequest):
     }
 
 
+async def _trip_events(trip_id: str, trip_data: dict):
+    """SSE events for a pending trip: a modification or a new generation"""
+    query = trip_data["query"]
+    modification_analysis = trip_data.get("modification_analysis")
+    current_trip = trip_data.get("current_trip")
+
+    # Handle modification path
+    if trip_data.get("is_modification") and modification_analysis and current_trip:
+        async for event in _stream_modification(
+            trip_id, query, modification_analysis, current_trip
+        ):
+            yield event
+        return
+
+    # Handle new trip generation
+    async for event in _stream_new_trip(trip_id, query):
+        yield event
+
+
 @app.get("/api/trips/{trip_id}/stream")
-async def frontend_trip_stream(trip_id: str):
+async def frontend_trip_stream(
+    trip_id: str,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+):
     """
     SSE stream for trip generation progress.
     Emits events compatible with triply-web frontend.
 
-    Handles both new trip generation and modifications based on
-    the pending_trips data.
+    Generation already runs in the background (started by the POST,
+    possibly on another worker when the pending trip store is shared);
+    this replays its event log. Every event carries an id, so a client
+    reconnecting with Last-Event-ID only gets the events it missed.
     """
-    if trip_id not in pending_trips:
-        raise HTTPException(status_code=404, detail="Trip not found")
-
-    trip_data = pending_trips[trip_id]
-    query = trip_data["query"]
-    is_modification = trip_data.get("is_modification", False)
-    modification_analysis = trip_data.get("modification_analysis")
-    current_trip = trip_data.get("current_trip")
+    try:
+        after_id = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        after_id = 0
 
-    async def event_generator():
-        # Handle modification path
-        if is_modification and modification_analysis and current_trip:
-            async for event in _stream_modification(
-                trip_id, query, modification_analysis, current_trip
-            ):
-                yield event
-            return
+    events = await event_logs.subscribe(trip_id, after_id)
+    if events is None:
+        raise HTTPException(status_code=404, detail="Trip not found")
 
-        # Handle new trip generation
-        async for event in _stream_new_trip(trip_id, query):
-            yield event
+    if after_id:
+        logger.info("SSE stream resumed", trip_id=trip_id, last_event_id=after_id)
 
     return StreamingResponse(
-        event_generator(),
+        events,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -724,7 +809,7 @@ async def _stream_modification(
     - day_add: Animated addition of a day
     - modification_complete: Final state with full trip
     """
-    sse_logger = SSELogger(trip_id)
+    sse_logger = SSELogger(trip_id, stream="modification")
     sse_logger.stream_start()
 
     try:
@@ -1031,12 +1116,12 @@ async def _stream_modification(
         sse_logger.event("modification_complete")
         yield f"event: modification_complete\ndata: {json.dumps(complete_event)}\n\n"
 
-        # Cleanup
-        if trip_id in pending_trips:
-            del pending_trips[trip_id]
-
         sse_logger.stream_end(success=True)
 
+    except asyncio.CancelledError:
+        sse_logger.stream_cancelled("cancelled")
+        raise
+
     except Exception as e:
         logger.error("Modification stream error", trip_id=trip_id, error=str(e))
         error_event = {"error": str(e)}
@@ -1045,11 +1130,153 @@ async def _stream_modification(
         sse_logger.stream_end(success=False, error=str(e))
 
 
+def _place_event_data(day_number: int, idx: int, place: dict) -> dict:
+    """SSE payload for a place (attraction) in a day slot"""
+    images = place.get("images", [])
+    image_url = images[0].get("url") if images else place.get("image_url")
+    return {
+        "dayNumber": day_number,
+        "slotIndex": idx,
+        "place": {
+            "id": place.get("place_id") or str(uuid.uuid4()),
+            "poi_id": place.get("place_id"),
+            "name": place["name"],
+            "address": place.get("address"),
+            "type": place.get("type", "attraction"),
+            "category": place.get("category", "attraction"),
+            "description": place.get("description", ""),
+            "duration_minutes": place.get("duration_minutes", 60),
+            "rating": place.get("rating", 4.5),
+            "latitude": place.get("latitude"),
+            "longitude": place.get("longitude"),
+            "image_url": image_url,
+            "images": images,
+            "price": place.get("price"),
+            "price_value": place.get("price_value"),
+            "opening_hours": place.get("opening_hours"),
+        }
+    }
+
+
+def _restaurant_event_data(day_number: int, idx: int, restaurant: dict) -> dict:
+    """SSE payload for a restaurant in a day slot"""
+    r_images = restaurant.get("images", [])
+    r_image_url = r_images[0].get("url") if r_images else restaurant.get("image_url")
+    return {
+        "dayNumber": day_number,
+        "slotIndex": idx,
+        "restaurant": {
+            "id": restaurant.get("place_id") or str(uuid.uuid4()),
+            "poi_id": restaurant.get("place_id"),
+            "name": restaurant["name"],
+            "address": restaurant.get("address"),
+            "type": restaurant.get("type", "restaurant"),
+            "category": restaurant.get("category", "lunch"),  # breakfast/lunch/dinner
+            "description": restaurant.get("description", ""),
+            "duration_minutes": restaurant.get("duration_minutes", 45),
+            "rating": restaurant.get("rating", 4.0),
+            "latitude": restaurant.get("latitude"),
+            "longitude": restaurant.get("longitude"),
+            "image_url": r_image_url,
+            "images": r_images,
+            "price_range": restaurant.get("price_range"),
+            "price_value": restaurant.get("price_value"),
+            "cuisine": restaurant.get("cuisine"),
+            "opening_hours": restaurant.get("opening_hours"),
+        }
+    }
+
+
+class _TripStreamTracker:
+    """
+    Tracks what a new-trip SSE stream has already sent.
+
+    The pipeline produces several provisional plans (places first, then
+    restaurants, then top-ups and re-clustering). The client keeps places
+    and restaurants by (dayNumber, slotIndex), so each plan is diffed slot
+    by slot: a slot whose occupant changed is re-sent, and the day event is
+    re-sent whenever the day's title or counts change. The day event's
+    slotsCount / restaurantsCount are authoritative: the client drops
+    slots past them, which is how a shorter day loses its trailing slots.
+    """
+
+    def __init__(self, sse_logger: SSELogger):
+        self.sse_logger = sse_logger
+        self.days: dict[int, dict] = {}
+        self.places: dict[int, list[str | None]] = {}
+        self.restaurants: dict[int, list[str | None]] = {}
+        self.places_sent = 0
+        self.restaurants_sent = 0
+
+    def _event(self, name: str, payload: dict, message: str | None = None) -> str:
+        self.sse_logger.event(name, message)
+        return f"event: {name}\ndata: {json.dumps(payload)}\n\n"
+
+    def plan_events(self, trip: dict, progress: float) -> list[str]:
+        """SSE events bringing the client from what it has to `trip`"""
+        events = []
+
+        for day in trip.get("days", []):
+            day_num = day["dayNumber"]
+            places = day.get("places", [])
+            restaurants = day.get("restaurants", [])
+
+            # Day header and slot counts (sent before the slots they bound)
+            day_data = {
+                "dayNumber": day_num,
+                "title": day["title"],
+                "description": day.get("description", ""),
+                "slotsCount": len(places),
+                "restaurantsCount": len(restaurants),
+            }
+            if self.days.get(day_num) != day_data:
+                self.days[day_num] = day_data
+                day_event = {"phase": "days", "progress": progress, "data": day_data}
+                events.append(self._event("day", day_event, f"Day {day_num}: {day['title']}"))
+
+            # Places: re-send every slot whose occupant changed
+            sent_ids = self.places.get(day_num, [])
+            for idx, place in enumerate(places):
+                if idx < len(sent_ids) and sent_ids[idx] == place.get("place_id"):
+                    continue
+                place_event = {
+                    "phase": "places",
+                    "progress": progress,
+                    "data": _place_event_data(day_num, idx, place),
+                }
+                events.append(self._event("place", place_event, place["name"]))
+                self.places_sent += 1
+            self.places[day_num] = [p.get("place_id") for p in places]
+
+            # Restaurants
+            sent_ids = self.restaurants.get(day_num, [])
+            for idx, restaurant in enumerate(restaurants):
+                if idx < len(sent_ids) and sent_ids[idx] == restaurant.get("place_id"):
+                    continue
+                restaurant_event = {
+                    "phase": "restaurants",
+                    "progress": progress,
+                    "data": _restaurant_event_data(day_num, idx, restaurant),
+                }
+                events.append(self._event("restaurant", restaurant_event, restaurant["name"]))
+                self.restaurants_sent += 1
+            self.restaurants[day_num] = [r.get("place_id") for r in restaurants]
+
+        return events
+
+
 async def _stream_new_trip(trip_id: str, query: str):
-    """Stream new trip generation events"""
+    """
+    Stream new trip generation events.
+
+    Events follow the pipeline as it runs: skeleton right after query
+    analysis, days and places once places are found and ranked, restaurants
+    once they resolve, then complete and price updates.
+    """
     # Initialize SSE logger
     sse_logger = SSELogger(trip_id)
     sse_logger.stream_start()
+    tracker = _TripStreamTracker(sse_logger)
 
     try:
         # Send init event
@@ -1059,7 +1286,23 @@ async def _stream_new_trip(trip_id: str, query: str):
 
         # Generate the trip using MULTI-AGENT system
         logger.info("trip_generation_start_multi_agent", trip_id=trip_id, query=query[:100])
-        result = await generate_trip_multi_agent(query=query)
+        result = {"success": False, "error": "Trip generation produced no result"}
+
+        async for update in stream_trip_multi_agent(query=query):
+            if update["type"] == "analysis":
+                # Send skeleton event - data field contains the skeleton data
+                skeleton_data = trip_skeleton(update["theme_analysis"])
+                skeleton_event = {"phase": "skeleton", "progress": 0.2, "data": skeleton_data}
+                sse_logger.event("skeleton", skeleton_data["title"])
+                yield f"event: skeleton\ndata: {json.dumps(skeleton_event)}\n\n"
+
+            elif update["type"] == "plan" and update["trip_plan"]:
+                progress = min(max(update["progress"], 0.3), 0.95)
+                for event in tracker.plan_events(trip_plan_to_dict(update["trip_plan"]), progress):
+                    yield event
+
+            elif update["type"] == "complete":
+                result = update["result"]
 
         if not result.get("success"):
             error_msg = result.get("error", "Unknown error")
@@ -1104,115 +1347,16 @@ async def _stream_new_trip(trip_id: str, query: str):
             sse_logger.stream_end(success=False, error=error_msg)
             return
 
-        # Send skeleton event - data field contains the skeleton data
-        skeleton_data = {
-            "title": parsed["title"],
-            "description": parsed["description"],
-            "city": parsed["city"],
-            "country": parsed["country"],
-            "durationDays": parsed["durationDays"],
-            "theme": parsed.get("theme"),
-            "thematicKeywords": [],
-            "vibe": [],
-        }
-        skeleton_event = {"phase": "skeleton", "progress": 0.2, "data": skeleton_data}
-        sse_logger.event("skeleton", parsed["title"])
-        yield f"event: skeleton\ndata: {json.dumps(skeleton_event)}\n\n"
-
-        # Send day events
-        progress = 0.3
-        for day in parsed["days"]:
-            places_count = len(day.get("places", []))
-            restaurants_count = len(day.get("restaurants", []))
-            day_data = {
-                "dayNumber": day["dayNumber"],
-                "title": day["title"],
-                "description": day.get("description", ""),
-                "slotsCount": places_count,
-                "restaurantsCount": restaurants_count,
-            }
-            day_event = {"phase": "days", "progress": progress, "data": day_data}
-            sse_logger.event("day", f"Day {day['dayNumber']}: {day['title']}")
-            yield f"event: day\ndata: {json.dumps(day_event)}\n\n"
-            progress += 0.05
-
-        # Send place events (attractions)
-        for day in parsed["days"]:
-            for idx, place in enumerate(day.get("places", [])):
-                images = place.get("images", [])
-                image_url = images[0].get("url") if images else place.get("image_url")
-                place_data = {
-                    "dayNumber": day["dayNumber"],
-                    "slotIndex": idx,
-                    "place": {
-                        "id": place.get("place_id") or str(uuid.uuid4()),
-                        "poi_id": place.get("place_id"),
-                        "name": place["name"],
-                        "address": place.get("address"),
-                        "type": place.get("type", "attraction"),
-                        "category": place.get("category", "attraction"),
-                        "description": place.get("description", ""),
-                        "duration_minutes": place.get("duration_minutes", 60),
-                        "rating": place.get("rating", 4.5),
-                        "latitude": place.get("latitude"),
-                        "longitude": place.get("longitude"),
-                        "image_url": image_url,
-                        "images": images,
-                        "price": place.get("price"),
-                        "price_value": place.get("price_value"),
-                        "opening_hours": place.get("opening_hours"),
-                    }
-                }
-                place_event = {"phase": "places", "progress": progress, "data": place_data}
-                sse_logger.event("place", place["name"])
-                yield f"event: place\ndata: {json.dumps(place_event)}\n\n"
-                progress = min(progress + 0.02, 0.85)
-
-        # Send restaurant events
-        restaurant_events_sent = 0
-        for day in parsed["days"]:
-            day_restaurants = day.get("restaurants", [])
-            logger.debug(
-                "processing_day_restaurants",
-                day_number=day["dayNumber"],
-                restaurant_count=len(day_restaurants),
-            )
-            for idx, restaurant in enumerate(day_restaurants):
-                r_images = restaurant.get("images", [])
-                r_image_url = r_images[0].get("url") if r_images else restaurant.get("image_url")
-                restaurant_data = {
-                    "dayNumber": day["dayNumber"],
-                    "slotIndex": idx,
-                    "restaurant": {
-                        "id": restaurant.get("place_id") or str(uuid.uuid4()),
-                        "poi_id": restaurant.get("place_id"),
-                        "name": restaurant["name"],
-                        "address": restaurant.get("address"),
-                        "type": restaurant.get("type", "restaurant"),
-                        "category": restaurant.get("category", "lunch"),  # breakfast/lunch/dinner
-                        "description": restaurant.get("description", ""),
-                        "duration_minutes": restaurant.get("duration_minutes", 45),
-                        "rating": restaurant.get("rating", 4.0),
-                        "latitude": restaurant.get("latitude"),
-                        "longitude": restaurant.get("longitude"),
-                        "image_url": r_image_url,
-                        "images": r_images,
-                        "price_range": restaurant.get("price_range"),
-                        "price_value": restaurant.get("price_value"),
-                        "cuisine": restaurant.get("cuisine"),
-                        "opening_hours": restaurant.get("opening_hours"),
-                    }
-                }
-                restaurant_event = {"phase": "restaurants", "progress": progress, "data": restaurant_data}
-                sse_logger.event("restaurant", restaurant["name"])
-                yield f"event: restaurant\ndata: {json.dumps(restaurant_event)}\n\n"
-                restaurant_events_sent += 1
-                progress = min(progress + 0.02, 0.95)
+        # Reconcile with the final trip (normally a no-op: the last
+        # assembled plan was already streamed)
+        for event in tracker.plan_events(parsed, 0.95):
+            yield event
 
         logger.info(
-            "restaurant_events_sent",
+            "trip_events_sent",
             trip_id=trip_id,
-            count=restaurant_events_sent,
+            places=tracker.places_sent,
+            restaurants=tracker.restaurants_sent,
         )
 
         # Send complete event FIRST (user sees the trip immediately)
@@ -1242,7 +1386,7 @@ async def _stream_new_trip(trip_id: str, query: str):
                     ))
                     place_id_to_location[place_id] = (day["dayNumber"], idx)
 
-        # Search prices in parallel and yield updates as they come
+        # Search prices concurrently and yield updates as they come
         if places_for_price_search:
             city = parsed.get("city", "")
             logger.info(
@@ -1251,26 +1395,23 @@ async def _stream_new_trip(trip_id: str, query: str):
                 places_count=len(places_for_price_search),
             )
 
-            # Search prices for all places
-            places_with_prices = await get_place_prices(places_for_price_search, city)
+            # Send a price_update event as each lookup finishes
+            prices_found = 0
+            async for place, price in iter_place_prices(places_for_price_search, city):
+                location = place_id_to_location.get(place.place_id)
+                if location:
+                    prices_found += 1
+                    day_num, slot_idx = location
+                    price_update_data = {
+                        "dayNumber": day_num,
+                        "slotIndex": slot_idx,
+                        "placeId": place.place_id,
+                        "price": price,
+                    }
+                    price_event = {"phase": "price_update", "data": price_update_data}
+                    sse_logger.event("price_update", f"{place.name}: {price}")
+                    yield f"event: price_update\ndata: {json.dumps(price_event)}\n\n"
 
-            # Send price_update events for each place that got a price
-            for place in places_with_prices:
-                if place.price:
-                    location = place_id_to_location.get(place.place_id)
-                    if location:
-                        day_num, slot_idx = location
-                        price_update_data = {
-                            "dayNumber": day_num,
-                            "slotIndex": slot_idx,
-                            "placeId": place.place_id,
-                            "price": place.price,
-                        }
-                        price_event = {"phase": "price_update", "data": price_update_data}
-                        sse_logger.event("price_update", f"{place.name}: {place.price}")
-                        yield f"event: price_update\ndata: {json.dumps(price_event)}\n\n"
-
-            prices_found = sum(1 for p in places_with_prices if p.price)
             logger.info(
                 "price_search_complete",
                 trip_id=trip_id,
@@ -1285,12 +1426,12 @@ async def _stream_new_trip(trip_id: str, query: str):
             sse_logger.event("prices_complete", f"Found {prices_found} prices")
             yield f"event: prices_complete\ndata: {json.dumps(prices_complete_event)}\n\n"
 
-        # Cleanup
-        if trip_id in pending_trips:
-            del pending_trips[trip_id]
-
         sse_logger.stream_end(success=True)
 
+    except asyncio.CancelledError:
+        sse_logger.stream_cancelled("cancelled")
+        raise
+
     except Exception as e:
         logger.error("stream_error", trip_id=trip_id, error=str(e))
         error_event = {"error": str(e)}
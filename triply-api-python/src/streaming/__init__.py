@@ -0,0 +1,19 @@
+"""
+Triply API Streaming Module
+
+Background trip generation with resumable SSE event logs, and the
+bounded store of pending trips.
+"""
+
+from .event_log import EventLogRegistry, TripEventLog, event_logs
+from .pending_store import MemoryTripBackend, PendingTripStore, SQLiteTripBackend, pending_trips
+
+__all__ = [
+    "PendingTripStore",
+    "MemoryTripBackend",
+    "SQLiteTripBackend",
+    "pending_trips",
+    "TripEventLog",
+    "EventLogRegistry",
+    "event_logs",
+]
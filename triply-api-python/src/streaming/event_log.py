@@ -0,0 +1,349 @@
+"""
+Trip Event Logs
+
+Generation runs as a background task that appends its SSE events to a
+bounded per-trip log with sequential ids. SSE connections only read the
+log, so a client that drops and reconnects (sending Last-Event-ID) gets
+the events it missed instead of triggering a new generation.
+
+With a shared pending trip store, events are also written there, so a
+worker that is not running the generation can serve the stream by
+polling the store.
+
+A client following another worker's stream gets a terminal error event
+when the trip expires or the stream stalls (that worker died).
+
+Generation nobody watches is cancelled: when no client has connected
+within `connect_timeout` of the POST, or none has reconnected within
+`abandon_grace` of the last disconnect. Cancelling the task cancels the
+whole tree under it (graph nodes and their Places, Tavily and Gemini calls).
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+import structlog
+
+from ..config import settings
+from .pending_store import PendingTripStore, pending_trips
+
+logger = structlog.get_logger()
+
+
+class TripEventLog:
+    """
+    Append-only, bounded event log for one trip.
+
+    Events are pre-formatted SSE chunks ("event: ...\\ndata: ...\\n\\n");
+    subscribers get them prefixed with an "id:" line.
+
+    Args:
+        trip_id: Trip the events belong to
+        max_events: Oldest events are dropped past this many
+    """
+
+    def __init__(self, trip_id: str, max_events: int = 1000):
+        self.trip_id = trip_id
+        self.events: deque[tuple[int, str]] = deque(maxlen=max_events)
+        self.last_id = 0
+        self.closed = False
+        self.closed_at: float | None = None
+        self.task: asyncio.Task | None = None
+        self._cond = asyncio.Condition()
+
+        # Connected clients on this worker, and since when there are none
+        self.subscribers = 0
+        self.idle_since = time.monotonic()
+        self.abandoned = False
+        self.watcher: asyncio.Task | None = None
+
+    async def append(self, chunk: str) -> int:
+        """Append an SSE chunk and wake subscribers, returning its id"""
+        async with self._cond:
+            self.last_id += 1
+            self.events.append((self.last_id, chunk))
+            self._cond.notify_all()
+            return self.last_id
+
+    async def close(self):
+        """Mark the log complete; subscribers finish once they have caught up"""
+        async with self._cond:
+            self.closed = True
+            self.closed_at = time.monotonic()
+            self._cond.notify_all()
+
+    async def subscribe(self, after_id: int = 0) -> AsyncIterator[str]:
+        """
+        Stream events with id > after_id, then new ones as they arrive.
+
+        Args:
+            after_id: Last event id the client has (Last-Event-ID), 0 for all
+
+        Yields:
+            SSE chunks with an "id:" line
+        """
+        if self.events and after_id < self.events[0][0] - 1:
+            logger.warning(
+                "Event log truncated, replaying from oldest kept event",
+                trip_id=self.trip_id,
+                last_event_id=after_id,
+                oldest_id=self.events[0][0],
+            )
+
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(
+                    lambda after=after_id: self.last_id > after or self.closed
+                )
+                pending = [(i, chunk) for i, chunk in self.events if i > after_id]
+                closed = self.closed
+
+            for event_id, chunk in pending:
+                yield f"id: {event_id}\n{chunk}"
+                after_id = event_id
+
+            if closed and after_id >= self.last_id:
+                return
+
+
+class EventLogRegistry:
+    """
+    Per-trip event logs and the background tasks that fill them.
+
+    Finished logs are kept for `retention_seconds` so late reconnects can
+    still replay the whole stream.
+
+    Args:
+        store: Pending trip store, mirrors events when it is shared
+        max_events: Per-trip event log bound
+        retention_seconds: How long finished logs stay replayable
+        poll_interval: Shared store polling interval for remote streams
+        stall_timeout: Give up on a remote stream with no new event for this long (0 = never)
+        connect_timeout: Cancel generation no client connects to within this (0 = never)
+        abandon_grace: Cancel generation this long after its last client left (0 = never)
+    """
+
+    def __init__(
+        self,
+        store: PendingTripStore,
+        max_events: int = 1000,
+        retention_seconds: float = 300,
+        poll_interval: float = 0.25,
+        stall_timeout: float = 90,
+        connect_timeout: float = 30,
+        abandon_grace: float = 15,
+    ):
+        self.store = store
+        self.max_events = max_events
+        self.retention_seconds = retention_seconds
+        self.poll_interval = poll_interval
+        self.stall_timeout = stall_timeout
+        self.connect_timeout = connect_timeout
+        self.abandon_grace = abandon_grace
+        self._logs: dict[str, TripEventLog] = {}
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.abandoned = 0
+
+    def _prune(self):
+        """Drop finished logs past their retention period"""
+        now = time.monotonic()
+        expired = [
+            trip_id for trip_id, log in self._logs.items()
+            if log.closed and now - log.closed_at > self.retention_seconds
+        ]
+        for trip_id in expired:
+            del self._logs[trip_id]
+
+    def start(self, trip_id: str, events: AsyncIterator[str]) -> TripEventLog:
+        """
+        Run an event generator in the background, recording into a new log.
+
+        Args:
+            trip_id: Trip ID
+            events: SSE chunk generator (e.g. the trip generation stream)
+
+        Returns:
+            The trip's event log
+        """
+        self._prune()
+        log = TripEventLog(trip_id, max_events=self.max_events)
+        self._logs[trip_id] = log
+        log.task = asyncio.create_task(self._run(log, events), name=f"trip-stream-{trip_id}")
+        self.started += 1
+        self._watch(log, self.connect_timeout)
+        return log
+
+    async def _run(self, log: TripEventLog, events: AsyncIterator[str]):
+        try:
+            async for chunk in events:
+                event_id = await log.append(chunk)
+                await self.store.append_event(log.trip_id, event_id, chunk)
+            self.completed += 1
+        except asyncio.CancelledError:
+            if not log.abandoned:
+                self.failed += 1
+                raise
+            # Terminal event for a client reconnecting after the cancel
+            self.abandoned += 1
+            error = {"error": "Trip generation cancelled: client disconnected"}
+            chunk = f"event: error\ndata: {json.dumps(error)}\n\n"
+            event_id = await log.append(chunk)
+            await self.store.append_event(log.trip_id, event_id, chunk)
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error("Trip stream task failed", trip_id=log.trip_id, error=str(e))
+        finally:
+            await log.close()
+            try:
+                await self.store.finish(log.trip_id)
+            except Exception as e:
+                logger.warning("Failed to mark trip finished", trip_id=log.trip_id, error=str(e))
+
+    def _watch(self, log: TripEventLog, idle_limit: float):
+        """Cancel the log's generation once it has had no client for `idle_limit` seconds"""
+        if log.watcher is not None:
+            log.watcher.cancel()
+        if idle_limit <= 0:
+            return
+        log.watcher = asyncio.create_task(
+            self._cancel_when_abandoned(log, idle_limit),
+            name=f"trip-watch-{log.trip_id}",
+        )
+
+    async def _cancel_when_abandoned(self, log: TripEventLog, idle_limit: float):
+        while log.task is not None and not log.task.done() and log.subscribers == 0:
+            idle = time.monotonic() - log.idle_since
+
+            # Clients following through the shared store from other workers
+            seen_at = await self.store.last_seen(log.trip_id)
+            if seen_at is not None:
+                idle = min(idle, time.time() - seen_at)
+
+            if idle >= idle_limit:
+                logger.warning(
+                    "Trip stream abandoned, cancelling generation",
+                    trip_id=log.trip_id,
+                    idle_seconds=round(idle, 1),
+                    events=log.last_id,
+                )
+                log.abandoned = True
+                log.task.cancel()
+                return
+
+            await asyncio.sleep(idle_limit - idle)
+
+    async def _subscribe_local(self, log: TripEventLog, after_id: int) -> AsyncIterator[str]:
+        """Follow a log on this worker, counting the client while it is connected"""
+        log.subscribers += 1
+        try:
+            async for chunk in log.subscribe(after_id):
+                yield chunk
+        finally:
+            log.subscribers -= 1
+            if log.subscribers == 0:
+                log.idle_since = time.monotonic()
+                self._watch(log, self.abandon_grace)
+
+    def get(self, trip_id: str) -> TripEventLog | None:
+        """Get a trip's event log if it is running or recently finished"""
+        self._prune()
+        return self._logs.get(trip_id)
+
+    async def subscribe(self, trip_id: str, after_id: int = 0) -> AsyncIterator[str] | None:
+        """
+        Event stream for a trip, wherever its generation runs.
+
+        Args:
+            trip_id: Trip ID
+            after_id: Last event id the client has (Last-Event-ID)
+
+        Returns:
+            SSE chunk iterator, or None if the trip is unknown
+        """
+        log = self.get(trip_id)
+        if log is not None:
+            return self._subscribe_local(log, after_id)
+
+        if self.store.shared and await self.store.get(trip_id) is not None:
+            return self._subscribe_shared(trip_id, after_id)
+
+        return None
+
+    async def _subscribe_shared(self, trip_id: str, after_id: int) -> AsyncIterator[str]:
+        """Follow a trip generated by another worker through the shared store"""
+        # Heartbeat often enough that the generating worker never sees a
+        # gap as long as its abandon grace
+        heartbeat_interval = max(self.poll_interval, self.abandon_grace / 3)
+        last_heartbeat = 0.0
+        last_event_at = time.monotonic()
+
+        while True:
+            if time.monotonic() - last_heartbeat >= heartbeat_interval:
+                await self.store.touch(trip_id)
+                last_heartbeat = time.monotonic()
+
+            events, status = await self.store.read_events(trip_id, after_id)
+            for event_id, chunk in events:
+                yield f"id: {event_id}\n{chunk}"
+                after_id = event_id
+            if events:
+                last_event_at = time.monotonic()
+                continue
+
+            if status == "done":
+                return
+            stalled = (
+                self.stall_timeout > 0 and time.monotonic() - last_event_at >= self.stall_timeout
+            )
+            if status == "expired" or stalled:
+                logger.warning(
+                    "Remote trip stream ended without finishing",
+                    trip_id=trip_id,
+                    reason="stalled" if status == "running" else status,
+                    last_event_id=after_id,
+                )
+                error = {"error": "Trip generation stopped: the generating worker is unavailable"}
+                yield f"event: error\ndata: {json.dumps(error)}\n\n"
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def aclose(self):
+        """Cancel running generations (app shutdown)"""
+        for log in self._logs.values():
+            if log.watcher is not None:
+                log.watcher.cancel()
+        tasks = [log.task for log in self._logs.values() if log.task and not log.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._logs.clear()
+
+    def stats(self) -> dict:
+        running = sum(1 for log in self._logs.values() if not log.closed)
+        return {
+            "running": running,
+            "retained": len(self._logs) - running,
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "abandoned": self.abandoned,
+            "subscribers": sum(log.subscribers for log in self._logs.values()),
+        }
+
+
+# Global registry used by the SSE endpoints
+event_logs = EventLogRegistry(
+    pending_trips,
+    max_events=settings.stream_event_log_max_events,
+    retention_seconds=settings.stream_event_log_retention_seconds,
+    poll_interval=settings.stream_poll_interval_seconds,
+    stall_timeout=settings.stream_stall_timeout_seconds,
+    connect_timeout=settings.stream_connect_timeout_seconds,
+    abandon_grace=settings.stream_abandon_grace_seconds,
+)
@@ -0,0 +1,360 @@
+"""
+Pending Trip Store
+
+Trips accepted by POST /api/trips/generate/stream, until their stream is
+done. Entries expire after a TTL and the store is capped by entry count,
+so errored or abandoned streams cannot leak.
+
+Backends:
+- memory: per-process (single worker)
+- SQLite (WAL): shared by all workers on the host. Also holds each trip's
+  event log, so the SSE GET can land on a different worker than the POST,
+  and a heartbeat from such remote clients (so the generating worker knows
+  the stream is still watched).
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from ..config import settings
+from ..logging import get_logger
+
+logger = get_logger("pending_trips")
+
+
+class MemoryTripBackend:
+    """In-process storage, oldest entries evicted first"""
+
+    shared = False
+
+    def __init__(self):
+        self._trips: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+    async def put(self, trip_id: str, data: dict, created_at: float):
+        self._trips[trip_id] = (data, created_at)
+        self._trips.move_to_end(trip_id)
+
+    async def get(self, trip_id: str) -> tuple[dict, float] | None:
+        return self._trips.get(trip_id)
+
+    async def delete(self, trip_id: str):
+        self._trips.pop(trip_id, None)
+
+    async def finish(self, trip_id: str):
+        # Keep the record (the trip exists) but drop its payload
+        entry = self._trips.get(trip_id)
+        if entry is not None:
+            self._trips[trip_id] = ({"status": "done"}, entry[1])
+
+    async def evict(self, expire_before: float, max_entries: int) -> tuple[int, int, int]:
+        """Remove expired entries, then the oldest past the cap: (expired, evicted, size)"""
+        expired = [
+            tid for tid, (_, created_at) in self._trips.items() if created_at < expire_before
+        ]
+        for trip_id in expired:
+            del self._trips[trip_id]
+
+        evicted = 0
+        while len(self._trips) > max_entries:
+            self._trips.popitem(last=False)
+            evicted += 1
+
+        return len(expired), evicted, len(self._trips)
+
+
+class SQLiteTripBackend:
+    """
+    SQLite storage shared by all workers on the host.
+
+    Trips and their SSE events live in two tables; queries run in a worker
+    thread so the event loop never waits on disk I/O. Each trip keeps its
+    last `max_events` events, like the in-memory event log.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, max_events: int = 1000):
+        self.path = path
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_trips ("
+            "trip_id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+            "created_at REAL NOT NULL, done INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS pending_trips_created ON pending_trips (created_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trip_events ("
+            "trip_id TEXT NOT NULL, event_id INTEGER NOT NULL, chunk TEXT NOT NULL, "
+            "PRIMARY KEY (trip_id, event_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trip_watchers ("
+            "trip_id TEXT PRIMARY KEY, seen_at REAL NOT NULL)"
+        )
+
+    def _put(self, trip_id: str, data: dict, created_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pending_trips (trip_id, data, created_at, done) "
+                "VALUES (?, ?, ?, 0)",
+                (trip_id, json.dumps(data), created_at),
+            )
+
+    def _get(self, trip_id: str) -> tuple[dict, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM pending_trips WHERE trip_id = ?", (trip_id,)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _delete(self, trip_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM pending_trips WHERE trip_id = ?", (trip_id,))
+            self._conn.execute("DELETE FROM trip_events WHERE trip_id = ?", (trip_id,))
+            self._conn.execute("DELETE FROM trip_watchers WHERE trip_id = ?", (trip_id,))
+
+    def _finish(self, trip_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pending_trips SET done = 1, data = ? WHERE trip_id = ?",
+                (json.dumps({"status": "done"}), trip_id),
+            )
+
+    def _append_event(self, trip_id: str, event_id: int, chunk: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trip_events (trip_id, event_id, chunk) VALUES (?, ?, ?)",
+                (trip_id, event_id, chunk),
+            )
+            self._conn.execute(
+                "DELETE FROM trip_events WHERE trip_id = ? AND event_id <= ?",
+                (trip_id, event_id - self.max_events),
+            )
+
+    def _touch(self, trip_id: str, seen_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trip_watchers (trip_id, seen_at) VALUES (?, ?)",
+                (trip_id, seen_at),
+            )
+
+    def _last_seen(self, trip_id: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seen_at FROM trip_watchers WHERE trip_id = ?", (trip_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _read_events(
+        self, trip_id: str, after_id: int, expire_before: float
+    ) -> tuple[list[tuple[int, str]], str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT done, created_at FROM pending_trips WHERE trip_id = ?", (trip_id,)
+            ).fetchone()
+            events = self._conn.execute(
+                "SELECT event_id, chunk FROM trip_events "
+                "WHERE trip_id = ? AND event_id > ? ORDER BY event_id",
+                (trip_id, after_id),
+            ).fetchall()
+        # A trip that is gone or past its TTL has no more events coming, even
+        # if no put() has evicted it yet
+        if row is not None and row[0]:
+            status = "done"
+        elif row is None or row[1] < expire_before:
+            status = "expired"
+        else:
+            status = "running"
+        return [(event_id, chunk) for event_id, chunk in events], status
+
+    def _evict(self, expire_before: float, max_entries: int) -> tuple[int, int, int]:
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM pending_trips WHERE created_at < ?", (expire_before,)
+            ).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM pending_trips").fetchone()[0]
+            evicted = max(0, count - max_entries)
+            if evicted:
+                self._conn.execute(
+                    "DELETE FROM pending_trips WHERE trip_id IN ("
+                    "SELECT trip_id FROM pending_trips ORDER BY created_at LIMIT ?)",
+                    (evicted,),
+                )
+            if expired or evicted:
+                self._conn.execute(
+                    "DELETE FROM trip_events "
+                    "WHERE trip_id NOT IN (SELECT trip_id FROM pending_trips)"
+                )
+                self._conn.execute(
+                    "DELETE FROM trip_watchers "
+                    "WHERE trip_id NOT IN (SELECT trip_id FROM pending_trips)"
+                )
+        return expired, evicted, count - evicted
+
+    async def put(self, trip_id: str, data: dict, created_at: float):
+        await asyncio.to_thread(self._put, trip_id, data, created_at)
+
+    async def get(self, trip_id: str) -> tuple[dict, float] | None:
+        return await asyncio.to_thread(self._get, trip_id)
+
+    async def delete(self, trip_id: str):
+        await asyncio.to_thread(self._delete, trip_id)
+
+    async def finish(self, trip_id: str):
+        await asyncio.to_thread(self._finish, trip_id)
+
+    async def append_event(self, trip_id: str, event_id: int, chunk: str):
+        await asyncio.to_thread(self._append_event, trip_id, event_id, chunk)
+
+    async def read_events(
+        self, trip_id: str, after_id: int, expire_before: float
+    ) -> tuple[list[tuple[int, str]], str]:
+        return await asyncio.to_thread(self._read_events, trip_id, after_id, expire_before)
+
+    async def touch(self, trip_id: str, seen_at: float):
+        await asyncio.to_thread(self._touch, trip_id, seen_at)
+
+    async def last_seen(self, trip_id: str) -> float | None:
+        return await asyncio.to_thread(self._last_seen, trip_id)
+
+    async def evict(self, expire_before: float, max_entries: int) -> tuple[int, int, int]:
+        return await asyncio.to_thread(self._evict, expire_before, max_entries)
+
+
+class PendingTripStore:
+    """
+    TTL- and size-bounded store of pending trips.
+
+    Trip data must be JSON-serializable when the SQLite backend is used.
+
+    Args:
+        ttl_seconds: Entries older than this are dropped
+        max_entries: Oldest entries are evicted past this many
+        path: SQLite file for a store shared by all workers (None = in-memory)
+        max_events: Per-trip bound on the shared event log
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        path: str | None = None,
+        max_events: int = 1000,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.backend: MemoryTripBackend | SQLiteTripBackend = MemoryTripBackend()
+        if path:
+            try:
+                self.backend = SQLiteTripBackend(path, max_events=max_events)
+            except sqlite3.Error as e:
+                logger.error("Pending trip store falling back to memory", path=path, error=str(e))
+
+        self.size = 0
+        self.puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @property
+    def shared(self) -> bool:
+        """True when other workers see the same trips and events"""
+        return self.backend.shared
+
+    async def _evict(self):
+        expired, evicted, self.size = await self.backend.evict(
+            time.time() - self.ttl_seconds, self.max_entries
+        )
+        self.expired += expired
+        self.evicted += evicted
+
+    async def put(self, trip_id: str, data: dict):
+        """Store a pending trip (evicts expired and overflow entries)"""
+        await self.backend.put(trip_id, data, time.time())
+        self.puts += 1
+        await self._evict()
+
+    async def get(self, trip_id: str) -> dict | None:
+        """Get a pending trip, or None if unknown or expired"""
+        entry = await self.backend.get(trip_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        data, created_at = entry
+        if time.time() - created_at >= self.ttl_seconds:
+            await self.backend.delete(trip_id)
+            self.size = max(0, self.size - 1)
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    async def delete(self, trip_id: str):
+        await self.backend.delete(trip_id)
+
+    async def finish(self, trip_id: str):
+        """Mark a trip's stream done; its payload is dropped, the record expires with the TTL"""
+        await self.backend.finish(trip_id)
+
+    async def append_event(self, trip_id: str, event_id: int, chunk: str):
+        """Record an SSE event for other workers (no-op for the memory backend)"""
+        if self.shared:
+            await self.backend.append_event(trip_id, event_id, chunk)
+
+    async def read_events(self, trip_id: str, after_id: int) -> tuple[list[tuple[int, str]], str]:
+        """
+        Events after `after_id` and the stream status (shared backend only).
+
+        Status is "running", "done" (finished normally) or "expired" (gone
+        or past the TTL without finishing).
+        """
+        if not self.shared:
+            return [], "done"
+        return await self.backend.read_events(trip_id, after_id, time.time() - self.ttl_seconds)
+
+    async def touch(self, trip_id: str):
+        """Record that a client on this worker follows the trip (shared backend only)"""
+        if self.shared:
+            await self.backend.touch(trip_id, time.time())
+
+    async def last_seen(self, trip_id: str) -> float | None:
+        """When a client last followed the trip from any worker (time.time()), if known"""
+        if not self.shared:
+            return None
+        return await self.backend.last_seen(trip_id)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "sqlite" if self.shared else "memory",
+            "size": self.size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "puts": self.puts,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+# Global store used by the SSE endpoints
+pending_trips = PendingTripStore(
+    ttl_seconds=settings.pending_trip_ttl_seconds,
+    max_entries=settings.pending_trip_max_entries,
+    path=settings.pending_trip_store_path,
+    max_events=settings.stream_event_log_max_events,
+)
@@ -0,0 +1,78 @@
+"""
+Request Deadlines
+
+An absolute deadline carried in a context variable, so it reaches every
+agent and tool call of a request (tasks copy the context when created).
+
+- Tools cap their upstream timeouts to the remaining budget
+- Stages check has_budget() and skip optional work (extra queries, LLM
+  passes, retries) when time is short
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Absolute deadline (time.monotonic()) for the current request, if any
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request deadline passed before an upstream call could start"""
+
+
+@contextmanager
+def deadline_scope(seconds: float | None):
+    """
+    Set a deadline `seconds` from now for the enclosed block.
+
+    A nested scope can only shorten an outer deadline. None or 0 keeps the
+    current deadline (if any).
+    """
+    deadline = _deadline.get()
+    if seconds:
+        new_deadline = time.monotonic() + seconds
+        deadline = new_deadline if deadline is None else min(deadline, new_deadline)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def context_without_deadline() -> contextvars.Context:
+    """Copy of the current context with no deadline, for work shared by several requests"""
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def remaining() -> float | None:
+    """Seconds left until the deadline (may be negative), None without one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def has_budget(seconds: float) -> bool:
+    """True if there is no deadline or at least `seconds` remain"""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def call_timeout(default: float) -> float:
+    """
+    Timeout for one upstream call: `default`, capped to the remaining budget.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return min(default, left)
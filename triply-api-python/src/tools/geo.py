@@ -0,0 +1,182 @@
+"""
+Geo Helpers
+
+Vectorized (NumPy) distances and itinerary geometry:
+- haversine_matrix(): pairwise great-circle distances
+- balanced_clusters(): split places into equally sized, compact days
+  (capacity-constrained k-means)
+- visit_order(): short walking order within a day (nearest neighbour,
+  improved with 2-opt)
+
+Inputs are plain coordinate sequences so the helpers work for any model.
+"""
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_000
+
+# Balanced k-means stops after this many rounds if it has not converged
+CLUSTER_MAX_ITERATIONS = 20
+
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def haversine_matrix(
+    lats1: Sequence[float] | np.ndarray,
+    lngs1: Sequence[float] | np.ndarray,
+    lats2: Sequence[float] | np.ndarray | None = None,
+    lngs2: Sequence[float] | np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Great-circle distances in meters between two sets of points.
+
+    Args:
+        lats1, lngs1: First set (n points, degrees)
+        lats2, lngs2: Second set (m points); defaults to the first set
+
+    Returns:
+        n x m matrix of distances
+    """
+    lat1 = np.radians(np.asarray(lats1, dtype=float))[:, None]
+    lng1 = np.radians(np.asarray(lngs1, dtype=float))[:, None]
+    lat2 = np.radians(np.asarray(lats1 if lats2 is None else lats2, dtype=float))[None, :]
+    lng2 = np.radians(np.asarray(lngs1 if lngs2 is None else lngs2, dtype=float))[None, :]
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def balanced_clusters(
+    lats: Sequence[float],
+    lngs: Sequence[float],
+    k: int,
+    capacity: int | None = None,
+) -> list[list[int]]:
+    """
+    Split points into k compact clusters of at most `capacity` points.
+
+    Capacity-constrained k-means: seeds are picked farthest-first starting
+    at point 0, then each round assigns (point, cluster) pairs closest
+    first while clusters have room, and moves centers to their members.
+
+    Args:
+        lats, lngs: Point coordinates (degrees)
+        k: Number of clusters
+        capacity: Max points per cluster (default: ceil(n / k))
+
+    Returns:
+        k lists of point indices (some empty when there are fewer points than k)
+    """
+    n = len(lats)
+    if n == 0 or k <= 0:
+        return [[] for _ in range(max(k, 0))]
+
+    capacity = max(capacity or 0, math.ceil(n / k))
+    lats_arr = np.asarray(lats, dtype=float)
+    lngs_arr = np.asarray(lngs, dtype=float)
+    dist = haversine_matrix(lats_arr, lngs_arr)
+
+    # Farthest-first seeding (deterministic)
+    seeds = [0]
+    nearest_seed = dist[0].copy()
+    for _ in range(1, min(k, n)):
+        seeds.append(int(np.argmax(nearest_seed)))
+        nearest_seed = np.minimum(nearest_seed, dist[seeds[-1]])
+    center_lats = lats_arr[seeds]
+    center_lngs = lngs_arr[seeds]
+    k_used = len(seeds)
+
+    labels = np.full(n, -1)
+    for _ in range(CLUSTER_MAX_ITERATIONS):
+        to_centers = haversine_matrix(lats_arr, lngs_arr, center_lats, center_lngs)
+
+        new_labels = np.full(n, -1)
+        counts = np.zeros(k_used, dtype=int)
+        for flat in np.argsort(to_centers, axis=None, kind="stable"):
+            point, cluster = divmod(int(flat), k_used)
+            if new_labels[point] >= 0 or counts[cluster] >= capacity:
+                continue
+            new_labels[point] = cluster
+            counts[cluster] += 1
+
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        for cluster in range(k_used):
+            members = labels == cluster
+            if members.any():
+                center_lats[cluster] = lats_arr[members].mean()
+                center_lngs[cluster] = lngs_arr[members].mean()
+
+    clusters = [np.flatnonzero(labels == c).tolist() for c in range(k_used)]
+    return clusters + [[] for _ in range(k - k_used)]
+
+
+def visit_order(dist: np.ndarray) -> list[int]:
+    """
+    Short open path through all points of a distance matrix.
+
+    Nearest neighbour from every start (keeping the shortest), then 2-opt
+    segment reversals until no reversal shortens the path.
+
+    Args:
+        dist: n x n distance matrix
+
+    Returns:
+        Point indices in visiting order
+    """
+    n = len(dist)
+    if n <= 2:
+        return list(range(n))
+
+    def path_length(path: list[int]) -> float:
+        return float(dist[path[:-1], path[1:]].sum())
+
+    best_path: list[int] = []
+    best_length = math.inf
+    for start in range(n):
+        path = [start]
+        unvisited = np.ones(n, dtype=bool)
+        unvisited[start] = False
+        while unvisited.any():
+            candidates = np.where(unvisited, dist[path[-1]], np.inf)
+            nxt = int(np.argmin(candidates))
+            path.append(nxt)
+            unvisited[nxt] = False
+        length = path_length(path)
+        if length < best_length:
+            best_path, best_length = path, length
+
+    # 2-opt for an open path: reversing path[i..j] replaces the edges
+    # entering i and leaving j (when they exist)
+    path = best_path
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                delta = 0.0
+                if i > 0:
+                    delta += dist[path[i - 1], path[j]] - dist[path[i - 1], path[i]]
+                if j < n - 1:
+                    delta += dist[path[i], path[j + 1]] - dist[path[j], path[j + 1]]
+                if delta < -1e-6:
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    improved = True
+
+    return path
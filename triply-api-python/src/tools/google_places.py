@@ -4,31 +4,101 @@ Google Places Tool
 LangChain tool for searching places using Google Places API (New)
 """
 
+import asyncio
+import json
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
 import httpx
 import structlog
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from ..cache import create_cache
 from ..config import settings
+from ..logging.metrics import track_upstream
+from .deadline import call_timeout
+from .http_client import http_clients
+from .rate_limit import get_limiter
+from .singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
-# Google Places API (New) base URL
-PLACES_API_URL = "https://places.googleapis.com/v1/places:searchText"
+# Google Places API (New) paths, relative to the pooled "places" client
+PLACES_SEARCH_PATH = "/v1/places:searchText"
+PLACE_DETAILS_PATH = "/v1/places/{place_id}"
+
+# Cross-request cache of Text Search responses
+_search_cache = create_cache(
+    "places_search",
+    ttl_seconds=settings.places_cache_ttl_seconds,
+    max_entries=settings.places_cache_max_entries,
+    path=settings.places_cache_path,
+)
+
+# Coalesces identical Text Search requests that are in flight at the same time
+_search_flights = SingleFlight("places_search")
+
 
-# Module-level cache for place data (cleared per request)
-_place_cache: dict[str, "PlaceResult"] = {}
+@dataclass
+class SearchScope:
+    """
+    Per-execution search state.
+
+    - places: place data found by the search_places tool (for post-processing)
+    - prefetched: Text Search tasks started ahead of time, keyed by cache key
+    """
+    places: dict[str, "PlaceResult"] = field(default_factory=dict)
+    prefetched: dict[str, asyncio.Task] = field(default_factory=dict)
 
+    def cancel_pending(self):
+        """Cancel prefetches nobody consumed"""
+        for task in self.prefetched.values():
+            task.cancel()
 
-def clear_place_cache():
-    """Clear the place cache - call at start of each trip generation"""
-    global _place_cache
-    _place_cache = {}
+
+# Each trip generation gets its own scope via new_search_scope(); tasks spawned
+# by that generation inherit the context, so concurrent trips never share it.
+_search_scope: ContextVar[SearchScope | None] = ContextVar("search_scope", default=None)
+
+
+def new_search_scope() -> SearchScope:
+    """Start a fresh search scope for the current execution (call at the start of each trip)"""
+    scope = SearchScope()
+    _search_scope.set(scope)
+    return scope
 
 
 def get_cached_places() -> dict[str, "PlaceResult"]:
-    """Get all cached places"""
-    return _place_cache.copy()
+    """Get the place cache of the current execution (empty if none was started)"""
+    scope = _search_scope.get()
+    return scope.places if scope else {}
+
+
+def prefetch_places_search(
+    query: str,
+    max_results: int = 10,
+    location: dict | None = None,
+    radius: int = 1500,
+):
+    """
+    Start a Text Search in the background for the current execution.
+
+    A later search_places_api() call with the same arguments awaits this
+    task instead of sending its own request. No-op outside a search scope.
+    """
+    scope = _search_scope.get()
+    if scope is None:
+        return
+
+    cache_key = search_cache_key(query, max_results, location, radius)
+    if cache_key in scope.prefetched:
+        return
+
+    task = asyncio.create_task(_cached_search(cache_key, query, max_results, location, radius))
+    # Failures surface to the consumer; mark them retrieved if nobody consumes
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    scope.prefetched[cache_key] = task
 
 
 class PlaceSearchInput(BaseModel):
@@ -72,6 +142,62 @@ async def search_places_api(
 
     Returns raw place data from Google
     """
+    cache_key = search_cache_key(query, max_results, location, radius)
+
+    # Reuse a prefetch started earlier in this execution
+    scope = _search_scope.get()
+    if scope is not None and cache_key in scope.prefetched:
+        return await asyncio.shield(scope.prefetched[cache_key])
+
+    return await _cached_search(cache_key, query, max_results, location, radius)
+
+
+async def _cached_search(
+    cache_key: str,
+    query: str,
+    max_results: int,
+    location: dict | None,
+    radius: int,
+) -> list[dict]:
+    """Text Search through the shared cache and single-flight layer"""
+    cached = await _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def fetch() -> list[dict]:
+        places = await _search_text(query, max_results, location, radius)
+        await _search_cache.set(cache_key, places)
+        return places
+
+    return await _search_flights.do(cache_key, fetch, timeout=30)
+
+
+def search_cache_key(
+    query: str,
+    max_results: int,
+    location: dict | None,
+    radius: int,
+) -> str:
+    """
+    Build a cache key for a Text Search request.
+
+    The query is case/whitespace-normalized and the bias center is rounded
+    to ~10m so near-identical searches share an entry.
+    """
+    normalized_query = " ".join(query.lower().split())
+    bias = None
+    if location and "lat" in location and "lng" in location:
+        bias = [round(location["lat"], 4), round(location["lng"], 4), radius]
+    return json.dumps([normalized_query, max_results, bias])
+
+
+async def _search_text(
+    query: str,
+    max_results: int,
+    location: dict | None,
+    radius: int,
+) -> list[dict]:
+    """Call the Text Search endpoint (uncached)"""
     headers = {
         "Content-Type": "application/json",
         "X-Goog-Api-Key": settings.places_api_key,
@@ -110,14 +236,31 @@ async def search_places_api(
             }
         }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(PLACES_API_URL, json=body, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+    data = await places_request("POST", PLACES_SEARCH_PATH, headers=headers, json=body)
 
     return data.get("places", [])
 
 
+async def places_request(method: str, path: str, **kwargs) -> dict:
+    """
+    Send a request to the Places API over the shared pooled client
+
+    Args:
+        method: HTTP method
+        path: Path relative to https://places.googleapis.com
+        **kwargs: Extra arguments for httpx (headers, json, params)
+
+    Returns parsed JSON response, raises httpx.HTTPStatusError on failure
+    """
+    client = http_clients.get("places")
+    operation = "search_text" if path == PLACES_SEARCH_PATH else "place_details"
+    timeout = call_timeout(30)
+    async with get_limiter("places").slot(), track_upstream("places", operation):
+        response = await client.request(method, path, timeout=timeout, **kwargs)
+        response.raise_for_status()
+    return response.json()
+
+
 def get_photo_url(photo_name: str, max_width: int = 800) -> str:
     """Generate photo URL from Google Places photo reference"""
     return (
@@ -221,9 +364,11 @@ async def search_places(
 
         logger.info("Found places", count=len(places), query=query)
 
-        # Cache places for post-processing
-        for p in places:
-            _place_cache[p.place_id] = p
+        # Cache places for post-processing (only inside a generation scope)
+        scope = _search_scope.get()
+        if scope is not None:
+            for p in places:
+                scope.places[p.place_id] = p
 
         # Format as readable string for the agent
         if not places:
@@ -290,14 +435,11 @@ async def get_place_details(place_id: str) -> str:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://places.googleapis.com/v1/places/{place_id}",
-                headers=headers,
-                timeout=30,
-            )
-            response.raise_for_status()
-            place = response.json()
+        place = await places_request(
+            "GET",
+            PLACE_DETAILS_PATH.format(place_id=place_id),
+            headers=headers,
+        )
 
         # Format response
         name = place.get("displayName", {}).get("text", "Unknown")
@@ -0,0 +1,108 @@
+"""
+Shared HTTP Clients
+
+App-lifetime registry of pooled httpx clients, one per upstream host.
+Clients are created in the FastAPI lifespan, kept alive between requests
+and reused by every tool so parallel searches share warm connections
+instead of paying a TCP+TLS handshake each.
+"""
+
+import asyncio
+from urllib.parse import urlparse
+
+import httpx
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+# HTTP/2 needs the optional `h2` package (installed via httpx[http2])
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Upstream name -> base URL
+UPSTREAMS: dict[str, str] = {
+    "places": "https://places.googleapis.com",
+    "tavily": "https://api.tavily.com",
+}
+
+
+class HttpClientRegistry:
+    """
+    Registry of pooled httpx.AsyncClient instances keyed by upstream name.
+
+    Each upstream gets its own client, so connection limits apply per host.
+    Clients are created lazily if a tool runs outside the app lifespan
+    (scripts, REPL), but normally `start()` creates and warms them up.
+    """
+
+    def __init__(self, upstreams: dict[str, str] | None = None):
+        self.upstreams = dict(upstreams or UPSTREAMS)
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _create_client(self, name: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(30.0, connect=settings.http_connect_timeout)
+
+        return httpx.AsyncClient(
+            base_url=self.upstreams[name],
+            http2=HTTP2_AVAILABLE,
+            limits=limits,
+            timeout=timeout,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Get the pooled client for an upstream, creating it if needed"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(name)
+            self._clients[name] = client
+        return client
+
+    async def start(self, warm_up: bool = True):
+        """Create all clients and optionally warm up DNS and connections"""
+        for name in self.upstreams:
+            self.get(name)
+
+        logger.info(
+            "HTTP clients started",
+            upstreams=list(self.upstreams),
+            http2=HTTP2_AVAILABLE,
+            max_connections=settings.http_max_connections,
+        )
+
+        if warm_up:
+            await asyncio.gather(*[self._warm_up(name) for name in self.upstreams])
+
+    async def _warm_up(self, name: str):
+        """Resolve DNS and open a first connection to the upstream host"""
+        host = urlparse(self.upstreams[name]).hostname
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.getaddrinfo(host, 443)
+
+            # Any response (even 404) leaves a live connection in the pool
+            await self.get(name).head("/", timeout=settings.http_connect_timeout)
+            logger.info("HTTP client warmed up", upstream=name, host=host)
+        except Exception as e:
+            logger.warning("HTTP client warm-up failed", upstream=name, host=host, error=str(e))
+
+    async def aclose(self):
+        """Close all clients and release their connections"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*[c.aclose() for c in clients], return_exceptions=True)
+        logger.info("HTTP clients closed", count=len(clients))
+
+
+# Global registry used by all tools
+http_clients = HttpClientRegistry()
@@ -0,0 +1,255 @@
+"""
+Upstream Rate Limiting
+
+Process-wide limiter per upstream (Places, Tavily, Gemini):
+- Token bucket caps requests per second
+- AIMD adaptive concurrency: the in-flight limit grows by ~1 per window of
+  successful calls and is cut multiplicatively on 429/5xx/timeouts
+
+Callers wrap each upstream request in `async with get_limiter(name).slot():`.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import structlog
+
+from ..config import settings
+from ..logging.metrics import (
+    UPSTREAM_BACKOFFS,
+    UPSTREAM_CONCURRENCY_LIMIT,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_OVERLOADS,
+    UPSTREAM_QPS,
+    UPSTREAM_QUEUE,
+    UPSTREAM_WAITING,
+)
+
+logger = structlog.get_logger()
+
+
+def _status_code(exc: BaseException) -> int | None:
+    """HTTP status carried by an SDK error (`status_code` or `code`), if any"""
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for errors that mean the upstream is overloaded (429, 5xx, timeouts)"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    if isinstance(exc, httpx.TimeoutException):
+        return True
+
+    # Gemini SDK errors carry the HTTP status in `code`; LangChain re-raises
+    # them as its own errors chained to the original
+    error: BaseException | None = exc
+    while error is not None:
+        status = _status_code(error)
+        if status is not None:
+            return status == 429 or status >= 500
+        error = error.__cause__
+
+    # No status anywhere: only the gRPC quota status name counts, never a
+    # bare "429" (it shows up in ids, ports and byte counts)
+    return "RESOURCE_EXHAUSTED" in str(exc)
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class AdaptiveLimiter:
+    """
+    QPS cap plus AIMD concurrency limit for one upstream.
+
+    Args:
+        name: Upstream name (for logs/metrics)
+        qps: Token bucket rate, 0 disables the QPS cap
+        burst: Token bucket size
+        initial_concurrency: Starting in-flight limit
+        min_concurrency: Floor for the in-flight limit
+        max_concurrency: Ceiling for the in-flight limit
+        backoff: Multiplier applied to the limit on overload
+    """
+
+    # Ignore further overload signals for this long after a backoff,
+    # so one burst of 429s only halves the limit once
+    BACKOFF_COOLDOWN = 1.0
+
+    def __init__(
+        self,
+        name: str,
+        qps: float,
+        burst: int,
+        initial_concurrency: int,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        backoff: float = 0.5,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(qps, burst)
+        self.limit = float(initial_concurrency)
+        self.min_limit = min_concurrency
+        self.max_limit = max_concurrency
+        self.backoff = backoff
+        self.in_flight = 0
+        self.waiting = 0
+        self._cond = asyncio.Condition()
+        self._last_backoff = 0.0
+
+        # Counters
+        self.successes = 0
+        self.overloads = 0
+        self.errors = 0
+
+        UPSTREAM_QPS.labels(upstream=name).set(qps)
+        self._export()
+
+    def _export(self):
+        """Publish the limit and queue state as Prometheus gauges"""
+        UPSTREAM_CONCURRENCY_LIMIT.labels(upstream=self.name).set(int(self.limit))
+        UPSTREAM_IN_FLIGHT.labels(upstream=self.name).set(self.in_flight)
+        UPSTREAM_WAITING.labels(upstream=self.name).set(self.waiting)
+
+    async def acquire(self):
+        """Wait for a concurrency slot and a QPS token"""
+        async with self._cond:
+            self.waiting += 1
+            self._export()
+            try:
+                await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            self._export()
+
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            await self.release(success=False, overloaded=False)
+            raise
+
+    async def release(self, success: bool, overloaded: bool):
+        """Return a slot and adapt the limit to the call's outcome"""
+        async with self._cond:
+            self.in_flight -= 1
+
+            if overloaded:
+                self.overloads += 1
+                UPSTREAM_OVERLOADS.labels(upstream=self.name).inc()
+                now = time.monotonic()
+                if now - self._last_backoff >= self.BACKOFF_COOLDOWN:
+                    self._last_backoff = now
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    UPSTREAM_BACKOFFS.labels(upstream=self.name).inc()
+                    logger.warning(
+                        "Upstream overloaded, backing off",
+                        upstream=self.name,
+                        concurrency_limit=int(self.limit),
+                    )
+            elif success:
+                self.successes += 1
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                self.errors += 1
+
+            self._export()
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for one upstream call"""
+        start = time.perf_counter()
+        await self.acquire()
+        UPSTREAM_QUEUE.labels(upstream=self.name).observe(time.perf_counter() - start)
+        try:
+            yield
+        except BaseException as e:
+            await self.release(success=False, overloaded=is_overload_error(e))
+            raise
+        else:
+            await self.release(success=True, overloaded=False)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "qps": self.bucket.rate,
+            "tokens": round(self.bucket.tokens, 2),
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "errors": self.errors,
+        }
+
+
+# One limiter per upstream, shared by the whole process
+_limiters: dict[str, AdaptiveLimiter] = {
+    "places": AdaptiveLimiter(
+        "places",
+        qps=settings.places_qps,
+        burst=settings.places_burst,
+        initial_concurrency=settings.places_concurrency,
+        max_concurrency=settings.places_max_concurrency,
+    ),
+    "tavily": AdaptiveLimiter(
+        "tavily",
+        qps=settings.tavily_qps,
+        burst=settings.tavily_burst,
+        initial_concurrency=settings.tavily_concurrency,
+        max_concurrency=settings.tavily_max_concurrency,
+    ),
+    "gemini": AdaptiveLimiter(
+        "gemini",
+        qps=settings.gemini_qps,
+        burst=settings.gemini_burst,
+        initial_concurrency=settings.gemini_concurrency,
+        max_concurrency=settings.gemini_max_concurrency,
+    ),
+}
+
+
+def get_limiter(name: str) -> AdaptiveLimiter:
+    """Get the process-wide limiter for an upstream"""
+    return _limiters[name]
+
+
+def limiter_stats() -> list[dict]:
+    """Stats for all upstream limiters"""
+    return [limiter.stats() for limiter in _limiters.values()]
@@ -0,0 +1,109 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent identical upstream calls share one in-flight task instead of
+each hitting the API. The first caller starts the call; everyone arriving
+while it runs awaits the same result (or the same exception).
+
+The shared call runs without any caller's request deadline, so one
+request that is nearly out of time cannot fail the others; each caller
+only waits as long as its own deadline allows.
+"""
+
+import asyncio
+import math
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from .deadline import call_timeout, context_without_deadline
+
+# All groups created in this process, for stats reporting
+_groups: dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting on it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    - Errors are delivered to every waiter and never cached: the key is
+      released as soon as the call finishes, so the next caller retries.
+    - A cancelled or timed out waiter only stops waiting. The shared call
+      keeps running for the others and is cancelled once nobody is waiting
+      on it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[str, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+        _groups[name] = self
+
+    def _release(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Coroutine[Any, Any, Any]],
+        timeout: float | None = None,
+    ) -> Any:
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the upstream request
+            fn: Zero-argument coroutine function performing the call
+            timeout: Max wait for this caller (None = no limit), capped to
+                its request deadline
+
+        Returns:
+            The shared result of fn()
+
+        Raises:
+            TimeoutError: If this caller's wait ran out
+        """
+        wait = call_timeout(math.inf if timeout is None else timeout)
+
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(fn(), context=context_without_deadline()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, c=call: self._release(key, c))
+            self.executed += 1
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(call.task), None if math.isinf(wait) else wait
+            )
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last waiter gave up (cancelled or timed out) - stop the upstream call
+                self._release(key, call)
+                call.task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "shared": self.shared,
+        }
+
+
+def singleflight_stats() -> list[dict]:
+    """Stats for all single-flight groups"""
+    return [group.stats() for group in _groups.values()]
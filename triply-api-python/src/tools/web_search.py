@@ -5,20 +5,107 @@ LangChain tool for searching the web using Tavily API
 Tavily is specifically designed for AI agents and provides high-quality search results
 """
 
+import asyncio
+import contextvars
+import json
+import time
+
 import structlog
 from langchain_core.tools import tool
 
+from ..cache import create_cache
 from ..config import settings
+from ..logging.metrics import track_upstream
+from .deadline import call_timeout
+from .http_client import http_clients
+from .rate_limit import get_limiter
+from .singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
-# Optional: Use Tavily if available
-try:
-    from tavily import TavilyClient
+# Tavily is called over its REST API on the shared pooled client
+TAVILY_SEARCH_PATH = "/search"
+TAVILY_AVAILABLE = bool(settings.tavily_api_key)
+
+# Coalesces identical Tavily searches that are in flight at the same time
+_search_flights = SingleFlight("tavily_search")
+
+# Destination guides change on a scale of months: cached per (city, country)
+# and served stale while a background refresh runs
+_destination_cache = create_cache(
+    "destination_info",
+    ttl_seconds=settings.destination_cache_ttl_seconds,
+    max_entries=settings.destination_cache_max_entries,
+    path=settings.destination_cache_path,
+)
+
+# Background refreshes of stale guides, by cache key (kept referenced until done)
+_destination_refreshes: dict[str, asyncio.Task] = {}
+
+# Preloaded at startup (first destination_cache_preload_top_n), unless
+# destination_cache_preload lists other "City, Country" entries
+POPULAR_DESTINATIONS = [
+    "Paris, France",
+    "London, United Kingdom",
+    "Rome, Italy",
+    "Barcelona, Spain",
+    "New York, United States",
+    "Tokyo, Japan",
+    "Amsterdam, Netherlands",
+    "Istanbul, Turkey",
+    "Prague, Czech Republic",
+    "Berlin, Germany",
+    "Lisbon, Portugal",
+    "Vienna, Austria",
+    "Dubai, United Arab Emirates",
+    "Bangkok, Thailand",
+    "Madrid, Spain",
+    "Florence, Italy",
+    "Venice, Italy",
+    "Budapest, Hungary",
+    "Kyoto, Japan",
+    "Singapore, Singapore",
+]
+
+
+async def tavily_search(
+    query: str,
+    max_results: int = 5,
+    search_depth: str = "advanced",
+    include_answer: bool = True,
+) -> dict:
+    """
+    Run a Tavily search, sharing the call with identical concurrent searches
+
+    Args:
+        query: Search query
+        max_results: Maximum number of results
+        search_depth: "basic" or "advanced"
+        include_answer: Include Tavily's AI-generated answer summary
 
-    TAVILY_AVAILABLE = bool(settings.tavily_api_key)
-except ImportError:
-    TAVILY_AVAILABLE = False
+    Returns raw Tavily response dict
+    """
+    key = json.dumps([" ".join(query.lower().split()), max_results, search_depth, include_answer])
+
+    async def fetch() -> dict:
+        client = http_clients.get("tavily")
+        timeout = call_timeout(30)
+        async with get_limiter("tavily").slot(), track_upstream("tavily", "search"):
+            response = await client.post(
+                TAVILY_SEARCH_PATH,
+                headers={"Authorization": f"Bearer {settings.tavily_api_key}"},
+                json={
+                    "query": query,
+                    "search_depth": search_depth,
+                    "max_results": max_results,
+                    "include_answer": include_answer,
+                },
+                timeout=timeout,
+            )
+            response.raise_for_status()
+        return response.json()
+
+    return await _search_flights.do(key, fetch, timeout=30)
 
 
 @tool
@@ -45,20 +132,13 @@ async def web_search(query: str, max_results: int = 5) -> str:
 
     if not TAVILY_AVAILABLE:
         return (
-            "Web search is not available. To enable it, install tavily-python "
-            "and set TAVILY_API_KEY in your environment."
+            "Web search is not available. To enable it, "
+            "set TAVILY_API_KEY in your environment."
         )
 
     try:
-        client = TavilyClient(api_key=settings.tavily_api_key)
-
-        # Use search_context for more relevant AI-friendly results
-        response = client.search(
-            query=query,
-            search_depth="advanced",  # More thorough search
-            max_results=max_results,
-            include_answer=True,  # Get AI-generated answer summary
-        )
+        # Advanced depth for more thorough, AI-friendly results with answer summary
+        response = await tavily_search(query, max_results=max_results)
 
         # Format results
         results = []
@@ -112,32 +192,116 @@ async def get_destination_info(city: str, country: str) -> str:
         )
 
     try:
-        client = TavilyClient(api_key=settings.tavily_api_key)
+        return await destination_info(city, country)
 
-        # Search for comprehensive travel info
-        query = f"{city} {country} travel guide tips best things to do 2024"
+    except Exception as e:
+        logger.error("Destination info failed", city=city, country=country, error=str(e))
+        return f"Could not fetch destination info: {str(e)}"
 
-        response = client.search(
-            query=query,
-            search_depth="advanced",
-            max_results=5,
-            include_answer=True,
-        )
 
-        results = []
+def _destination_key(city: str, country: str) -> str:
+    return f"{' '.join(city.lower().split())}|{' '.join(country.lower().split())}"
 
-        if response.get("answer"):
-            results.append(f"Overview:\n{response['answer']}\n")
 
-        # Add key points from search results
-        results.append("Key Information:")
-        for r in response.get("results", [])[:3]:
-            content = r.get("content", "")[:400]
-            if content:
-                results.append(f"- {content}")
+async def _fetch_destination_info(city: str, country: str) -> str:
+    """Search the destination guide and record it in the cache (raises on failure)"""
+    # Search for comprehensive travel info
+    query = f"{city} {country} travel guide tips best things to do 2024"
 
-        return "\n".join(results) if results else f"Basic destination: {city}, {country}"
+    response = await tavily_search(query, max_results=5)
 
-    except Exception as e:
-        logger.error("Destination info failed", city=city, country=country, error=str(e))
-        return f"Could not fetch destination info: {str(e)}"
+    results = []
+
+    if response.get("answer"):
+        results.append(f"Overview:\n{response['answer']}\n")
+
+    # Add key points from search results
+    results.append("Key Information:")
+    for r in response.get("results", [])[:3]:
+        content = r.get("content", "")[:400]
+        if content:
+            results.append(f"- {content}")
+
+    text = "\n".join(results) if results else f"Basic destination: {city}, {country}"
+    record = {"text": text, "fetched_at": time.time()}
+    await _destination_cache.set(_destination_key(city, country), record)
+    return text
+
+
+async def destination_info(city: str, country: str) -> str:
+    """
+    Destination guide for a city, from the cache when possible.
+
+    Cached guides older than destination_cache_stale_seconds are returned
+    as they are and refreshed in the background.
+
+    Args:
+        city: City name
+        country: Country name
+
+    Returns:
+        Destination information text (raises if a needed search fails)
+    """
+    record = await _destination_cache.get(_destination_key(city, country))
+    if record is None:
+        return await _fetch_destination_info(city, country)
+
+    if time.time() - record["fetched_at"] >= settings.destination_cache_stale_seconds:
+        _start_destination_refresh(city, country)
+    return record["text"]
+
+
+def _start_destination_refresh(city: str, country: str):
+    """Refresh a stale destination guide off the request path (once at a time)"""
+    key = _destination_key(city, country)
+    if key in _destination_refreshes:
+        return
+
+    async def refresh():
+        try:
+            await _fetch_destination_info(city, country)
+        except Exception as e:
+            logger.warning(
+                "Destination info refresh failed", city=city, country=country, error=str(e)
+            )
+
+    # Fresh context: the refresh is not bound by the request deadline
+    task = asyncio.create_task(refresh(), context=contextvars.Context())
+    _destination_refreshes[key] = task
+    task.add_done_callback(lambda _: _destination_refreshes.pop(key, None))
+
+
+async def cancel_destination_refreshes():
+    """Cancel background destination guide refreshes (app shutdown)"""
+    tasks = list(_destination_refreshes.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def preload_destination_info(top_n: int | None = None):
+    """
+    Fill the destination cache for the most popular destinations.
+
+    Destinations already cached are only refreshed if stale. Runs the
+    searches concurrently (bounded by the Tavily limiter).
+
+    Args:
+        top_n: How many destinations (default destination_cache_preload_top_n),
+            taken from destination_cache_preload or POPULAR_DESTINATIONS
+    """
+    top_n = settings.destination_cache_preload_top_n if top_n is None else top_n
+    if top_n <= 0 or not TAVILY_AVAILABLE or not _destination_cache.enabled:
+        return
+
+    destinations = []
+    for entry in (settings.destination_cache_preload or POPULAR_DESTINATIONS)[:top_n]:
+        city, _, country = entry.rpartition(",")
+        destinations.append((city.strip(), country.strip()))
+
+    results = await asyncio.gather(
+        *[destination_info(city, country) for city, country in destinations],
+        return_exceptions=True,
+    )
+    failed = sum(isinstance(r, Exception) for r in results)
+    logger.info("Destination info preloaded", destinations=len(destinations), failed=failed)
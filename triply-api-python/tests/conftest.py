@@ -0,0 +1,6 @@
+"""Shared test setup"""
+
+import os
+
+# Settings require a Gemini key; tests never call Gemini
+os.environ.setdefault("GOOGLE_API_KEY", "test")
@@ -0,0 +1,121 @@
+"""Tests for replaying trip event logs after a reconnect"""
+
+import asyncio
+
+from src.streaming import EventLogRegistry, PendingTripStore, TripEventLog
+
+
+def _chunk(n: int) -> str:
+    return f"event: progress\ndata: {n}\n\n"
+
+
+async def _collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+async def _events(count: int):
+    for n in range(1, count + 1):
+        yield _chunk(n)
+
+
+async def test_replay_after_last_event_id():
+    log = TripEventLog("trip")
+    for n in range(1, 5):
+        await log.append(_chunk(n))
+    await log.close()
+
+    assert await _collect(log.subscribe()) == [f"id: {n}\n{_chunk(n)}" for n in range(1, 5)]
+    assert await _collect(log.subscribe(after_id=2)) == [f"id: {n}\n{_chunk(n)}" for n in (3, 4)]
+    assert await _collect(log.subscribe(after_id=4)) == []
+
+
+async def test_live_subscriber_follows_until_close():
+    log = TripEventLog("trip")
+    await log.append(_chunk(1))
+    reader = asyncio.create_task(_collect(log.subscribe()))
+
+    await asyncio.sleep(0)
+    await log.append(_chunk(2))
+    await log.close()
+
+    assert await asyncio.wait_for(reader, 1) == [f"id: {n}\n{_chunk(n)}" for n in (1, 2)]
+
+
+async def test_truncated_log_replays_from_oldest_kept_event():
+    log = TripEventLog("trip", max_events=3)
+    for n in range(1, 6):
+        await log.append(_chunk(n))
+    await log.close()
+
+    assert await _collect(log.subscribe(after_id=1)) == [f"id: {n}\n{_chunk(n)}" for n in (3, 4, 5)]
+
+
+async def test_finished_trip_is_replayable_on_the_same_worker():
+    registry = EventLogRegistry(PendingTripStore(ttl_seconds=60, max_entries=10), connect_timeout=0)
+    log = registry.start("trip", _events(3))
+    await log.task
+
+    stream = await registry.subscribe("trip", after_id=1)
+    assert await _collect(stream) == [f"id: {n}\n{_chunk(n)}" for n in (2, 3)]
+    assert registry.stats()["completed"] == 1
+    assert await registry.subscribe("unknown") is None
+
+
+async def test_other_worker_replays_through_shared_store(tmp_path):
+    path = str(tmp_path / "pending.db")
+    generating = EventLogRegistry(
+        PendingTripStore(ttl_seconds=60, max_entries=10, path=path), connect_timeout=0
+    )
+    other = EventLogRegistry(
+        PendingTripStore(ttl_seconds=60, max_entries=10, path=path), poll_interval=0.01
+    )
+    await generating.store.put("trip", {"query": "3 days in Rome"})
+    await generating.start("trip", _events(3)).task
+
+    stream = await other.subscribe("trip", after_id=1)
+    assert await asyncio.wait_for(_collect(stream), 1) == [
+        f"id: {n}\n{_chunk(n)}" for n in (2, 3)
+    ]
+
+
+async def test_shared_store_keeps_last_events_per_trip(tmp_path):
+    path = str(tmp_path / "pending.db")
+    store = PendingTripStore(ttl_seconds=60, max_entries=10, path=path, max_events=3)
+    await store.put("trip", {})
+    await store.put("other", {})
+    for n in range(1, 6):
+        await store.append_event("trip", n, _chunk(n))
+    await store.append_event("other", 1, _chunk(1))
+
+    events, _ = await store.read_events("trip", 0)
+    assert [event_id for event_id, _ in events] == [3, 4, 5]
+    events, _ = await store.read_events("other", 0)
+    assert [event_id for event_id, _ in events] == [1]
+
+
+async def test_remote_stream_of_expired_trip_ends_with_error(tmp_path):
+    store = PendingTripStore(ttl_seconds=0.2, max_entries=10, path=str(tmp_path / "pending.db"))
+    follower = EventLogRegistry(store, poll_interval=0.01, stall_timeout=0)
+    await store.put("trip", {})
+    await store.append_event("trip", 1, _chunk(1))
+
+    # The generating worker died: the trip is never finished or evicted
+    stream = await follower.subscribe("trip")
+    chunks = await asyncio.wait_for(_collect(stream), 2)
+
+    assert chunks[0] == f"id: 1\n{_chunk(1)}"
+    assert chunks[-1].startswith("event: error\n")
+    assert len(chunks) == 2
+
+
+async def test_stalled_remote_stream_ends_with_error(tmp_path):
+    store = PendingTripStore(ttl_seconds=60, max_entries=10, path=str(tmp_path / "pending.db"))
+    follower = EventLogRegistry(store, poll_interval=0.01, stall_timeout=0.1)
+    await store.put("trip", {})
+    await store.append_event("trip", 1, _chunk(1))
+
+    stream = await follower.subscribe("trip")
+    chunks = await asyncio.wait_for(_collect(stream), 2)
+
+    assert chunks == [f"id: 1\n{_chunk(1)}", chunks[-1]]
+    assert chunks[-1].startswith("event: error\n")
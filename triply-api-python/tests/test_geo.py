@@ -0,0 +1,66 @@
+"""Tests for the itinerary geometry helpers"""
+
+import itertools
+
+import numpy as np
+
+from src.tools.geo import balanced_clusters, distance_m, haversine_matrix, visit_order
+
+# Three tight groups of four points, a few kilometres apart
+GROUPS = [(48.85, 2.35), (48.88, 2.29), (48.83, 2.40)]
+LATS = [lat + i * 0.001 for lat, _ in GROUPS for i in range(4)]
+LNGS = [lng + i * 0.001 for _, lng in GROUPS for i in range(4)]
+
+
+def test_haversine_matrix_matches_scalar_distance():
+    dist = haversine_matrix(LATS, LNGS)
+
+    assert dist.shape == (12, 12)
+    assert np.allclose(dist, dist.T)
+    assert np.allclose(np.diag(dist), 0)
+    assert np.isclose(dist[0, 5], distance_m(LATS[0], LNGS[0], LATS[5], LNGS[5]))
+
+
+def test_balanced_clusters_finds_compact_groups():
+    clusters = balanced_clusters(LATS, LNGS, k=3)
+
+    assert sorted(sorted(c) for c in clusters) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+
+
+def test_balanced_clusters_respects_capacity():
+    # All points in one spot except one outlier: clusters must still be balanced
+    lats = [48.85] * 8 + [48.95]
+    lngs = [2.35] * 8 + [2.50]
+    clusters = balanced_clusters(lats, lngs, k=3)
+
+    assert sorted(len(c) for c in clusters) == [3, 3, 3]
+    assert sorted(i for c in clusters for i in c) == list(range(9))
+
+
+def test_balanced_clusters_with_fewer_points_than_days():
+    assert balanced_clusters([48.85, 48.86], [2.35, 2.36], k=4) == [[0], [1], [], []]
+    assert balanced_clusters([], [], k=2) == [[], []]
+
+
+def test_visit_order_is_optimal_on_small_input():
+    rng = np.random.default_rng(7)
+    lats = 48.85 + rng.random(7) * 0.05
+    lngs = 2.35 + rng.random(7) * 0.05
+    dist = haversine_matrix(lats, lngs)
+
+    def length(path):
+        return sum(dist[a, b] for a, b in itertools.pairwise(path))
+
+    order = visit_order(dist)
+    best = min(length(p) for p in itertools.permutations(range(7)))
+
+    assert sorted(order) == list(range(7))
+    assert length(order) <= best * 1.05
+
+
+def test_visit_order_walks_a_line_end_to_end():
+    lngs = [2.30, 2.34, 2.31, 2.33, 2.32]
+    order = visit_order(haversine_matrix([48.85] * 5, lngs))
+
+    walked = [lngs[i] for i in order]
+    assert walked in (sorted(lngs), sorted(lngs, reverse=True))
@@ -0,0 +1,96 @@
+"""Tests for the Gemini call helpers"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from src.agents.llm import LimitedChatModel
+from src.tools.rate_limit import get_limiter
+
+
+class _ScriptedModel(BaseChatModel):
+    """Answers with a tool call first, then streams a final text reply"""
+
+    calls: int = 0
+    run_managers: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[{"name": t.name} for t in tools], **kwargs)
+
+    def _reply(self, **kwargs: Any) -> AIMessage:
+        self.calls += 1
+        if self.calls == 1:
+            assert kwargs.get("tools") == [{"name": "lookup"}]
+            tool_call = {"name": "lookup", "args": {"city": "Rome"}, "id": "1"}
+            return AIMessage(content="", tool_calls=[tool_call])
+        return AIMessage(content="Rome is lovely")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.run_managers.append(run_manager)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(**kwargs))])
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._reply(**kwargs)
+        if message.tool_calls:
+            chunk = {"name": "lookup", "args": '{"city": "Rome"}', "id": "1", "index": 0}
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[chunk]))
+            return
+        for word in message.content.split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+@tool
+def lookup(city: str) -> str:
+    """Look up a city"""
+    return f"{city}: sunny"
+
+
+async def test_react_agent_model_calls_go_through_the_gemini_limiter():
+    limiter = get_limiter("gemini")
+    successes = limiter.successes
+    inner = _ScriptedModel()
+    model = LimitedChatModel(inner=inner).bind_tools([lookup])
+    agent = create_react_agent(model=model, tools=[lookup])
+
+    tokens = []
+    inputs = {"messages": [HumanMessage(content="Rome?")]}
+    async for event in agent.astream_events(inputs, version="v2"):
+        if event["event"] == "on_chat_model_stream" and event["data"]["chunk"].content:
+            tokens.append(event["data"]["chunk"].content)
+
+    assert "".join(tokens).strip() == "Rome is lovely"
+    assert inner.calls == 2
+    assert limiter.successes == successes + 2
+    assert limiter.in_flight == 0
+
+
+async def test_invoke_goes_through_the_gemini_limiter():
+    limiter = get_limiter("gemini")
+    successes = limiter.successes
+    inner = _ScriptedModel(calls=1)
+
+    reply = await LimitedChatModel(inner=inner).ainvoke([HumanMessage(content="Rome?")])
+
+    assert reply.content == "Rome is lovely"
+    assert limiter.successes == successes + 1
+    assert inner.run_managers[-1] is not None  # Callbacks reach the inner model
+
+
+def test_sync_invoke_reaches_the_inner_model():
+    inner = _ScriptedModel(calls=1)
+
+    reply = LimitedChatModel(inner=inner).invoke([HumanMessage(content="Rome?")])
+
+    assert reply.content == "Rome is lovely"
+    assert inner.run_managers[-1] is not None
@@ -0,0 +1,86 @@
+"""Tests for mapping combined price search results back to places"""
+
+from src.agents.multi_agent.places_agent import _match_batch_prices, _mentions
+from src.agents.multi_agent.state import PlaceData
+
+LOUVRE = PlaceData(place_id="louvre", name="Louvre Museum")
+ORSAY = PlaceData(place_id="orsay", name="Musée d'Orsay")
+NOTRE_DAME = PlaceData(place_id="nd", name="Notre-Dame")
+NOTRE_DAME_BASILICA = PlaceData(place_id="ndb", name="Notre-Dame Basilica")
+PANTHEON = PlaceData(place_id="pantheon", name="Panthéon")
+
+
+def _response(*contents: str, answer: str | None = None, titles: list[str] | None = None) -> dict:
+    titles = titles or [""] * len(contents)
+    return {
+        "answer": answer,
+        "results": [
+            {"content": c, "title": t, "url": f"https://example.com/{i}"}
+            for i, (c, t) in enumerate(zip(contents, titles, strict=True))
+        ],
+    }
+
+
+def _prices(places: list[PlaceData], response: dict) -> dict[str, str]:
+    return {pid: match[0] for pid, match in _match_batch_prices(places, response).items()}
+
+
+def test_one_place_one_price_per_sentence():
+    response = _response("The Louvre costs €22 for adults. Tickets for the Musée d'Orsay are 16 €.")
+    matches = _match_batch_prices([LOUVRE, ORSAY], response)
+    assert {pid: m[0] for pid, m in matches.items()} == {"louvre": "€22", "orsay": "16 €"}
+    assert matches["louvre"][2] == "https://example.com/0"
+    assert "Louvre" in matches["louvre"][1]
+
+
+def test_enumeration_is_left_to_per_place_search():
+    response = _response(
+        "Tickets for the Louvre Museum and Musée d'Orsay: €22 and €16 respectively."
+    )
+    assert _prices([LOUVRE, ORSAY], response) == {}
+
+
+def test_sentence_with_two_prices_is_ambiguous():
+    response = _response("The Louvre costs €22, or €17 when booked online.")
+    assert _prices([LOUVRE], response) == {}
+
+
+def test_repeated_price_is_one_price():
+    response = _response("The Louvre costs €22 (€22 at the door too).")
+    assert _prices([LOUVRE], response) == {"louvre": "€22"}
+
+
+def test_conflicting_sentences_leave_place_unpriced():
+    response = _response("The Louvre costs €22.", "The Louvre costs €17.")
+    assert _prices([LOUVRE], response) == {}
+
+
+def test_shared_name_tokens_are_ambiguous():
+    # "Notre-Dame Basilica" also contains every word of "Notre-Dame"
+    response = _response("Entry to the Notre-Dame Basilica is $15.")
+    assert _prices([NOTRE_DAME, NOTRE_DAME_BASILICA], response) == {}
+
+
+def test_unmentioned_place_is_not_priced():
+    response = _response("The Louvre costs €22.", answer="Paris museums are popular.")
+    assert _prices([LOUVRE, PANTHEON], response) == {"louvre": "€22"}
+
+
+def test_page_titled_after_one_place():
+    response = _response(
+        "Adult ticket: EUR 13. Open daily.",
+        titles=["Panthéon | Official site"],
+    )
+    assert _prices([LOUVRE, PANTHEON], response) == {"pantheon": "EUR 13"}
+
+
+def test_free_admission():
+    response = _response("Admission to the Panthéon is free on the first Sunday.")
+    assert _prices([PANTHEON], response) == {"pantheon": "Free"}
+
+
+def test_mentions_by_identifying_words():
+    assert _mentions("Visit the Louvre in the morning", "Louvre Museum")
+    assert _mentions("tickets for musée d'orsay", "Musée d'Orsay")
+    assert not _mentions("The museum is open", "Louvre Museum")
+    assert not _mentions("Best of the city", "The Museum")
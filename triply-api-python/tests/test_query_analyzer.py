@@ -0,0 +1,41 @@
+"""Tests for pulling search queries out of the streamed analyzer output"""
+
+from src.agents.multi_agent.query_analyzer import JsonArrayScanner
+
+DOCUMENT = (
+    '{"theme": "food", "search_queries": ["best ramen", "night market", "sake bar"], '
+    '"city": "Tokyo"}'
+)
+
+
+def test_items_are_emitted_once_as_they_complete():
+    scanner = JsonArrayScanner("search_queries")
+    seen = []
+    for end in range(1, len(DOCUMENT) + 1):
+        seen.extend(scanner.feed(DOCUMENT[:end]))
+
+    assert seen == ["best ramen", "night market", "sake bar"]
+    assert scanner.emitted == 3
+
+
+def test_incomplete_string_is_held_back():
+    scanner = JsonArrayScanner("search_queries")
+
+    assert scanner.feed('{"search_queries": ["best ra') == []
+    assert scanner.feed('{"search_queries": ["best ramen"') == ["best ramen"]
+    assert scanner.feed('{"search_queries": ["best ramen", "ni') == []
+
+
+def test_other_arrays_and_missing_key_are_ignored():
+    scanner = JsonArrayScanner("search_queries")
+
+    assert scanner.feed('{"related_themes": ["culture", "history"]') == []
+    text = '{"related_themes": ["culture"], "search_queries": ["museum"]'
+    assert scanner.feed(text) == ["museum"]
+
+
+def test_escaped_quotes_and_whitespace():
+    scanner = JsonArrayScanner("search_queries")
+    text = '{"search_queries" : [\n  "the \\"best\\" cafe",\n  "tea"\n]}'
+
+    assert scanner.feed(text) == ['the "best" cafe', "tea"]
@@ -0,0 +1,43 @@
+"""Tests for classifying upstream errors as overload"""
+
+import httpx
+
+from src.tools.rate_limit import is_overload_error
+
+
+class _SDKError(Exception):
+    def __init__(self, code: int, message: str = ""):
+        super().__init__(message or f"{code} error")
+        self.code = code
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://places.googleapis.com")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("failed", request=request, response=response)
+
+
+def test_http_status_and_timeouts():
+    assert is_overload_error(_status_error(429))
+    assert is_overload_error(_status_error(503))
+    assert not is_overload_error(_status_error(404))
+    assert is_overload_error(httpx.ReadTimeout("slow"))
+
+
+def test_sdk_status_code_including_chained_errors():
+    assert is_overload_error(_SDKError(429))
+    assert not is_overload_error(_SDKError(400, "bad request for item 429"))
+
+    try:
+        try:
+            raise _SDKError(500)
+        except _SDKError as e:
+            raise RuntimeError("Error calling model") from e
+    except RuntimeError as wrapped:
+        assert is_overload_error(wrapped)
+
+
+def test_bare_429_in_message_is_not_overload():
+    assert not is_overload_error(ValueError("place 42942 not found on port 4290"))
+    assert not is_overload_error(RuntimeError("response of 429 bytes"))
+    assert is_overload_error(RuntimeError("RESOURCE_EXHAUSTED: quota exceeded"))
@@ -0,0 +1,64 @@
+"""Tests for the one-round restaurant assignment (search_restaurants_parallel)"""
+
+from src.agents.multi_agent import restaurant_agent
+from src.agents.multi_agent.state import PlaceData, ThemeAnalysis
+
+THEME = ThemeAnalysis(
+    theme="food",
+    related_themes=[],
+    search_queries=[],
+    restaurant_queries=[],
+    city="Paris",
+    country="France",
+    duration_days=2,
+    special_requirements=[],
+)
+
+
+def _raw(place_id: str, name: str, rating: float) -> dict:
+    return {"id": place_id, "displayName": {"text": name}, "rating": rating}
+
+
+def _day(day: int) -> list[PlaceData]:
+    return [
+        PlaceData(
+            place_id=f"d{day}p{i}", name=f"Stop {i}", latitude=48.85 + day / 100, longitude=2.35
+        )
+        for i in range(3)
+    ]
+
+
+async def test_results_are_grouped_by_day_and_meal(monkeypatch):
+    async def search(query, max_results=5, location=None, radius=None):
+        meal = query.split()[-2]
+        day = 1 if location["lat"] < 48.865 else 2
+        return [_raw(f"{meal}-{day}-{i}", f"{meal} {day} #{i}", 4.9 - i / 10) for i in range(3)]
+
+    monkeypatch.setattr(restaurant_agent, "search_places_api", search)
+    restaurants = await restaurant_agent.search_restaurants_parallel(THEME, [_day(1), _day(2)])
+
+    assert [(r.day_number, r.category) for r in restaurants] == [
+        (1, "breakfast"), (1, "lunch"), (1, "dinner"),
+        (2, "breakfast"), (2, "lunch"), (2, "dinner"),
+    ]
+    assert all(r.place_id.startswith(f"{r.category}-{r.day_number}-") for r in restaurants)
+
+
+async def test_excluded_ids_and_names_fall_back_to_next_option(monkeypatch):
+    async def search(query, max_results=5, location=None, radius=None):
+        return [
+            _raw("chain-1", "Le Chain", 4.9),
+            _raw("taken", "Already There", 4.8),
+            _raw("free", "Free Table", 4.5),
+        ]
+
+    monkeypatch.setattr(restaurant_agent, "search_places_api", search)
+    restaurants = await restaurant_agent.search_restaurants_parallel(
+        THEME,
+        [_day(1)],
+        exclude_ids={"taken"},
+        exclude_names={"le chain"},
+    )
+
+    # One usable option: it goes to the first meal, the others stay unfilled
+    assert [(r.place_id, r.category) for r in restaurants] == [("free", "breakfast")]
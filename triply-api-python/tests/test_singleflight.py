@@ -0,0 +1,142 @@
+"""Tests for single-flight coalescing of upstream calls"""
+
+import asyncio
+
+import pytest
+
+from src.tools.deadline import DeadlineExceededError, deadline_scope, remaining
+from src.tools.singleflight import SingleFlight
+
+
+async def test_concurrent_callers_share_one_call():
+    group = SingleFlight("test-share")
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    waiters = [asyncio.create_task(group.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["result"] * 3
+    assert calls == 1
+    assert group.stats() == {"name": "test-share", "in_flight": 0, "executed": 1, "shared": 2}
+
+
+async def test_different_keys_run_separately():
+    group = SingleFlight("test-keys")
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(group.do("a", lambda: fetch(1)), group.do("b", lambda: fetch(2)))
+
+    assert results == [1, 2]
+    assert group.executed == 2
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    group = SingleFlight("test-errors")
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        group.do("key", failing), group.do("key", failing), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert calls == 1
+
+    with pytest.raises(RuntimeError):
+        await group.do("key", failing)
+    assert calls == 2
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    group = SingleFlight("test-cancel-one")
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(group.do("key", fetch))
+    second = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+async def test_call_is_cancelled_when_last_waiter_leaves():
+    group = SingleFlight("test-cancel-all")
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert group.stats()["in_flight"] == 0
+
+
+async def test_callers_keep_their_own_deadlines():
+    group = SingleFlight("test-deadlines")
+    release = asyncio.Event()
+    seen_budget = []
+
+    async def fetch():
+        # The shared call must not inherit the first caller's deadline
+        seen_budget.append(remaining())
+        await release.wait()
+        return "done"
+
+    async def call(deadline):
+        with deadline_scope(deadline):
+            return await group.do("key", fetch, timeout=30)
+
+    hurried = asyncio.create_task(call(0.05))
+    patient = asyncio.create_task(call(None))
+
+    with pytest.raises(TimeoutError):
+        await hurried
+    release.set()
+
+    assert await patient == "done"
+    assert seen_budget == [None]
+    assert group.executed == 1
+
+
+async def test_expired_deadline_does_not_start_a_call():
+    group = SingleFlight("test-expired")
+
+    async def fetch():
+        raise AssertionError("should not run")
+
+    with deadline_scope(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            await group.do("key", fetch)
+
+    assert group.executed == 0
@@ -0,0 +1,113 @@
+"""Tests for the new-trip SSE diff (_TripStreamTracker)"""
+
+import json
+
+from src.logging.logger import SSELogger
+from src.main import _TripStreamTracker
+
+
+def _day(day_number: int, places: list[str], restaurants: list[str] = ()) -> dict:
+    return {
+        "dayNumber": day_number,
+        "title": f"Day {day_number}",
+        "places": [{"place_id": p, "name": p} for p in places],
+        "restaurants": [{"place_id": r, "name": r, "category": "lunch"} for r in restaurants],
+    }
+
+
+class _Client:
+    """Applies events the way the web client does (slots keyed by day-slot)"""
+
+    def __init__(self):
+        self.days: dict[int, dict] = {}
+        self.places: dict[str, str] = {}
+        self.restaurants: dict[str, str] = {}
+
+    def apply(self, events: list[str]):
+        for raw in events:
+            name = raw.split("\n")[0].removeprefix("event: ")
+            data = json.loads(raw.split("\n")[1].removeprefix("data: "))["data"]
+            if name == "day":
+                day = data["dayNumber"]
+                self.days[day] = data
+                for slots, count in ((self.places, data["slotsCount"]),
+                                     (self.restaurants, data["restaurantsCount"])):
+                    for key in [k for k in slots if k.startswith(f"{day}-")]:
+                        if int(key.split("-")[1]) >= count:
+                            del slots[key]
+            elif name == "place":
+                key = f"{data['dayNumber']}-{data['slotIndex']}"
+                self.places[key] = data["place"]["poi_id"]
+            elif name == "restaurant":
+                key = f"{data['dayNumber']}-{data['slotIndex']}"
+                self.restaurants[key] = data["restaurant"]["poi_id"]
+
+    def day_places(self, day: int) -> list[str]:
+        keys = [f"{day}-{i}" for i in range(len(self.places))]
+        return [self.places[key] for key in keys if key in self.places]
+
+    def day_restaurants(self, day: int) -> list[str]:
+        return [
+            self.restaurants[f"{day}-{i}"]
+            for i in range(len(self.restaurants))
+            if f"{day}-{i}" in self.restaurants
+        ]
+
+
+def _names(events: list[str]) -> list[str]:
+    return [e.split("\n")[0].removeprefix("event: ") for e in events]
+
+
+def _stream(plans: list[dict]) -> tuple[_Client, list[list[str]]]:
+    tracker = _TripStreamTracker(SSELogger("test"))
+    client = _Client()
+    batches = []
+    for plan in plans:
+        events = tracker.plan_events(plan, 0.5)
+        client.apply(events)
+        batches.append(events)
+    return client, batches
+
+
+def test_identical_plan_sends_nothing():
+    plan = {"days": [_day(1, ["a", "b"], ["r1"])]}
+    _, batches = _stream([plan, plan])
+    assert _names(batches[0]) == ["day", "place", "place", "restaurant"]
+    assert batches[1] == []
+
+
+def test_restaurants_arriving_resend_day_counts():
+    client, batches = _stream([
+        {"days": [_day(1, ["a", "b"])]},
+        {"days": [_day(1, ["a", "b"], ["r1", "r2", "r3"])]},
+    ])
+    assert _names(batches[1]) == ["day", "restaurant", "restaurant", "restaurant"]
+    assert client.days[1]["restaurantsCount"] == 3
+    assert client.day_restaurants(1) == ["r1", "r2", "r3"]
+
+
+def test_reordered_stops_resend_moved_slots_only():
+    client, batches = _stream([
+        {"days": [_day(1, ["a", "b", "c", "d"])]},
+        {"days": [_day(1, ["a", "c", "b", "d"])]},
+    ])
+    assert _names(batches[1]) == ["place", "place"]
+    assert client.day_places(1) == ["a", "c", "b", "d"]
+
+
+def test_inserted_stop_shifts_later_slots():
+    client, _ = _stream([
+        {"days": [_day(1, ["a", "b", "c"])]},
+        {"days": [_day(1, ["a", "x", "b", "c"])]},
+    ])
+    assert client.day_places(1) == ["a", "x", "b", "c"]
+
+
+def test_recluster_moves_places_between_days_without_stale_slots():
+    client, _ = _stream([
+        {"days": [_day(1, ["a", "b", "c", "d"]), _day(2, ["e", "f", "g"])]},
+        {"days": [_day(1, ["a", "b", "c"]), _day(2, ["d", "e", "f", "g"])]},
+    ])
+    assert client.day_places(1) == ["a", "b", "c"]
+    assert client.day_places(2) == ["d", "e", "f", "g"]
+    assert "1-3" not in client.places
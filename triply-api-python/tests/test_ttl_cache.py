@@ -0,0 +1,79 @@
+"""Tests for the TTL/LRU cache and its SQLite tier"""
+
+import time
+
+from src.cache import CacheEntry, TTLCache
+
+
+async def test_hit_miss_and_expiry():
+    cache = TTLCache("test_expiry", ttl_seconds=60, max_entries=10)
+
+    assert await cache.get("a") is None
+    await cache.set("a", {"v": 1})
+    assert await cache.get("a") == {"v": 1}
+
+    # Age the entry past its TTL
+    cache.memory._data["a"] = CacheEntry({"v": 1}, time.time() - 61)
+    assert await cache.get("a") is None
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+async def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache("test_lru", ttl_seconds=60, max_entries=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+async def test_zero_ttl_disables_cache():
+    cache = TTLCache("test_disabled", ttl_seconds=0, max_entries=10)
+    await cache.set("a", 1)
+
+    assert await cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+async def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = TTLCache("test_disk", ttl_seconds=60, max_entries=10, path=path)
+    await first.set("places:tokyo", [{"id": "p1"}])
+
+    # A new process only has the SQLite file
+    second = TTLCache("test_disk", ttl_seconds=60, max_entries=10, path=path)
+    assert second.stats()["persistent"]
+    assert await second.get("places:tokyo") == [{"id": "p1"}]
+    assert len(second.memory) == 1  # Promoted into the memory tier
+
+
+async def test_disk_tier_evicts_least_recently_accessed(tmp_path):
+    cache = TTLCache("test_disk_lru", ttl_seconds=60, max_entries=2, path=str(tmp_path / "c.db"))
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.disk.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.disk.get("a") is not None
+    assert await cache.disk.get("b") is None
+    assert await cache.disk.get("c") is not None
+
+
+async def test_delete_and_clear_reach_both_tiers(tmp_path):
+    cache = TTLCache("test_disk_clear", ttl_seconds=60, max_entries=10, path=str(tmp_path / "c.db"))
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+
+    await cache.delete("a")
+    assert await cache.disk.get("a") is None
+    assert await cache.get("a") is None
+
+    await cache.clear()
+    assert await cache.disk.get("b") is None
+    assert len(cache.memory) == 0
@@ -103,8 +103,21 @@ export function useStreamingTrip(options: UseStreamingTripOptions = {}) {
               restaurantsCount: data.restaurantsCount || 0,
             });
             console.log("[Streaming] Days map size:", newDays.size);
+            // The day event is re-sent when a newer plan changes the day:
+            // its counts are authoritative, so drop slots past them
+            const trimSlots = <T>(slots: Map<string, T>, count: number | undefined) => {
+              if (count === undefined) return slots;
+              const trimmed = new Map(slots);
+              slots.forEach((_, key) => {
+                const [keyDay, keySlot] = key.split("-").map(Number);
+                if (keyDay === dayNumber && keySlot >= count) trimmed.delete(key);
+              });
+              return trimmed;
+            };
             return {
               days: newDays,
+              places: trimSlots(prev.places, data.slotsCount),
+              restaurants: trimSlots(prev.restaurants, data.restaurantsCount),
               progress: event.progress || Math.min(0.25 + newDays.size * 0.05, 0.5),
               phase: event.phase || "days",
             };